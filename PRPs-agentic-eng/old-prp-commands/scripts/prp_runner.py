@@ -7,27 +7,60 @@ Typical usage:
     uv run RUNNERS/claude_runner.py --prp test --interactive
     uv run RUNNERS/claude_runner.py --prp test --output-format json
     uv run RUNNERS/claude_runner.py --prp test --output-format stream-json
+    uv run RUNNERS/claude_runner.py --prp feature_a --prp feature_b --concurrency 2
+    uv run RUNNERS/claude_runner.py --prp-glob "PRPs/story_*.md"
+    uv run RUNNERS/claude_runner.py --prp test --capture runs/test.ndjson.gz
+    uv run RUNNERS/claude_runner.py --replay runs/test.ndjson.gz
 
 Arguments:
-    --prp-path       Path to a PRP markdown file (overrides --prp)
-    --prp            Feature key; resolves to PRPs/{feature}.md
+    --prp-path       Path to a PRP markdown file (overrides --prp); repeatable
+    --prp            Feature key; resolves to PRPs/{feature}.md; repeatable
+    --prp-glob       Glob (relative to the project root) selecting PRPs to run
     --model          CLI executable for the LLM (default: "claude") Only Claude Code is supported for now
     --interactive    Pass through to run the model in chat mode; otherwise headless.
     --output-format  Output format for headless mode: text, json, stream-json (default: text)
+    --concurrency    PRPs run at once when several are given (default: 4)
+    --runs-dir       Where parallel runs put their working copies and logs
+    --capture        Record a stream-json run to a gzipped NDJSON transcript
+    --replay         Re-render a transcript offline instead of running anything
+
+With more than one PRP, each runs headless in its own subprocess inside
+its own copy of the project root, at most --concurrency at a time. Their
+output goes to log files and a cost/duration/turn summary, aggregated from
+the "result" messages, is printed at the end. Any executable that speaks
+the same flags and JSON output can stand in for the model, e.g. a stub
+script passed as --model ./stub_model.py.
 """
 
 from __future__ import annotations
 
 import argparse
+import gzip
+import io
 import json
 import os
+import shutil
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterator
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, TextIO
 
 ROOT = Path(__file__).resolve().parent.parent  # project root
 
+ALLOWED_TOOLS = "Edit,Bash,Write,MultiEdit,NotebookEdit,WebFetch,Agent,LS,Grep,Read,NotebookRead,TodoRead,TodoWrite,WebSearch"
+
+# Left out of working copies: VCS data, environments, regenerated caches and
+# earlier parallel runs (a --runs-dir elsewhere in the tree is excluded by path)
+COPY_IGNORE = ("__pycache__", ".prp_runs", ".git", ".venv", "node_modules")
+
+# Exit code reported when the model command cannot be started (as a shell would)
+LAUNCH_FAILED = 127
+
 META_HEADER = """Ingest and understand the Product Requirement Prompt (PRP) below in detail.
 
     # WORKFLOW GUIDANCE:
@@ -68,16 +101,194 @@ def build_prompt(prp_path: Path) -> str:
     return META_HEADER + prp_path.read_text()
 
 
-def stream_json_output(process: subprocess.Popen) -> Iterator[Dict[str, Any]]:
-    """Parse streaming JSON output line by line."""
-    for line in process.stdout:
-        line = line.strip()
-        if line:
+def render_message(message: Dict[str, Any], file: TextIO = sys.stderr) -> None:
+    """Human-readable progress line(s) for one stream-json message."""
+    if message.get("type") == "system" and message.get("subtype") == "init":
+        print(f"Session started: {message.get('session_id')}", file=file)
+    elif message.get("type") == "assistant":
+        print(
+            f"Assistant: {message.get('message', {}).get('content', '')[:100]}...",
+            file=file,
+        )
+    elif message.get("type") == "result":
+        print("\nFinal result:", file=file)
+        print(f"  Success: {message.get('subtype') == 'success'}", file=file)
+        print(f"  Cost: ${message.get('cost_usd', 0):.4f}", file=file)
+        print(f"  Duration: {message.get('duration_ms', 0)}ms", file=file)
+        print(f"  Turns: {message.get('num_turns', 0)}", file=file)
+        if message.get("result"):
+            print(f"\nResult text:\n{message.get('result')}", file=file)
+
+
+class Transcript:
+    """Gzipped NDJSON record of a stream-json run, one envelope per line.
+
+    The first line describes the run, the last holds the exit code. Each
+    stdout line is embedded byte for byte as "message" (or as a "text"
+    string when it is not JSON) and each stderr line as "text", with "t",
+    the seconds since the run started. Writes are serialised so the
+    stdout and stderr readers can share one transcript.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, **meta: Any):
+        self.path = path
+        self._file = gzip.open(path, "wb")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._write(
+            json.dumps(
+                {
+                    "type": "transcript",
+                    "version": self.VERSION,
+                    "started_at": datetime.now().isoformat(),
+                    **meta,
+                }
+            ).encode()
+        )
+
+    def _write(self, line: bytes) -> None:
+        with self._lock:
+            self._file.write(line + b"\n")
+
+    def _envelope(self, stream: str, key: str, value: bytes) -> bytes:
+        elapsed = time.monotonic() - self._started
+        return b'{"t":%.3f,"stream":"%s","%s":%s}' % (
+            elapsed,
+            stream.encode(),
+            key.encode(),
+            value,
+        )
+
+    def stdout(self, line: bytes, is_json: bool) -> None:
+        if is_json:
+            self._write(self._envelope("stdout", "message", line))
+        else:
+            self.text("stdout", line)
+
+    def text(self, stream: str, line: bytes) -> None:
+        text = json.dumps(line.decode(errors="replace")).encode()
+        self._write(self._envelope(stream, "text", text))
+
+    def close(self, returncode: int) -> None:
+        self._write(self._envelope("exit", "returncode", str(returncode).encode()))
+        self._file.close()
+
+
+def stream_process(cmd: List[str], transcript: Optional[Transcript] = None) -> int:
+    """Run a stream-json command, draining stdout and stderr concurrently.
+
+    stderr is read on its own thread while stdout is rendered, so a chatty
+    run can never fill a pipe and block. stdout lines are passed through
+    unchanged (and recorded when a transcript is given); the stderr tail is
+    printed if the run fails. Returns the exit code, LAUNCH_FAILED if the
+    command could not be started. A transcript always ends with an exit
+    record, non-zero unless the process ran to completion successfully.
+    """
+    process: Optional[subprocess.Popen] = None
+    stderr_reader: Optional[threading.Thread] = None
+    stderr_tail: Deque[str] = deque(maxlen=200)
+    returncode = 1
+
+    def drain_stderr(stream) -> None:
+        for raw in stream:
+            line = raw.rstrip(b"\r\n")
+            stderr_tail.append(line.decode(errors="replace"))
+            if transcript is not None:
+                transcript.text("stderr", line)
+
+    try:
+        try:
+            process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            returncode = LAUNCH_FAILED
+            message = f"Failed to start {cmd[0]}: {e}"
+            print(message, file=sys.stderr)
+            if transcript is not None:
+                transcript.text("stderr", message.encode())
+            return returncode
+
+        stderr_reader = threading.Thread(
+            target=drain_stderr, args=(process.stderr,), daemon=True
+        )
+        stderr_reader.start()
+
+        for raw in process.stdout:
+            line = raw.strip()
+            if not line:
+                continue
             try:
-                yield json.loads(line)
+                message = json.loads(line)
             except json.JSONDecodeError as e:
                 print(f"Warning: Failed to parse JSON line: {e}", file=sys.stderr)
-                print(f"Line content: {line}", file=sys.stderr)
+                print(f"Line content: {line.decode(errors='replace')}", file=sys.stderr)
+                message = None
+            if transcript is not None:
+                transcript.stdout(line, is_json=message is not None)
+            # Process each message as it arrives
+            if isinstance(message, dict):
+                render_message(message)
+            # Pass the raw line on for downstream processing
+            sys.stdout.buffer.write(line + b"\n")
+            sys.stdout.flush()
+        returncode = process.wait()
+    except KeyboardInterrupt:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        print("\nInterrupted by user", file=sys.stderr)
+        return 1
+    finally:
+        if stderr_reader is not None:
+            stderr_reader.join()
+        if transcript is not None:
+            transcript.close(returncode)
+            print(f"Transcript: {transcript.path}", file=sys.stderr)
+
+    if returncode != 0:
+        print(f"Claude Code failed with exit code {returncode}", file=sys.stderr)
+        print("Error: " + "\n".join(stderr_tail), file=sys.stderr)
+    return returncode
+
+
+def replay(path: Path, file: TextIO = sys.stdout) -> int:
+    """Re-render a transcript written by --capture; returns the recorded exit code.
+
+    A transcript without an exit record (the runner itself died) replays as
+    a failure.
+    """
+    returncode: Optional[int] = None
+    with gzip.open(path, "rt") as transcript:
+        for line in transcript:
+            envelope = json.loads(line)
+            if envelope.get("type") == "transcript":
+                print(
+                    f"Transcript of {envelope.get('prp', 'unknown PRP')} "
+                    f"(model {envelope.get('model')}, started {envelope.get('started_at')})",
+                    file=file,
+                )
+                continue
+
+            prefix = f"[{envelope['t']:8.1f}s]"
+            if envelope["stream"] == "exit":
+                returncode = envelope["returncode"]
+                print(f"{prefix} exit code {returncode}", file=file)
+            elif "message" in envelope:
+                rendered = io.StringIO()
+                if isinstance(envelope["message"], dict):
+                    render_message(envelope["message"], file=rendered)
+                # Messages rendered silently live (e.g. tool results) stay silent
+                if rendered.getvalue():
+                    print(f"{prefix} {rendered.getvalue().lstrip()}", end="", file=file)
+            else:
+                print(f"{prefix} {envelope['stream']}: {envelope['text']}", file=file)
+    if returncode is None:
+        print("No exit record: the run did not finish", file=file)
+        return 1
+    return returncode
 
 
 def handle_json_output(output: str) -> Dict[str, Any]:
@@ -89,101 +300,40 @@ def handle_json_output(output: str) -> Dict[str, Any]:
         return {"error": "Failed to parse JSON output", "raw": output}
 
 
+def headless_command(prompt: str, model: str, output_format: str) -> List[str]:
+    """Command line for a non-interactive run."""
+    return [
+        model,
+        "-p",  # This is the --print flag for non-interactive mode
+        prompt,
+        "--allowedTools",
+        ALLOWED_TOOLS,
+        # "--max-turns",
+        # "30",  # Safety limit for headless mode uncomment if needed
+        "--output-format",
+        output_format,
+    ]
+
+
 def run_model(
     prompt: str,
     model: str = "claude",
     interactive: bool = False,
     output_format: str = "text",
+    transcript: Optional[Transcript] = None,
 ) -> None:
     if interactive:
         # Chat mode: feed prompt via STDIN, no -p flag so the user can continue the session.
-        cmd = [
-            model,
-            "--allowedTools",
-            "Edit,Bash,Write,MultiEdit,NotebookEdit,WebFetch,Agent,LS,Grep,Read,NotebookRead,TodoRead,TodoWrite,WebSearch",
-        ]
+        cmd = [model, "--allowedTools", ALLOWED_TOOLS]
         subprocess.run(cmd, input=prompt.encode(), check=True)
     else:
         # Headless: pass prompt via -p for non-interactive mode
-        cmd = [
-            model,
-            "-p",  # This is the --print flag for non-interactive mode
-            prompt,
-            "--allowedTools",
-            "Edit,Bash,Write,MultiEdit,NotebookEdit,WebFetch,Agent,LS,Grep,Read,NotebookRead,TodoRead,TodoWrite,WebSearch",
-            # "--max-turns",
-            # "30",  # Safety limit for headless mode uncomment if needed
-            "--output-format",
-            output_format,
-        ]
+        cmd = headless_command(prompt, model, output_format)
 
         if output_format == "stream-json":
-            # Handle streaming JSON output
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line buffered
-            )
-
-            try:
-                for message in stream_json_output(process):
-                    # Process each message as it arrives
-                    if (
-                        message.get("type") == "system"
-                        and message.get("subtype") == "init"
-                    ):
-                        print(
-                            f"Session started: {message.get('session_id')}",
-                            file=sys.stderr,
-                        )
-                    elif message.get("type") == "assistant":
-                        print(
-                            f"Assistant: {message.get('message', {}).get('content', '')[:100]}...",
-                            file=sys.stderr,
-                        )
-                    elif message.get("type") == "result":
-                        print("\nFinal result:", file=sys.stderr)
-                        print(
-                            f"  Success: {message.get('subtype') == 'success'}",
-                            file=sys.stderr,
-                        )
-                        print(
-                            f"  Cost: ${message.get('cost_usd', 0):.4f}",
-                            file=sys.stderr,
-                        )
-                        print(
-                            f"  Duration: {message.get('duration_ms', 0)}ms",
-                            file=sys.stderr,
-                        )
-                        print(
-                            f"  Turns: {message.get('num_turns', 0)}", file=sys.stderr
-                        )
-                        if message.get("result"):
-                            print(
-                                f"\nResult text:\n{message.get('result')}",
-                                file=sys.stderr,
-                            )
-
-                    # Print the full message for downstream processing
-                    print(json.dumps(message))
-
-                # Wait for process to complete
-                process.wait()
-                if process.returncode != 0:
-                    stderr = process.stderr.read()
-                    print(
-                        f"Claude Code failed with exit code {process.returncode}",
-                        file=sys.stderr,
-                    )
-                    print(f"Error: {stderr}", file=sys.stderr)
-                    sys.exit(process.returncode)
-
-            except KeyboardInterrupt:
-                process.terminate()
-                print("\nInterrupted by user", file=sys.stderr)
-                sys.exit(1)
+            returncode = stream_process(cmd, transcript)
+            if returncode != 0:
+                sys.exit(returncode)
 
         elif output_format == "json":
             # Handle complete JSON output
@@ -225,13 +375,245 @@ def run_model(
             subprocess.run(cmd, check=True)
 
 
+def resolve_prps(args: argparse.Namespace) -> List[Path]:
+    """PRP files named by --prp-path, --prp and --prp-glob, in order, without duplicates."""
+    paths = [Path(p) for p in args.prp_path or []]
+    paths += [ROOT / f"PRPs/{prp}.md" for prp in args.prp or []]
+    if args.prp_glob:
+        matches = sorted(ROOT.glob(args.prp_glob))
+        if not matches:
+            sys.exit(f"No PRPs match: {args.prp_glob}")
+        paths += matches
+
+    unique: Dict[Path, Path] = {}
+    for path in paths:
+        if not path.exists():
+            sys.exit(f"PRP not found: {path}")
+        unique.setdefault(path.resolve(), path)
+    return list(unique.values())
+
+
+def resolve_model(model: str) -> str:
+    """Absolute path for a model given as a relative path, since runs change directory."""
+    if os.sep in model or (os.altsep and os.altsep in model):
+        return str(Path(model).resolve())
+    return model
+
+
+def prepare_workdir(source: Path, dest: Path, exclude: Iterable[Path] = ()) -> Path:
+    """Fresh copy of the project tree for one PRP run, minus COPY_IGNORE and `exclude`."""
+    patterns = shutil.ignore_patterns(*COPY_IGNORE)
+    excluded = {path.resolve() for path in exclude}
+
+    def ignore(directory: str, names: List[str]) -> Set[str]:
+        ignored = set(patterns(directory, names))
+        ignored.update(name for name in names if Path(directory, name) in excluded)
+        return ignored
+
+    shutil.copytree(source, dest, symlinks=True, ignore=ignore)
+    return dest
+
+
+def read_result(output: str) -> Optional[Dict[str, Any]]:
+    """Last "result" message in json or stream-json output, if any."""
+    result = None
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(message, dict) and message.get("type") == "result":
+            result = message
+    if result is None:
+        # json mode may pretty-print a single object over several lines
+        try:
+            message = json.loads(output)
+        except json.JSONDecodeError:
+            return None
+        if isinstance(message, dict) and message.get("type") == "result":
+            result = message
+    return result
+
+
+def run_prp(
+    prp_path: Path,
+    run_dir: Path,
+    model: str,
+    output_format: str,
+    exclude: Iterable[Path] = (),
+) -> Dict[str, Any]:
+    """Run one PRP headless in its own working copy; output goes to files in run_dir."""
+    run_dir.mkdir(parents=True)
+    workdir = prepare_workdir(ROOT, run_dir / "workdir", exclude)
+    cmd = headless_command(build_prompt(prp_path), model, output_format)
+
+    started = time.monotonic()
+    # Files, not pipes: a chatty run can never block on a full pipe buffer
+    with open(run_dir / "stdout.log", "w") as stdout, open(
+        run_dir / "stderr.log", "w"
+    ) as stderr:
+        try:
+            returncode = subprocess.run(
+                cmd, cwd=workdir, stdout=stdout, stderr=stderr
+            ).returncode
+        except OSError as e:
+            stderr.write(f"Failed to start {model}: {e}\n")
+            returncode = LAUNCH_FAILED
+    wall_seconds = time.monotonic() - started
+
+    result = read_result((run_dir / "stdout.log").read_text()) or {}
+    return {
+        "prp": str(prp_path),
+        "returncode": returncode,
+        "success": returncode == 0
+        and result.get("subtype", "success") == "success"
+        and not result.get("is_error", False),
+        "cost_usd": result.get("total_cost_usd", result.get("cost_usd", 0)) or 0,
+        "duration_ms": result.get("duration_ms", 0) or 0,
+        "num_turns": result.get("num_turns", 0) or 0,
+        "session_id": result.get("session_id"),
+        "wall_seconds": round(wall_seconds, 3),
+        "run_dir": str(run_dir),
+    }
+
+
+def failed_run(prp_path: Path, run_dir: Path, error: Exception) -> Dict[str, Any]:
+    """Result entry for a PRP whose run raised before producing a result."""
+    return {
+        "prp": str(prp_path),
+        "returncode": None,
+        "success": False,
+        "cost_usd": 0,
+        "duration_ms": 0,
+        "num_turns": 0,
+        "session_id": None,
+        "wall_seconds": 0,
+        "run_dir": str(run_dir),
+        "error": f"{type(error).__name__}: {error}",
+    }
+
+
+def run_parallel(
+    prp_paths: List[Path],
+    model: str = "claude",
+    output_format: str = "stream-json",
+    concurrency: int = 4,
+    runs_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run PRPs at most `concurrency` at a time and aggregate their result summaries."""
+    # The pid keeps invocations started in the same second apart
+    runs_dir = runs_dir or ROOT / ".prp_runs" / (
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    )
+    runs_dir.mkdir(parents=True, exist_ok=True)
+    model = resolve_model(model)
+
+    started = time.monotonic()
+    runs: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {}
+        for i, prp_path in enumerate(prp_paths, 1):
+            run_dir = runs_dir / f"{i:02d}-{prp_path.stem}"
+            future = pool.submit(
+                run_prp, prp_path, run_dir, model, output_format, [runs_dir]
+            )
+            futures[future] = (prp_path, run_dir)
+        for future in as_completed(futures):
+            prp_path, run_dir = futures[future]
+            # A run that cannot even be set up fails alone; the rest still report
+            try:
+                run = future.result()
+            except Exception as e:
+                run = failed_run(prp_path, run_dir, e)
+            runs.append(run)
+            if run["success"]:
+                status = "ok"
+            elif "error" in run:
+                status = f"FAILED ({run['error']})"
+            else:
+                status = f"FAILED (exit {run['returncode']})"
+            print(
+                f"[{len(runs)}/{len(prp_paths)}] {prp_path.name}: {status}",
+                file=sys.stderr,
+            )
+
+    runs.sort(key=lambda run: run["run_dir"])
+    summary = {
+        "runs": runs,
+        "total": {
+            "prps": len(runs),
+            "succeeded": sum(1 for run in runs if run["success"]),
+            "cost_usd": round(sum(run["cost_usd"] for run in runs), 6),
+            "duration_ms": sum(run["duration_ms"] for run in runs),
+            "num_turns": sum(run["num_turns"] for run in runs),
+            "wall_seconds": round(time.monotonic() - started, 3),
+        },
+        "runs_dir": str(runs_dir),
+    }
+    (runs_dir / "summary.json").write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """Per-PRP and total cost/duration/turns table on stderr."""
+
+    def row(label: str, ok: str, cost: float, duration_ms: int, turns: int) -> str:
+        return (
+            f"  {label[:40]:<40} {ok:>4} {f'${cost:.4f}':>9} "
+            f"{f'{duration_ms / 1000:.1f}s':>10} {turns:>6}"
+        )
+
+    print("\nSummary:", file=sys.stderr)
+    print(
+        f"  {'PRP':<40} {'ok':>4} {'cost':>9} {'duration':>10} {'turns':>6}",
+        file=sys.stderr,
+    )
+    for run in summary["runs"]:
+        ok = "yes" if run["success"] else "NO"
+        print(
+            row(
+                Path(run["prp"]).stem,
+                ok,
+                run["cost_usd"],
+                run["duration_ms"],
+                run["num_turns"],
+            ),
+            file=sys.stderr,
+        )
+    total = summary["total"]
+    print(
+        row(
+            "Total",
+            f"{total['succeeded']}/{total['prps']}",
+            total["cost_usd"],
+            total["duration_ms"],
+            total["num_turns"],
+        ),
+        file=sys.stderr,
+    )
+    print(
+        f"  Wall time: {total['wall_seconds']:.1f}s; logs in {summary['runs_dir']}",
+        file=sys.stderr,
+    )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Run a PRP with an LLM agent.")
     parser.add_argument(
-        "--prp-path", help="Relative path to PRP file eg: PRPs/feature.md"
+        "--prp-path",
+        action="append",
+        help="Relative path to PRP file eg: PRPs/feature.md (repeatable)",
+    )
+    parser.add_argument(
+        "--prp",
+        action="append",
+        help="The file name of the PRP without the .md extension eg: feature (repeatable)",
     )
     parser.add_argument(
-        "--prp", help="The file name of the PRP without the .md extension eg: feature"
+        "--prp-glob", help='Glob relative to the project root eg: "PRPs/story_*.md"'
     )
     parser.add_argument(
         "--interactive", action="store_true", help="Launch interactive chat session"
@@ -243,22 +625,77 @@ def main() -> None:
         default="text",
         help="Output format for headless mode (default: text)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum PRPs run at once with several PRPs (default: 4)",
+    )
+    parser.add_argument(
+        "--runs-dir",
+        help="Directory for parallel working copies and logs (default: .prp_runs/<timestamp>-<pid>)",
+    )
+    parser.add_argument(
+        "--capture",
+        help="Record a stream-json run to this gzipped NDJSON transcript eg: run.ndjson.gz",
+    )
+    parser.add_argument(
+        "--replay", help="Re-render a transcript written by --capture and exit"
+    )
     args = parser.parse_args()
 
-    if not args.prp_path and not args.prp:
-        sys.exit("Must supply --prp or --prp-path")
-
-    prp_path = Path(args.prp_path) if args.prp_path else ROOT / f"PRPs/{args.prp}.md"
-    if not prp_path.exists():
-        sys.exit(f"PRP not found: {prp_path}")
+    if args.replay:
+        sys.exit(replay(Path(args.replay)))
+
+    if not args.prp_path and not args.prp and not args.prp_glob:
+        sys.exit("Must supply --prp, --prp-path or --prp-glob")
+
+    prp_paths = resolve_prps(args)
+
+    if len(prp_paths) > 1 or args.prp_glob:
+        if args.interactive:
+            sys.exit("--interactive runs a single PRP")
+        if args.capture:
+            sys.exit("--capture records a single PRP; parallel runs keep per-run logs")
+        # Summaries come from result messages, which text output lacks
+        output_format = (
+            "stream-json" if args.output_format == "text" else args.output_format
+        )
+        summary = run_parallel(
+            prp_paths,
+            model=args.model,
+            output_format=output_format,
+            concurrency=args.concurrency,
+            runs_dir=Path(args.runs_dir).resolve() if args.runs_dir else None,
+        )
+        print_summary(summary)
+        print(json.dumps(summary, indent=2))
+        if summary["total"]["succeeded"] < summary["total"]["prps"]:
+            sys.exit(1)
+        return
+
+    prp_path = prp_paths[0]
+    # Resolved before the chdir below, as run_parallel does
+    model = resolve_model(args.model)
+    transcript = None
+    output_format = args.output_format
+    if args.capture:
+        if args.interactive:
+            sys.exit("--capture records headless runs only")
+        # Resolved before the chdir below; capture always streams JSON
+        transcript = Transcript(
+            Path(args.capture).resolve(), prp=str(prp_path), model=model
+        )
+        output_format = "stream-json"
 
     os.chdir(ROOT)  # ensure relative paths match PRP expectations
     prompt = build_prompt(prp_path)
     run_model(
         prompt,
-        model=args.model,
+        model=model,
         interactive=args.interactive,
-        output_format=args.output_format,
+        output_format=output_format,
+        transcript=transcript,
     )
 
 
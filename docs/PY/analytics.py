@@ -0,0 +1,301 @@
+"""
+Columnar snapshot of the published opportunities
+Memory-mapped NumPy columns and vectorized aggregates for dashboard analytics
+
+Each publish exports the generation's numeric columns as one .npy file per
+column in a fresh directory, then points CURRENT at it:
+
+    opportunities.columns/
+        CURRENT                  -> "g12-1760903504962394000"
+        g12-1760903504962394000/
+            meta.json            generation, rows, exported_at
+            score.npy            int32
+            created_at.npy       datetime64[s]
+            ...
+
+Readers map the files read-only, so aggregates run over the page cache
+without copying rows into Python objects. numpy is optional: without it
+nothing is exported and callers fall back to SQL.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import metrics
+
+# Environment configuration
+SNAPSHOT_DIR_ENV = 'OF_SNAPSHOT_DIR'  # snapshot directory (default: <db name>.columns next to the db)
+
+CURRENT_FILE = 'CURRENT'
+META_FILE = 'meta.json'
+
+# Exported opportunities column -> numpy dtype
+COLUMNS = {
+    'id': 'int64',
+    'score': 'int32',
+    'mentions': 'int32',
+    'revenue_amount': 'int64',
+    'competitors': 'int32',
+    'competition_level': 'uint8',
+    'validated': 'bool',
+    'created_at': 'datetime64[s]',
+}
+
+# Nullable numeric columns and the value a NULL is exported as; a NULL
+# competition_level exports as UNKNOWN_LEVEL
+NULL_AS = {
+    'revenue_amount': 0,
+    'competitors': 0,
+    'validated': 0,
+}
+
+# competition_level is stored as an index into this tuple (see
+# OpportunityScorer.get_competition_level); anything else is UNKNOWN_LEVEL
+COMPETITION_LEVELS = ('Very Low', 'Low', 'Medium', 'High', 'Very High')
+UNKNOWN_LEVEL = 255
+
+# Score histogram bin edges; the last bin includes 100
+SCORE_BINS = (0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100)
+
+# /api/stats threshold for high_score, and its totals with nothing published
+HIGH_SCORE = 70
+EMPTY_SUMMARY = {'total': 0, 'validated': 0, 'high_score': 0, 'avg_score': 0}
+
+_np = None
+_np_checked = False
+
+
+def _numpy():
+    """numpy, imported on first use; None (with one warning) when not installed"""
+    global _np, _np_checked
+    if not _np_checked:
+        _np_checked = True
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            print("Warning: numpy not installed. Install with: pip install numpy --break-system-packages")
+    return _np
+
+
+def available() -> bool:
+    """True if snapshots can be written and read"""
+    return _numpy() is not None
+
+
+def default_dir(db_path: str) -> str:
+    """OF_SNAPSHOT_DIR, else opportunities.columns beside opportunities.db"""
+    return os.environ.get(SNAPSHOT_DIR_ENV) or os.path.splitext(db_path)[0] + '.columns'
+
+
+def export(cursor, directory: str, generation: int) -> Optional[str]:
+    """
+    Write `generation`'s columns to a new snapshot and make it current
+    
+    Returns the snapshot path, or None when numpy is not installed. NULLs
+    in nullable numeric columns export as NULL_AS. Older snapshots are
+    removed; readers that still map them keep working (an
+    unlinked file stays readable until unmapped).
+    """
+    np = _numpy()
+    if np is None:
+        return None
+    
+    with metrics.timer('snapshot_export_duration_seconds'):
+        expressions = ', '.join(
+            f'COALESCE({column}, {NULL_AS[column]})' if column in NULL_AS else column
+            for column in COLUMNS
+        )
+        rows = cursor.execute(
+            f'SELECT {expressions} FROM opportunities WHERE generation = ? ORDER BY id',
+            (generation,)
+        ).fetchall()
+        values = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        
+        # Converted before anything touches the directory, so bad data
+        # leaves no partial snapshot behind
+        levels = {level: code for code, level in enumerate(COMPETITION_LEVELS)}
+        arrays = {}
+        for (column, dtype), column_values in zip(COLUMNS.items(), values):
+            if column == 'competition_level':
+                column_values = [levels.get(level, UNKNOWN_LEVEL) for level in column_values]
+            arrays[column] = np.array(column_values, dtype=dtype)
+        
+        os.makedirs(directory, exist_ok=True)
+        name = f'g{generation}-{time.time_ns()}'
+        staging = os.path.join(directory, f'.{name}.tmp')
+        os.makedirs(staging)
+        try:
+            for column, array in arrays.items():
+                np.save(os.path.join(staging, f'{column}.npy'), array, allow_pickle=False)
+            with open(os.path.join(staging, META_FILE), 'w') as f:
+                json.dump({
+                    'generation': generation,
+                    'rows': len(rows),
+                    'columns': COLUMNS,
+                    'exported_at': datetime.now().isoformat()
+                }, f)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        
+        path = os.path.join(directory, name)
+        os.rename(staging, path)
+        _write_current(directory, name)
+    
+    # Dot entries are other exports still being staged
+    for entry in os.listdir(directory):
+        if entry not in (name, CURRENT_FILE) and not entry.startswith('.'):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    
+    metrics.set_gauge('snapshot_rows', len(rows))
+    return path
+
+
+def _write_current(directory: str, name: str):
+    """Atomically repoint CURRENT"""
+    temp = os.path.join(directory, f'.{CURRENT_FILE}.{os.getpid()}.{threading.get_ident()}')
+    with open(temp, 'w') as f:
+        f.write(name)
+    os.replace(temp, os.path.join(directory, CURRENT_FILE))
+
+
+def invalidate(directory: str):
+    """Mark the current snapshot stale; the next Database.get_snapshot re-exports"""
+    try:
+        os.remove(os.path.join(directory, CURRENT_FILE))
+    except FileNotFoundError:
+        pass
+
+
+class Snapshot:
+    """Read-only memory-mapped columns of one exported generation"""
+    
+    def __init__(self, path: str):
+        np = _numpy()
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.path = path
+        self.generation: int = meta['generation']
+        self.rows: int = meta['rows']
+        self.exported_at: str = meta['exported_at']
+        self.columns = {
+            column: np.load(os.path.join(path, f'{column}.npy'), mmap_mode='r')
+            for column in meta['columns']
+        }
+    
+    def __getitem__(self, column: str):
+        return self.columns[column]
+    
+    def __len__(self) -> int:
+        return self.rows
+
+
+# Directory -> (CURRENT contents, Snapshot); maps are reused until CURRENT changes
+_open: Dict[str, Tuple[str, Snapshot]] = {}
+_open_lock = threading.Lock()
+
+
+def open_snapshot(directory: str) -> Optional[Snapshot]:
+    """The current snapshot in `directory`, or None if there is none (or no numpy)"""
+    if _numpy() is None:
+        return None
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    
+    key = os.path.abspath(directory)
+    with _open_lock:
+        cached = _open.get(key)
+        if cached is not None and cached[0] == name:
+            metrics.incr('cache_hits_total', cache='snapshot')
+            return cached[1]
+    
+    metrics.incr('cache_misses_total', cache='snapshot')
+    try:
+        snapshot = Snapshot(os.path.join(directory, name))
+    except FileNotFoundError:
+        # Replaced between reading CURRENT and opening it
+        return None
+    with _open_lock:
+        _open[key] = (name, snapshot)
+    return snapshot
+
+
+def summary(snapshot: Snapshot) -> Dict:
+    """/api/stats totals: count, validated, high scores and mean score"""
+    if not len(snapshot):
+        return dict(EMPTY_SUMMARY)
+    score = snapshot['score']
+    return {
+        'total': len(snapshot),
+        'validated': int(snapshot['validated'].sum()),
+        'high_score': int((score >= HIGH_SCORE).sum()),
+        'avg_score': round(float(score.mean()))
+    }
+
+
+def score_distribution(snapshot: Snapshot, bins=SCORE_BINS) -> List[Dict]:
+    """Opportunity counts per score bin"""
+    np = _numpy()
+    counts, edges = np.histogram(snapshot['score'], bins=bins)
+    return [
+        {'min': int(low), 'max': int(high), 'count': int(count)}
+        for low, high, count in zip(edges[:-1], edges[1:], counts)
+    ]
+
+
+def percentiles(snapshot: Snapshot, column: str, points=(25, 50, 75, 90)) -> Dict[str, float]:
+    """p25/p50/... of a numeric column ({} when empty)"""
+    if not len(snapshot):
+        return {}
+    np = _numpy()
+    values = np.percentile(snapshot[column], points)
+    return {f'p{point}': round(float(value), 2) for point, value in zip(points, values)}
+
+
+def by_competition_level(snapshot: Snapshot) -> List[Dict]:
+    """Count and mean score, revenue and mentions per competition level"""
+    np = _numpy()
+    codes = snapshot['competition_level'].astype(np.intp)
+    codes[codes == UNKNOWN_LEVEL] = len(COMPETITION_LEVELS)
+    size = len(COMPETITION_LEVELS) + 1
+    counts = np.bincount(codes, minlength=size)
+    
+    def means(column):
+        sums = np.bincount(codes, weights=snapshot[column], minlength=size)
+        return np.divide(sums, counts, out=np.zeros(size), where=counts > 0)
+    
+    score, revenue, mentions = means('score'), means('revenue_amount'), means('mentions')
+    return [
+        {
+            'competition_level': level,
+            'count': int(counts[code]),
+            'avg_score': round(float(score[code]), 1),
+            'avg_revenue_amount': round(float(revenue[code])),
+            'avg_mentions': round(float(mentions[code]), 1)
+        }
+        for code, level in enumerate(COMPETITION_LEVELS + ('Unknown',))
+        if counts[code] or code < len(COMPETITION_LEVELS)
+    ]
+
+
+def created_per_day(snapshot: Snapshot, days: Optional[int] = None) -> List[Dict]:
+    """Opportunities by the day they were first found, optionally the last `days` only"""
+    np = _numpy()
+    created = snapshot['created_at'].astype('datetime64[D]')
+    if days is not None:
+        created = created[created >= np.datetime64(datetime.now().date()) - np.timedelta64(days, 'D')]
+    day_values, counts = np.unique(created, return_counts=True)
+    return [
+        {'day': str(day), 'count': int(count)}
+        for day, count in zip(day_values, counts)
+        if not np.isnat(day)
+    ]
@@ -3,17 +3,167 @@ Flask API Server for Opportunity Finder
 Provides REST API endpoints for the frontend
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, g, Response
 from flask_cors import CORS
-from opportunity_finder import OpportunityFinder, Database
+from werkzeug.middleware.proxy_fix import ProxyFix
+from opportunity_finder import OpportunityFinder, Database, ScanInProgress
+from opportunity_views import TIER_MIN_RANK, DEFAULT_TIER
+import analytics
+import events
+import metrics
+from profiling import Profiler, flag_mode, requests_opted_in
+from throttling import RateLimiter, SingleFlight, api_keys_from_env, proxy_hops_from_env
 import json
+import math
+import threading
+import time
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend access
 
-# Initialize
-db = Database()
-finder = OpportunityFinder()
+# Behind a reverse proxy the client address comes from X-Forwarded-For,
+# trusted for exactly OF_PROXY_HOPS hops so clients cannot spoof it
+proxy_hops = proxy_hops_from_env()
+if proxy_hops:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops)
+
+# Built on first request, not at import: gunicorn workers fork fast and
+# the schema is migrated once per process
+_db = None
+_finder = None
+_init_lock = threading.Lock()
+request_profiler = Profiler.from_env()
+# ?profile= writes files and slows the request, so clients may only ask
+# for it when the operator opted in (OF_PROFILE_REQUESTS=1)
+profile_requests = requests_opted_in()
+rate_limiter = RateLimiter.from_env()
+api_keys = api_keys_from_env()
+# Identical concurrent /api/opportunities queries share one DB read
+opportunities_flight = SingleFlight('opportunities')
+
+# Probes and scrapes are not user traffic
+RATE_LIMIT_EXEMPT = {'/api/health', '/api/metrics'}
+
+SSE_KEEPALIVE_SECONDS = 15  # comment line sent to idle streams so proxies keep them open
+
+
+def get_db() -> Database:
+    """Shared Database handle (connections are opened per call)"""
+    global _db
+    if _db is None:
+        with _init_lock:
+            if _db is None:
+                _db = Database()
+    return _db
+
+
+def get_finder() -> OpportunityFinder:
+    """Shared finder for scans without credentials; reuses the shared DB"""
+    global _finder
+    if _finder is None:
+        db = get_db()
+        with _init_lock:
+            if _finder is None:
+                _finder = OpportunityFinder(db=db)
+    return _finder
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+def client_key() -> str:
+    """
+    Rate limit key: the caller's API key if it is one of OF_API_KEYS
+    
+    Unknown keys are ignored, so rotating made-up keys cannot buy fresh
+    buckets; everyone else is limited by (proxy-aware) client address.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if not api_key:
+        auth = request.headers.get('Authorization', '')
+        api_key = auth[7:] if auth.startswith('Bearer ') else None
+    if api_key and api_key in api_keys:
+        return f'key:{api_key}'
+    return f'ip:{request.remote_addr}'
+
+
+@app.before_request
+def enforce_rate_limit():
+    """Per-client token bucket; over-limit requests get 429 with Retry-After"""
+    if request.path in RATE_LIMIT_EXEMPT:
+        return None
+    allowed, retry_after = rate_limiter.acquire(client_key())
+    if allowed:
+        return None
+    
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.REGISTRY.incr('http_rate_limited_total', endpoint=endpoint)
+    response = jsonify({
+        'success': False,
+        'error': 'Rate limit exceeded'
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+@app.before_request
+def start_request_profile():
+    """
+    Profile all requests when OF_PROFILE is set
+    
+    With OF_PROFILE_REQUESTS=1, ?profile=1 (or ?profile=sample) also
+    profiles a single request; the flag is ignored otherwise.
+    """
+    flag_requested = flag_mode(request.args.get('profile', '')) if profile_requests else None
+    if not flag_requested and not request_profiler.enabled:
+        return
+    mode = flag_requested or request_profiler.mode
+    name = f"request-{request.method}-{request.path}"
+    g.profile_session = request_profiler.start(name, mode=mode)
+
+
+@app.teardown_request
+def stop_request_profile(exc=None):
+    request_profiler.stop(g.pop('profile_session', None))
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Count requests and record latency per endpoint"""
+    start = g.pop('request_start', None)
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.REGISTRY.incr(
+        'http_requests_total',
+        endpoint=endpoint,
+        method=request.method,
+        status=response.status_code
+    )
+    if start is not None:
+        metrics.REGISTRY.observe(
+            'http_request_duration_seconds',
+            time.perf_counter() - start,
+            endpoint=endpoint,
+            method=request.method
+        )
+    return response
+
+
+def query_opportunities(tier: str, min_score: int, sort_by: str, search: str):
+    """Filtered, sorted opportunities (shared by coalesced requests; do not mutate)"""
+    # Tier, min score and sort come precomputed and in order
+    opportunities = get_db().get_opportunity_view(tier, min_score, sort_by)
+    
+    # Filter by search term
+    if search:
+        opportunities = [
+            o for o in opportunities 
+            if search in o['title'].lower() or search in o['problem'].lower()
+        ]
+    
+    return opportunities
 
 
 @app.route('/api/opportunities', methods=['GET'])
@@ -22,6 +172,7 @@ def get_opportunities():
     Get all opportunities
     
     Query params:
+    - tier: Subscription tier (basic, pro, premium) (default: premium)
     - min_score: Minimum score filter (default: 0)
     - sort: Sort by (score, revenue, mentions) (default: score)
     - search: Search term for title/problem
@@ -30,27 +181,18 @@ def get_opportunities():
         min_score = int(request.args.get('min_score', 0))
         sort_by = request.args.get('sort', 'score')
         search = request.args.get('search', '').lower()
+        tier = request.args.get('tier', DEFAULT_TIER).lower()
         
-        opportunities = db.get_all_opportunities()
-        
-        # Filter by min score
-        opportunities = [o for o in opportunities if o['score'] >= min_score]
-        
-        # Filter by search term
-        if search:
-            opportunities = [
-                o for o in opportunities 
-                if search in o['title'].lower() or search in o['problem'].lower()
-            ]
-        
-        # Sort
-        sort_key = {
-            'score': lambda x: x['score'],
-            'revenue': lambda x: x['revenue_amount'],
-            'mentions': lambda x: x['mentions']
-        }.get(sort_by, lambda x: x['score'])
+        if tier not in TIER_MIN_RANK:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown tier '{tier}'"
+            }), 400
         
-        opportunities = sorted(opportunities, key=sort_key, reverse=True)
+        opportunities = opportunities_flight.do(
+            (tier, min_score, sort_by, search),
+            query_opportunities, tier, min_score, sort_by, search
+        )
         
         return jsonify({
             'success': True,
@@ -69,7 +211,7 @@ def get_opportunities():
 def get_opportunity(opportunity_id):
     """Get single opportunity by ID"""
     try:
-        opportunities = db.get_all_opportunities()
+        opportunities = get_db().get_all_opportunities()
         opportunity = next((o for o in opportunities if o['id'] == opportunity_id), None)
         
         if not opportunity:
@@ -90,6 +232,42 @@ def get_opportunity(opportunity_id):
         }), 500
 
 
+@app.route('/api/opportunities/<int:opportunity_id>/trend', methods=['GET'])
+def get_opportunity_trend(opportunity_id):
+    """
+    Get mention trend for an opportunity
+    
+    Query params:
+    - days: History window in days (default: 365)
+    """
+    try:
+        days = int(request.args.get('days', 365))
+        opportunities = get_db().get_all_opportunities()
+        opportunity = next((o for o in opportunities if o['id'] == opportunity_id), None)
+        
+        if not opportunity:
+            return jsonify({
+                'success': False,
+                'error': 'Opportunity not found'
+            }), 404
+        
+        key = opportunity['theme_key']
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'trend': get_db().get_trend(key),
+                'series': get_db().get_mention_series(key, days=days)
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/scan', methods=['POST'])
 def run_scan():
     """
@@ -101,21 +279,24 @@ def run_scan():
             "client_id": "...",
             "client_secret": "...",
             "user_agent": "..."
-        }
+        },
+        "resume": true    # continue the last scan if it did not complete, or retry its failed units
     }
+    
+    Returns 409 while another scan is running.
     """
     try:
         data = request.get_json() or {}
         reddit_creds = data.get('reddit_credentials')
         
-        # Initialize finder with credentials if provided
+        # Only credentialed scans need their own finder (and praw client)
         if reddit_creds:
-            finder_instance = OpportunityFinder(reddit_credentials=reddit_creds)
+            finder_instance = OpportunityFinder(reddit_credentials=reddit_creds, db=get_db())
         else:
-            finder_instance = OpportunityFinder()
+            finder_instance = get_finder()
         
         # Run scan
-        opportunities = finder_instance.run_scan()
+        opportunities = finder_instance.run_scan(resume=bool(data.get('resume')))
         
         return jsonify({
             'success': True,
@@ -129,6 +310,11 @@ def run_scan():
             ]
         })
         
+    except ScanInProgress as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 409
     except Exception as e:
         return jsonify({
             'success': False,
@@ -136,11 +322,56 @@ def run_scan():
         }), 500
 
 
+@app.route('/api/scan/events', methods=['GET'])
+def scan_events():
+    """
+    Live scan progress as Server-Sent Events
+    
+    Streams stage_started/stage_finished, unit_collected,
+    pain_points_collected, opportunity_scored and scan_started/
+    scan_finished events from scans run by this process. Each client
+    has a bounded buffer; a slow client loses its oldest events instead
+    of slowing the scan. Reconnecting clients (Last-Event-ID header or
+    ?last_event_id=) get the recent events they missed.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    subscription = events.BUS.subscribe(last_event_id=last_event_id)
+    
+    def stream():
+        try:
+            yield ': connected\n\n'
+            while True:
+                event = subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                yield events.format_sse(event) if event else ': keepalive\n\n'
+        finally:
+            # Runs when the client disconnects and the generator is closed
+            subscription.close()
+    
+    return Response(
+        stream(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get summary statistics"""
     try:
-        opportunities = db.get_all_opportunities()
+        # Aggregated over the memory-mapped snapshot when numpy is installed
+        snapshot = get_db().get_snapshot()
+        if snapshot is not None:
+            return jsonify({
+                'success': True,
+                'data': analytics.summary(snapshot)
+            })
+        
+        opportunities = get_db().get_all_opportunities()
         
         if not opportunities:
             return jsonify({
@@ -172,6 +403,82 @@ def get_stats():
         }), 500
 
 
+@app.route('/api/stats/analytics', methods=['GET'])
+def get_stats_analytics():
+    """
+    Score distribution, competition breakdown and discovery trend
+    
+    Vectorized over the columnar snapshot of the published generation;
+    requires numpy (503 without it).
+    
+    Query params:
+    - days: Trend window in days (default: all)
+    """
+    try:
+        days = request.args.get('days', type=int)
+        snapshot = get_db().get_snapshot()
+        
+        if snapshot is None:
+            if not analytics.available():
+                return jsonify({
+                    'success': False,
+                    'error': 'Analytics need numpy: pip install numpy'
+                }), 503
+            return jsonify({
+                'success': True,
+                'data': {
+                    'generation': None,
+                    'summary': analytics.EMPTY_SUMMARY,
+                    'score_distribution': [],
+                    'score_percentiles': {},
+                    'revenue_percentiles': {},
+                    'competition': [],
+                    'created_per_day': []
+                }
+            })
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'generation': snapshot.generation,
+                'summary': analytics.summary(snapshot),
+                'score_distribution': analytics.score_distribution(snapshot),
+                'score_percentiles': analytics.percentiles(snapshot, 'score'),
+                'revenue_percentiles': analytics.percentiles(snapshot, 'revenue_amount'),
+                'competition': analytics.by_competition_level(snapshot),
+                'created_per_day': analytics.created_per_day(snapshot, days)
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Prometheus text exposition of request, query, cache and scan metrics
+    
+    Last-scan gauges fall back to the scan_runs table when no scan has run
+    in this process.
+    """
+    gauges = {name for (name, _labels) in metrics.REGISTRY.gauges}
+    if 'last_scan_duration_seconds' not in gauges:
+        runs = get_db().get_scan_runs(limit=1, status='completed')
+        if runs:
+            metrics.REGISTRY.set_gauge('last_scan_duration_seconds', runs[0]['duration_seconds'])
+            metrics.REGISTRY.set_gauge('last_scan_pain_points', runs[0]['pain_points'])
+            metrics.REGISTRY.set_gauge('last_scan_opportunities', runs[0]['opportunities'])
+    
+    return Response(
+        metrics.render_prometheus(),
+        mimetype='text/plain; version=0.0.4'
+    )
+
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -188,8 +495,12 @@ if __name__ == '__main__':
     print("\nEndpoints:")
     print("  GET  /api/opportunities     - Get all opportunities")
     print("  GET  /api/opportunities/:id - Get single opportunity")
+    print("  GET  /api/opportunities/:id/trend - Mention trend")
     print("  POST /api/scan              - Run new scan")
+    print("  GET  /api/scan/events       - Live scan progress (SSE)")
     print("  GET  /api/stats             - Get statistics")
+    print("  GET  /api/stats/analytics   - Score, competition and trend aggregates")
+    print("  GET  /api/metrics           - Prometheus metrics")
     print("  GET  /api/health            - Health check")
     print("\n" + "=" * 60)
     
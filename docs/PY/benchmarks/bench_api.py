@@ -0,0 +1,62 @@
+"""
+API endpoint benchmarks through Flask's test client
+"""
+
+import contextlib
+import io
+from typing import Callable, Dict, List
+
+from harness import bench
+from throttling import RateLimiter
+
+
+def checked(name: str, call: Callable) -> Callable:
+    """Wrap a request so any non-2xx response fails the benchmark instead of being timed"""
+    def run_checked():
+        response = call()
+        if not 200 <= response.status_code < 300:
+            raise RuntimeError(f"{name} returned {response.status_code}")
+        return response
+    return run_checked
+
+
+def run(size: int) -> List[Dict]:
+    try:
+        import api_server
+    except ImportError as e:
+        print(f"  Skipping API benchmarks ({e})")
+        return []
+    
+    # Every request comes from one test client address; the default
+    # limiter would answer most of them with 429 and time those instead
+    api_server.rate_limiter = RateLimiter(0)
+    client = api_server.app.test_client()
+    repeat = 5 if size <= 100000 else 1
+    
+    # The db suite republishes, so ids of the seeded rows may be gone
+    published = client.get('/api/opportunities').get_json().get('data') or [{'id': 1}]
+    opportunity_id = published[0]['id']
+    
+    endpoints = [
+        ('GET /api/opportunities', lambda: client.get('/api/opportunities')),
+        ('GET /api/opportunities?min_score=70&sort=revenue',
+         lambda: client.get('/api/opportunities?min_score=70&sort=revenue')),
+        ('GET /api/opportunities?search=invoice',
+         lambda: client.get('/api/opportunities?search=invoice')),
+        ('GET /api/opportunities/<id>', lambda: client.get(f'/api/opportunities/{opportunity_id}')),
+        ('GET /api/stats', lambda: client.get('/api/stats')),
+        ('GET /api/health', lambda: client.get('/api/health')),
+        ('GET /api/metrics', lambda: client.get('/api/metrics')),
+    ]
+    
+    # Scans print progress; keep benchmark output readable
+    def scan():
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return client.post('/api/scan', json={})
+    
+    endpoints.append(('POST /api/scan', scan))
+    
+    results = []
+    for name, call in endpoints:
+        results.append(bench(name, checked(name, call), size=size, repeat=repeat))
+    return results
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Seen-URL filter benchmark: memory, throughput and false positive rate
+
+Adds N synthetic post URLs to a ScalableBloomFilter per error rate, then
+probes N unseen URLs, and compares the footprint with a plain set of the
+same URLs. Also times save/load of the persisted filter.
+
+Usage (from docs/PY):
+    python benchmarks/bench_bloom.py
+    python benchmarks/bench_bloom.py --items 1000000 --error-rates 0.01,0.001,0.0001
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bloom import ScalableBloomFilter  # noqa: E402
+from harness import write_results  # noqa: E402
+
+
+def url(i: int, prefix: str = 'seen') -> str:
+    return f'https://reddit.com/r/{prefix}/comments/{i:x}/'
+
+
+def set_bytes(items) -> int:
+    """Approximate memory of a set of strings (table plus string objects)"""
+    return sys.getsizeof(items) + sum(sys.getsizeof(item) for item in items)
+
+
+def result(name, size, seconds, count):
+    return {
+        'name': name, 'size': size, 'repeat': 1, 'number': count,
+        'median_s': seconds / count, 'p95_s': seconds / count, 'min_s': seconds / count,
+        'ops_per_s': count / seconds if seconds else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the seen-URL Bloom filter.")
+    parser.add_argument("--items", type=int, default=200000, help="URLs added")
+    parser.add_argument("--error-rates", default="0.01,0.001,0.0001", help="Comma-separated target FP rates")
+    parser.add_argument("--initial-capacity", type=int, default=100000, help="First slice capacity")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+    
+    n = args.items
+    seen_urls = [url(i) for i in range(n)]
+    probe_urls = [url(i, 'unseen') for i in range(n)]
+    baseline = set(seen_urls)
+    print(f"{n:,} URLs; set() baseline {set_bytes(baseline) / 1e6:.1f}MB\n")
+    print(f"{'target FP':>10} {'measured FP':>12} {'slices':>6} {'memory':>9} {'add/s':>10} {'lookup/s':>10} {'save':>8} {'load':>8}")
+    
+    results = []
+    workdir = tempfile.mkdtemp(prefix='of-bloom-')
+    failures = []
+    for error_rate in (float(r) for r in args.error_rates.split(',')):
+        seen = ScalableBloomFilter(initial_capacity=args.initial_capacity, error_rate=error_rate)
+        
+        start = time.perf_counter()
+        seen.update(seen_urls)
+        add_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        false_positives = sum(1 for u in probe_urls if u in seen)
+        lookup_s = time.perf_counter() - start
+        
+        missing = sum(1 for u in seen_urls[::97] if u not in seen)
+        if missing:
+            failures.append(f"error_rate={error_rate}: {missing} added URLs not found")
+        
+        path = os.path.join(workdir, f'seen-{error_rate}.bloom')
+        start = time.perf_counter()
+        seen.save(path)
+        save_s = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = ScalableBloomFilter.load(path)
+        load_s = time.perf_counter() - start
+        if seen_urls[0] not in loaded:
+            failures.append(f"error_rate={error_rate}: reloaded filter lost items")
+        
+        measured = false_positives / n
+        print(f"{error_rate:>10g} {measured:>12.5f} {len(seen.filters):>6} {seen.nbytes / 1e6:>8.2f}M "
+              f"{n / add_s:>10,.0f} {n / lookup_s:>10,.0f} {save_s * 1000:>6.1f}ms {load_s * 1000:>6.1f}ms")
+        
+        results.append(result(f'bloom add (fp={error_rate:g})', n, add_s, n))
+        results.append(result(f'bloom lookup (fp={error_rate:g})', n, lookup_s, n))
+        # Compound rate of the slices stays under the target; allow sampling noise
+        if measured > error_rate * 1.5 + 5 / n:
+            failures.append(f"error_rate={error_rate}: measured false positive rate {measured:.5f}")
+    
+    start = time.perf_counter()
+    sum(1 for u in probe_urls if u in baseline)
+    set_lookup_s = time.perf_counter() - start
+    print(f"\nset() lookup/s: {n / set_lookup_s:,.0f}")
+    
+    if args.output:
+        write_results(results, os.path.abspath(args.output))
+    
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
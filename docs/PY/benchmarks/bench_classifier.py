@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Keyword classifier benchmark: compile and batch classification at scale
+
+Generates N synthetic keyword rules, compiles them into one automaton and
+classifies a batch of synthetic theme texts, cold and then from the
+per-theme-key cache. Cross-checks the automaton against per-rule regex
+matching on a sample. Exits 1 on any mismatch.
+
+Usage (from docs/PY):
+    python benchmarks/bench_classifier.py
+    python benchmarks/bench_classifier.py --rules 20000 --themes 5000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from classifier import COMPLEXITY_LEVELS, Classifier  # noqa: E402
+from harness import write_results  # noqa: E402
+from seed import WORDS  # noqa: E402
+
+
+def result(name, size, seconds, count):
+    return {
+        'name': name, 'size': size, 'repeat': 1, 'number': count,
+        'median_s': seconds / count, 'p95_s': seconds / count, 'min_s': seconds / count,
+        'ops_per_s': count / seconds if seconds else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the keyword classifier.")
+    parser.add_argument("--rules", type=int, default=5000, help="Synthetic keyword rules")
+    parser.add_argument("--themes", type=int, default=2000, help="Themes classified per batch")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+    
+    rng = random.Random(1234)
+    vocabulary = WORDS + [f'term{i}' for i in range(args.rules)]
+    keywords = {f'{rng.choice(vocabulary)} {rng.choice(vocabulary)}' for _ in range(args.rules)}
+    keywords = sorted(keywords | set(WORDS))
+    rules = {
+        'feasibility': {k: rng.randint(1, 10) for k in keywords[::2]},
+        'build_complexity': {k: rng.choice(COMPLEXITY_LEVELS) for k in keywords[1::2]},
+        'b2b': keywords[::7],
+    }
+    themes = [
+        {
+            'title': f'{" ".join(rng.choice(vocabulary) for _ in range(3))} tool {i}',
+            'problem': ' '.join(rng.choice(vocabulary) for _ in range(40))
+        }
+        for i in range(args.themes)
+    ]
+    
+    results = []
+    failures = []
+    
+    start = time.perf_counter()
+    classifier = Classifier(rules)
+    compile_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    cold = classifier.classify_themes(themes)
+    cold_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    warm = classifier.classify_themes(themes)
+    warm_s = time.perf_counter() - start
+    if warm != cold:
+        failures.append("cached results differ from cold results")
+    
+    print(f"{len(keywords):,} keywords, {args.themes:,} themes")
+    print(f"  compile            {compile_s * 1000:9.1f}ms")
+    print(f"  classify (cold)    {cold_s * 1000:9.1f}ms  ({cold_s / args.themes * 1e6:.0f}us/theme)")
+    print(f"  classify (cached)  {warm_s * 1000:9.1f}ms  ({warm_s / args.themes * 1e6:.1f}us/theme)")
+    results.append(result('classifier compile', len(keywords), compile_s, 1))
+    results.append(result('classify_themes (cold)', len(keywords), cold_s, args.themes))
+    results.append(result('classify_themes (cached)', len(keywords), warm_s, args.themes))
+    
+    # Per-rule regexes are what the automaton replaces; check and time a sample
+    patterns = [(k, re.compile(r'(?<![a-z0-9])' + re.escape(k) + r'(?![a-z0-9])')) for k in keywords]
+    sample = themes[:20]
+    start = time.perf_counter()
+    for theme, labels in zip(sample, cold):
+        text = f"{theme['title']}\n{theme['problem']}".lower()
+        expected = sorted(k for k, pattern in patterns if pattern.search(text))
+        if labels['keywords'] != expected:
+            failures.append(f"'{theme['title']}': matched {labels['keywords']}, expected {expected}")
+    regex_s = time.perf_counter() - start
+    print(f"  per-rule regex     {regex_s / len(sample) * 1e6:9.0f}us/theme (sample of {len(sample)})")
+    
+    if args.output:
+        write_results(results, os.path.abspath(args.output))
+    
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
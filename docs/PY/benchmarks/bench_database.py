@@ -0,0 +1,93 @@
+"""
+Database insert/read path benchmarks
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+import analytics
+from harness import bench
+from opportunity_finder import Database, Opportunity
+
+INSERTS_PER_ROUND = 100
+
+
+def _opportunity(i: int) -> Opportunity:
+    return Opportunity(
+        id=None,
+        title=f'Benchmark Tool {i}',
+        problem='Benchmark problem statement',
+        score=70,
+        mentions=40,
+        revenue='£5,000 MRR',
+        revenue_amount=5000,
+        competitors=4,
+        competition_level='Low',
+        build_complexity='Low',
+        sources=['r/SaaS'],
+        example='Example SaaS',
+        validated=True,
+        recommendation='Validate with landing page first',
+        market_size='Small to Medium',
+        created_at=datetime.now().isoformat()
+    )
+
+
+def run(db: Database, size: int) -> List[Dict]:
+    results = []
+    
+    # Reads first: save_opportunities publishes a new generation
+    repeat = 5 if size <= 100000 else 1
+    results.append(bench('db.get_all_opportunities', db.get_all_opportunities, size=size, repeat=repeat))
+    results.append(bench(
+        'db.get_opportunity_view (pro, min_score=70, revenue)',
+        lambda: db.get_opportunity_view('pro', 70, 'revenue'), size=size, repeat=repeat
+    ))
+    if analytics.available():
+        results.append(bench('db.export_snapshot', db.export_snapshot, size=size, repeat=repeat))
+        results.append(bench(
+            'analytics.summary (snapshot)',
+            lambda: analytics.summary(db.get_snapshot()), size=size, repeat=repeat
+        ))
+        results.append(bench(
+            'analytics.by_competition_level (snapshot)',
+            lambda: analytics.by_competition_level(db.get_snapshot()), size=size, repeat=repeat
+        ))
+    
+    def insert_pain_points():
+        for i in range(INSERTS_PER_ROUND):
+            db.save_pain_point('r/bench', f'benchmark pain point {i}', f'https://reddit.com/bench/{i}')
+    
+    result = bench('db.save_pain_point', insert_pain_points, size=size, repeat=3)
+    result['per_row_s'] = result['median_s'] / INSERTS_PER_ROUND
+    results.append(result)
+    
+    def insert_opportunities():
+        for i in range(INSERTS_PER_ROUND):
+            db.save_opportunity(_opportunity(i))
+    
+    result = bench('db.save_opportunity', insert_opportunities, size=size, repeat=3)
+    result['per_row_s'] = result['median_s'] / INSERTS_PER_ROUND
+    results.append(result)
+    
+    def publish_opportunities():
+        generation = db.begin_generation()
+        db.save_opportunities([_opportunity(i) for i in range(INSERTS_PER_ROUND)], generation)
+    
+    result = bench('db.save_opportunities', publish_opportunities, size=size, repeat=3)
+    result['per_row_s'] = result['median_s'] / INSERTS_PER_ROUND
+    results.append(result)
+    
+    # A year of daily history for one theme, then the trend read paths
+    start = date.today() - timedelta(days=364)
+    for i in range(365):
+        db.record_mentions({'bench-theme': 10 + i % 17}, (start + timedelta(days=i)).isoformat())
+    results.append(bench('db.get_trend', lambda: db.get_trend('bench-theme'), size=size, number=100))
+    results.append(bench(
+        'db.get_mention_series[365d]',
+        lambda: db.get_mention_series('bench-theme', days=365),
+        size=size,
+        number=100
+    ))
+    
+    return results
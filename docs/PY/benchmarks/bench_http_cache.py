@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+HTTP cache benchmark against a local stub server
+
+Serves synthetic listing pages with ETag/Last-Modified from http.server on
+localhost, then times cold fetches, fresh hits, 304 revalidations and
+size-bounded eviction through http_cache.HTTPCache. Exits 1 if the stub
+sees a different number of requests or bytes than the cache should cause.
+
+Usage (from docs/PY):
+    python benchmarks/bench_http_cache.py
+    python benchmarks/bench_http_cache.py --pages 500 --page-kb 64 --latency 0.02
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import metrics  # noqa: E402
+from harness import write_results  # noqa: E402
+from http_cache import HTTPCache  # noqa: E402
+
+
+class StubServer:
+    """Listing pages at /listing?page=N; honours If-None-Match"""
+    
+    def __init__(self, page_bytes: int, latency: float):
+        stub = self
+        self.page_bytes = page_bytes
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.modified = formatdate(time.time() - 3600, usegmt=True)
+        self._lock = threading.Lock()
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                
+                body = stub.page(self.path)
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', stub.modified)
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.bytes_sent += len(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/listing'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def page(self, path: str) -> bytes:
+        seed = hashlib.sha256(path.encode()).hexdigest()
+        return (seed * (self.page_bytes // len(seed) + 1))[:self.page_bytes].encode()
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def reset(self):
+        self.requests = self.not_modified = self.bytes_sent = 0
+
+
+def timed(name, pages, func, size):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<30} {elapsed * 1000:9.1f}ms  ({elapsed / pages * 1000:.3f}ms/page)")
+    return {
+        'name': name, 'size': size, 'repeat': 1, 'number': pages,
+        'median_s': elapsed / pages, 'p95_s': elapsed / pages, 'min_s': elapsed / pages,
+        'ops_per_s': pages / elapsed if elapsed else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP cache against a local stub.")
+    parser.add_argument("--pages", type=int, default=200, help="Distinct listing pages")
+    parser.add_argument("--page-kb", type=int, default=32, help="Page body size in KB")
+    parser.add_argument("--latency", type=float, default=0.005, help="Stub server delay per request (seconds)")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+    
+    page_bytes = args.page_kb * 1024
+    workdir = tempfile.mkdtemp(prefix='of-http-cache-')
+    failures = []
+    results = []
+    
+    def check(label, actual, expected):
+        if actual != expected:
+            failures.append(f"{label}: expected {expected}, got {actual}")
+    
+    with StubServer(page_bytes, args.latency) as stub:
+        cache = HTTPCache(os.path.join(workdir, 'http_cache.db'), max_bytes=args.pages * page_bytes * 2)
+        
+        def fetch_all(ttl=None):
+            for page in range(args.pages):
+                response = cache.get(stub.url, params={'page': page}, source='bench', ttl=ttl)
+                assert response.ok and len(response.body) == page_bytes
+        
+        print(f"{args.pages} pages x {args.page_kb}KB, {args.latency * 1000:.0f}ms stub latency")
+        
+        results.append(timed('cold (miss + store)', args.pages, fetch_all, args.pages))
+        check('cold requests', stub.requests, args.pages)
+        
+        stub.reset()
+        results.append(timed('fresh hit', args.pages, fetch_all, args.pages))
+        check('fresh-hit requests', stub.requests, 0)
+        
+        stub.reset()
+        results.append(timed('stale (304 revalidation)', args.pages, lambda: fetch_all(ttl=0), args.pages))
+        check('revalidation requests', stub.requests, args.pages)
+        check('revalidation 304s', stub.not_modified, args.pages)
+        check('revalidation body bytes', stub.bytes_sent, 0)
+        
+        # A cap of a quarter of the pages keeps only the most recently used
+        small = HTTPCache(os.path.join(workdir, 'small.db'), max_bytes=args.pages * page_bytes // 4)
+        for page in range(args.pages):
+            small.get(stub.url, params={'page': page}, source='bench')
+        stats = small.stats()
+        print(f"  eviction: {stats['entries']} entries, {stats['bytes'] / 1024:.0f}KB "
+              f"(cap {stats['max_bytes'] / 1024:.0f}KB)")
+        if stats['bytes'] > stats['max_bytes']:
+            failures.append(f"eviction left {stats['bytes']} bytes over the {stats['max_bytes']} cap")
+    
+    counters = metrics.REGISTRY.snapshot()['counters']
+    hits = counters.get('cache_hits_total{cache="http"}', 0)
+    misses = counters.get('cache_misses_total{cache="http"}', 0)
+    print(f"  cache hits={hits:.0f} misses={misses:.0f}")
+    
+    if args.output:
+        write_results(results, os.path.abspath(args.output))
+    
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Scan pipeline hot-path benchmarks: pain signal detection, scoring, theme aggregation
+"""
+
+import random
+from typing import Dict, List
+
+from harness import bench
+from opportunity_finder import OpportunityFinder, OpportunityScorer, RedditCollector
+from seed import pain_point_rows, COMPLEXITY, SEED
+
+
+def run(finder: OpportunityFinder, size: int) -> List[Dict]:
+    results = []
+    collector = RedditCollector()
+    texts = [f'{row[1]}' for row in pain_point_rows(size)]
+    
+    def detect():
+        for text in texts:
+            collector._contains_pain_signal(text)
+    
+    result = bench('collector._contains_pain_signal', detect, size=size, repeat=3)
+    result['per_item_s'] = result['median_s'] / size
+    results.append(result)
+    
+    rng = random.Random(SEED)
+    inputs = [
+        (rng.randint(0, 100), rng.choice([0, 1000, 2000, 5000, 10000]),
+         rng.randint(0, 30), rng.choice(COMPLEXITY))
+        for _ in range(size)
+    ]
+    
+    def score():
+        for mentions, revenue, competitors, complexity in inputs:
+            OpportunityScorer.calculate_score(mentions, revenue, competitors, complexity)
+    
+    result = bench('scorer.calculate_score', score, size=size, repeat=3)
+    result['per_item_s'] = result['median_s'] / size
+    results.append(result)
+    
+    pain_points = [
+        {'source': source, 'title': text[:60], 'text': text, 'url': url}
+        for source, text, url, _created in pain_point_rows(size)
+    ]
+    results.append(bench(
+        'finder._aggregate_themes',
+        lambda: finder._aggregate_themes(pain_points),
+        size=size,
+        repeat=3
+    ))
+    
+    return results
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Sharded pain point processing speedup
+
+Times pipeline.run_sharded over a synthetic corpus at 1, 2, 4, ... workers
+up to the CPU count and reports speedup relative to one worker.
+
+Usage (from docs/PY):
+    python benchmarks/bench_sharding.py --posts 200000
+    python benchmarks/bench_sharding.py --posts 1000000 --by source --output sharding.json
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent))
+
+import harness  # noqa: E402
+import pipeline  # noqa: E402
+from opportunity_finder import RedditCollector  # noqa: E402
+from synthetic import CorpusConfig, SyntheticCorpus  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sharded scan processing.")
+    parser.add_argument("--posts", type=int, default=200000, help="Total posts")
+    parser.add_argument("--by", choices=pipeline.SHARD_MODES, default="hash")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default="sharding_results.json")
+    args = parser.parse_args()
+    
+    subreddits = RedditCollector.SUBREDDITS
+    config = CorpusConfig(posts_per_subreddit=args.posts // len(subreddits))
+    posts = list(SyntheticCorpus(config).pain_points())
+    keywords = RedditCollector.PAIN_KEYWORDS
+    print(f"Processing {len(posts):,} posts, sharded by {args.by}")
+    
+    worker_counts = []
+    workers = 1
+    while workers < args.max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(args.max_workers)
+    
+    results = []
+    for workers in worker_counts:
+        result = harness.bench(
+            f'pipeline.run_sharded[workers={workers}]',
+            lambda: pipeline.run_sharded(posts, keywords, workers=workers, by=args.by),
+            size=len(posts),
+            repeat=3
+        )
+        result['workers'] = workers
+        result['speedup'] = results[0]['median_s'] / result['median_s'] if results else 1.0
+        result['efficiency'] = result['speedup'] / workers
+        results.append(result)
+    
+    print()
+    for r in results:
+        print(f"  {r['workers']:>3} workers: {r['speedup']:.2f}x speedup ({r['efficiency']:.0%} efficiency)")
+    
+    harness.write_results(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
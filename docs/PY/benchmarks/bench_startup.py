@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API server and CLI
+
+Imports the entry module in fresh interpreters with `python -X importtime`,
+reports wall time and the slowest imports, and fails when heavy optional
+modules (praw, multiprocessing, cProfile, ...) load at import or when an
+OpportunityFinder is merely constructed. Keeps gunicorn prefork startup
+cheap.
+
+Usage (from docs/PY):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --budget-ms 150 --output startup.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import write_results  # noqa: E402
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that must only load once a scan, profile or collector needs them
+FORBIDDEN = (
+    'praw', 'prawcore', 'requests', 'bs4', 'numpy',
+    'multiprocessing', 'concurrent.futures.process', 'cProfile'
+)
+
+# Constructing a finder must not build its collector or import praw
+CONSTRUCT = (
+    "import sys, opportunity_finder as of\n"
+    "of.OpportunityFinder(reddit_credentials={'client_id': 'x', 'client_secret': 'x', 'user_agent': 'x'})\n"
+    f"print(','.join(m for m in {FORBIDDEN!r} if m in sys.modules))\n"
+)
+
+
+def entry_module() -> str:
+    """api_server when Flask is installed, otherwise the CLI module"""
+    probe = subprocess.run(
+        [sys.executable, '-c', 'import flask, flask_cors'],
+        capture_output=True
+    )
+    return 'api_server' if probe.returncode == 0 else 'opportunity_finder'
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds per module from -X importtime output"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def import_once(module: str, cwd: str) -> Tuple[float, Dict[str, int]]:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=cwd,
+        env={**os.environ, 'PYTHONPATH': str(APP_DIR)}
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{proc.stderr[-2000:]}')
+    return wall, parse_importtime(proc.stderr)
+
+
+def construct_check(cwd: str) -> List[str]:
+    proc = subprocess.run(
+        [sys.executable, '-c', CONSTRUCT],
+        capture_output=True, text=True, cwd=cwd,
+        env={**os.environ, 'PYTHONPATH': str(APP_DIR)}
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f'constructing OpportunityFinder failed:\n{proc.stderr[-2000:]}')
+    lines = proc.stdout.strip().splitlines()
+    return [m for m in (lines[-1] if lines else '').split(',') if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time.")
+    parser.add_argument("--module", help="Module to import (default: api_server, or opportunity_finder without Flask)")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the median import exceeds this")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+    
+    module = args.module or entry_module()
+    # Empty working directory: constructing a finder creates opportunities.db
+    cwd = tempfile.mkdtemp(prefix='of-startup-')
+    
+    import_once(module, cwd)  # warm the bytecode cache
+    walls = []
+    samples = []
+    for _ in range(args.runs):
+        wall, cumulative = import_once(module, cwd)
+        walls.append(wall)
+        samples.append(cumulative)
+    
+    own = statistics.median(s.get(module, 0) for s in samples) / 1e6
+    wall = statistics.median(walls)
+    print(f"import {module}: {own * 1000:.1f}ms (median of {args.runs}), "
+          f"interpreter wall {wall * 1000:.1f}ms")
+    
+    last = samples[-1]
+    print("\nSlowest imports (cumulative):")
+    for name, us in sorted(last.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+    
+    problems = []
+    heavy = [m for m in FORBIDDEN if m in last]
+    if heavy:
+        problems.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    constructed = construct_check(cwd)
+    if constructed:
+        problems.append(f"heavy modules imported by OpportunityFinder(): {', '.join(constructed)}")
+    if args.budget_ms is not None and own * 1000 > args.budget_ms:
+        problems.append(f"import took {own * 1000:.1f}ms, budget {args.budget_ms:.1f}ms")
+    
+    if args.output:
+        write_results([
+            {'name': f'import {module}', 'size': 0, 'repeat': args.runs, 'number': 1,
+             'median_s': own, 'p95_s': max(s.get(module, 0) for s in samples) / 1e6,
+             'min_s': min(s.get(module, 0) for s in samples) / 1e6,
+             'ops_per_s': 1 / own if own else None},
+            {'name': f'interpreter start + import {module}', 'size': 0, 'repeat': args.runs,
+             'number': 1, 'median_s': wall, 'p95_s': max(walls), 'min_s': min(walls),
+             'ops_per_s': 1 / wall if wall else None}
+        ], os.path.abspath(args.output))
+    
+    if problems:
+        print()
+        for problem in problems:
+            print(f"FAIL {problem}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
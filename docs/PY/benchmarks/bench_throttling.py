@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Burst-load benchmark for request coalescing and the per-client rate limiter
+
+Fires bursts of identical concurrent opportunity queries at a seeded
+database, once with every request running its own read and once through
+throttling.SingleFlight, and reports p50/p99 latency and DB reads per
+burst. Also checks the token bucket admits exactly its burst and times
+acquire(). Exits 1 if coalescing fails to cut DB reads or the limiter
+admits the wrong number of requests.
+
+Usage (from docs/PY):
+    python benchmarks/bench_throttling.py
+    python benchmarks/bench_throttling.py --opportunities 20000 --clients 64 --bursts 30
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from harness import write_results  # noqa: E402
+from seed import seed_database  # noqa: E402
+from throttling import RateLimiter, SingleFlight  # noqa: E402
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def burst_load(query, clients: int, bursts: int):
+    """Latencies of `bursts` rounds of `clients` simultaneous calls"""
+    latencies = []
+    lock = threading.Lock()
+    
+    for _ in range(bursts):
+        barrier = threading.Barrier(clients)
+        
+        def client():
+            barrier.wait()
+            start = time.perf_counter()
+            query()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+        
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return latencies
+
+
+def result(name, size, latencies):
+    median = statistics.median(latencies)
+    return {
+        'name': name, 'size': size, 'repeat': 1, 'number': len(latencies),
+        'median_s': median, 'p95_s': percentile(latencies, 0.95), 'min_s': min(latencies),
+        'ops_per_s': 1 / median if median else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request coalescing and rate limiting.")
+    parser.add_argument("--opportunities", type=int, default=5000, help="Seeded opportunities")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent requests per burst")
+    parser.add_argument("--bursts", type=int, default=20, help="Bursts per mode")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+    
+    workdir = tempfile.mkdtemp(prefix='of-throttling-')
+    db = seed_database(os.path.join(workdir, 'bench.db'), args.opportunities, 0)
+    failures = []
+    results = []
+    
+    reads = [0]
+    
+    def query():
+        reads[0] += 1
+        rows = [o for o in db.get_all_opportunities() if o['score'] >= 50]
+        return sorted(rows, key=lambda o: o['revenue_amount'], reverse=True)
+    
+    flight = SingleFlight('bench')
+    modes = [
+        ('uncoalesced', query),
+        ('coalesced', lambda: flight.do(('min_score', 50), query)),
+    ]
+    
+    print(f"{args.bursts} bursts x {args.clients} clients, {args.opportunities:,} opportunities\n")
+    print(f"{'mode':<12} {'p50':>9} {'p99':>9} {'max':>9} {'reads/burst':>12}")
+    reads_per_burst = {}
+    for name, call in modes:
+        call()  # warm the page cache
+        reads[0] = 0
+        latencies = burst_load(call, args.clients, args.bursts)
+        reads_per_burst[name] = reads[0] / args.bursts
+        print(f"{name:<12} {percentile(latencies, 0.5) * 1000:8.1f}ms {percentile(latencies, 0.99) * 1000:8.1f}ms "
+              f"{max(latencies) * 1000:8.1f}ms {reads_per_burst[name]:>12.1f}")
+        results.append(result(f'opportunities burst ({name})', args.opportunities, latencies))
+    
+    if reads_per_burst['coalesced'] >= reads_per_burst['uncoalesced']:
+        failures.append(f"coalescing did not reduce DB reads ({reads_per_burst})")
+    
+    # A fresh bucket admits exactly `burst` back-to-back requests
+    limiter = RateLimiter(rate_per_minute=60, burst=10)
+    admitted = sum(1 for _ in range(25) if limiter.acquire('client')[0])
+    allowed, retry_after = limiter.acquire('client')
+    print(f"\nlimiter: {admitted}/25 admitted (burst 10), next retry after {retry_after:.2f}s")
+    if admitted != 10 or allowed or not 0 < retry_after <= 1:
+        failures.append(f"limiter admitted {admitted} of burst 10 (retry_after={retry_after:.2f})")
+    
+    limiter = RateLimiter(rate_per_minute=600000, burst=100)
+    count = 200000
+    start = time.perf_counter()
+    for i in range(count):
+        limiter.acquire(f'client-{i % 1000}')
+    elapsed = time.perf_counter() - start
+    print(f"limiter acquire/s: {count / elapsed:,.0f}")
+    results.append({
+        'name': 'rate limiter acquire', 'size': 1000, 'repeat': 1, 'number': count,
+        'median_s': elapsed / count, 'p95_s': elapsed / count, 'min_s': elapsed / count,
+        'ops_per_s': count / elapsed
+    })
+    
+    if args.output:
+        write_results(results, os.path.abspath(args.output))
+    
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Verify that overlapping scans cannot take rows from the published generation
+
+Replays a slow scan (older generation) finishing after a fast one (newer
+generation) against a fresh database and checks that the newer
+generation's rows, views and stats survive. Exits 1 on any failure.
+
+Usage (from docs/PY):
+    python benchmarks/check_generations.py
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_database import _opportunity  # noqa: E402
+from opportunity_finder import Database, GenerationSuperseded  # noqa: E402
+
+
+def main():
+    db_path = os.path.join(tempfile.mkdtemp(prefix='of-generations-'), 'opportunities.db')
+    db = Database(db_path)
+    opportunities = [_opportunity(i) for i in range(10)]
+    failures = []
+    
+    slow = db.begin_generation()
+    fast = db.begin_generation()
+    db.save_opportunities(opportunities, fast)
+    try:
+        db.save_opportunities(opportunities, slow)
+        failures.append(f"publishing generation {slow} after {fast} did not raise GenerationSuperseded")
+    except GenerationSuperseded:
+        pass
+    
+    conn = sqlite3.connect(db_path)
+    statuses = dict(conn.execute('SELECT id, status FROM scan_generations').fetchall())
+    if statuses != {slow: 'discarded', fast: 'published'}:
+        failures.append(f"generation statuses {statuses}, expected {slow} discarded and {fast} published")
+    moved = conn.execute('SELECT COUNT(*) FROM opportunities WHERE generation != ?', (fast,)).fetchone()[0]
+    if moved:
+        failures.append(f"{moved} row(s) moved off the published generation {fast}")
+    dangling = conn.execute('''
+        SELECT COUNT(*) FROM opportunity_views v
+        JOIN opportunities o ON o.id = v.opportunity_id
+        WHERE v.generation != o.generation
+    ''').fetchone()[0]
+    if dangling:
+        failures.append(f"{dangling} view row(s) point at rows of another generation")
+    conn.close()
+    
+    published = db.get_all_opportunities()
+    view = db.get_opportunity_view()
+    print(f"get_all_opportunities: {len(published)} rows, get_opportunity_view: {len(view)} rows")
+    if len(published) != len(opportunities):
+        failures.append(f"get_all_opportunities returned {len(published)} rows, expected {len(opportunities)}")
+    if len(view) != len(opportunities):
+        failures.append(f"get_opportunity_view returned {len(view)} rows, expected {len(opportunities)}")
+    
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1)
+    print("ok   stale generation discarded, published rows intact")
+
+
+if __name__ == '__main__':
+    main()
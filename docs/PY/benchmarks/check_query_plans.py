@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Verify that hot queries use their indexes
+
+Runs EXPLAIN QUERY PLAN for every query in migrations.HOT_QUERIES against a
+freshly migrated database (or --db) and exits 1 if any plan misses its
+expected index.
+
+Usage (from docs/PY):
+    python benchmarks/check_query_plans.py
+    python benchmarks/check_query_plans.py --db opportunities.db
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import migrations  # noqa: E402
+from opportunity_finder import Database  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check hot query plans.")
+    parser.add_argument("--db", help="Existing database (default: fresh temp database)")
+    args = parser.parse_args()
+    
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='of-plans-'), 'opportunities.db')
+    Database(db_path)  # runs pending migrations
+    conn = sqlite3.connect(db_path)
+    
+    for name, (sql, params, index) in migrations.HOT_QUERIES.items():
+        plan = migrations.explain(conn, sql, params)
+        ok = any(index in line for line in plan)
+        print(f"{'ok  ' if ok else 'FAIL'} {name} (expects {index})")
+        for line in plan:
+            print(f"       {line}")
+    
+    failures = migrations.check_query_plans(conn)
+    conn.close()
+    
+    if failures:
+        print(f"\n{len(failures)} hot query plan(s) missed their index: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark harness
+Timing, JSON result files and baseline comparison
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+def bench(
+    name: str,
+    func: Callable,
+    size: int = 0,
+    repeat: int = 5,
+    number: int = 1,
+    setup: Optional[Callable] = None
+) -> Dict:
+    """
+    Time `func` `repeat` times, each timing covering `number` calls
+    
+    Returns a result dict with per-call median/p95/min seconds.
+    """
+    if setup:
+        setup()
+    func()  # warm up
+    
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    
+    timings.sort()
+    median = statistics.median(timings)
+    result = {
+        'name': name,
+        'size': size,
+        'repeat': repeat,
+        'number': number,
+        'median_s': median,
+        'p95_s': timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))],
+        'min_s': timings[0],
+        'ops_per_s': 1 / median if median else None
+    }
+    print(f"  {name:<45} size={size:<9} median={median * 1000:10.3f}ms  min={timings[0] * 1000:10.3f}ms")
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, cwd=Path(__file__).parent
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def write_results(results: List[Dict], path: str):
+    """Write results plus environment metadata as JSON"""
+    payload = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'commit': _git_commit()
+        },
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\nWrote {len(results)} results to {path}")
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float = 0.2) -> List[Dict]:
+    """
+    Compare results against a baseline results file
+    
+    A benchmark regresses when its median is more than `threshold`
+    (fractional) slower than the baseline median for the same name and size.
+    """
+    with open(baseline_path) as f:
+        baseline = {
+            (r['name'], r['size']): r for r in json.load(f)['results']
+        }
+    
+    regressions = []
+    for result in results:
+        base = baseline.get((result['name'], result['size']))
+        if not base or not base['median_s']:
+            continue
+        change = result['median_s'] / base['median_s'] - 1
+        result['baseline_median_s'] = base['median_s']
+        result['change'] = change
+        if change > threshold:
+            regressions.append(result)
+    
+    return regressions
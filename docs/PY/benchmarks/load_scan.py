@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Offline load test of the full scan pipeline
+
+Drives OpportunityFinder.run_scan against synthetic.FakeReddit and reports
+throughput from the scan's metrics.
+
+Usage (from docs/PY):
+    python benchmarks/load_scan.py --posts 100000
+    python benchmarks/load_scan.py --posts 1000000 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from opportunity_finder import OpportunityFinder, RedditCollector  # noqa: E402
+from synthetic import CorpusConfig, FakeReddit, SyntheticCorpus  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test run_scan with a fake Reddit backend.")
+    parser.add_argument("--posts", type=int, default=10000, help="Posts per subreddit")
+    parser.add_argument("--hit-rate", type=float, default=0.3, help="Share of posts with a pain keyword")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05, help="Share of repeated posts")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per listing page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 probability per listing page")
+    parser.add_argument("--keywords", type=int, default=3, help="Keywords searched per subreddit")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the scan_runs record as JSON")
+    args = parser.parse_args()
+    
+    output = os.path.abspath(args.output) if args.output else None
+    os.chdir(tempfile.mkdtemp(prefix='of-load-'))
+    
+    corpus = SyntheticCorpus(CorpusConfig(
+        posts_per_subreddit=args.posts,
+        keyword_hit_rate=args.hit_rate,
+        duplicate_rate=args.duplicate_rate,
+        seed=args.seed
+    ))
+    reddit = FakeReddit(corpus, latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    collector = RedditCollector(
+        reddit=reddit,
+        request_delay=0,
+        keywords_per_subreddit=args.keywords,
+        limit_per_subreddit=args.posts
+    )
+    finder = OpportunityFinder(reddit_collector=collector)
+    
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        finder.run_scan()
+    
+    run = finder.db.get_scan_runs(limit=1)[0]
+    print(f"Posts per subreddit:  {args.posts:,}")
+    print(f"Listing requests:     {reddit.requests_made:,} ({reddit.rate_limited} rate limited)")
+    print(f"Pain points stored:   {run['pain_points']:,}")
+    print(f"Scan duration:        {run['duration_seconds']:.2f}s")
+    for name, hist in sorted(run['metrics']['histograms'].items()):
+        if name.startswith('scan_stage_duration_seconds'):
+            print(f"  {name:<55} {hist['sum']:.3f}s")
+    
+    if output:
+        with open(output, 'w') as f:
+            json.dump(run, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
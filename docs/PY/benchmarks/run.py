@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Opportunity Finder benchmark suite
+
+Runs entirely offline against synthetic SQLite data and writes
+machine-readable JSON results.
+
+Usage (from docs/PY):
+    python benchmarks/run.py                               # 1k rows
+    python benchmarks/run.py --sizes 1000,100000,1000000
+    python benchmarks/run.py --suite db,pipeline --output results.json
+    python benchmarks/run.py --baseline old.json --threshold 0.2
+
+Exit status is 1 when --baseline is given and any benchmark regressed.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent))
+
+import harness  # noqa: E402
+
+SUITES = ['db', 'pipeline', 'api']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Opportunity Finder benchmarks.")
+    parser.add_argument("--sizes", default="1000", help="Comma-separated row counts (default: 1000)")
+    parser.add_argument("--suite", default=",".join(SUITES), help=f"Comma-separated suites: {', '.join(SUITES)}")
+    parser.add_argument("--output", default="benchmark_results.json", help="Results JSON path")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regression threshold (default: 0.2 = 20%%)")
+    parser.add_argument("--workdir", help="Directory for seeded databases (default: temp dir)")
+    args = parser.parse_args()
+    
+    sizes = [int(s) for s in args.sizes.split(',')]
+    suites = [s.strip() for s in args.suite.split(',')]
+    output = os.path.abspath(args.output)
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix='of-bench-')).resolve()
+    
+    from opportunity_finder import OpportunityFinder
+    from seed import seed_database
+    import bench_database
+    import bench_pipeline
+    import bench_api
+    
+    results = []
+    for size in sizes:
+        # Every size gets its own directory; Database() and the API use
+        # the relative default path opportunities.db
+        size_dir = workdir / f'size-{size}'
+        size_dir.mkdir(parents=True, exist_ok=True)
+        os.chdir(size_dir)
+        db_file = size_dir / 'opportunities.db'
+        if db_file.exists():
+            db_file.unlink()
+        
+        print(f"\nSeeding {size:,} opportunities and pain points in {size_dir}...")
+        db = seed_database(str(db_file), opportunities=size, pain_points=size)
+        
+        if 'db' in suites:
+            results += bench_database.run(db, size)
+        if 'pipeline' in suites:
+            with contextlib.redirect_stdout(io.StringIO()):
+                finder = OpportunityFinder()
+            results += bench_pipeline.run(finder, size)
+        if 'api' in suites:
+            results += bench_api.run(size)
+    
+    regressions = []
+    if baseline:
+        regressions = harness.compare(results, baseline, args.threshold)
+    
+    harness.write_results(results, output)
+    
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for r in regressions:
+            print(f"  {r['name']} (size={r['size']}): {r['change']:+.1%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
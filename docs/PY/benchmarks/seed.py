@@ -0,0 +1,104 @@
+"""
+Synthetic SQLite seeding for benchmarks
+Deterministic (seeded) opportunities and pain points at any row count
+"""
+
+import json
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from opportunity_finder import Database, RedditCollector, theme_key
+
+SEED = 1234
+BATCH = 50000
+
+WORDS = (
+    'invoice client project report email customer team budget schedule '
+    'tracking dashboard export spreadsheet onboarding payroll contract '
+    'inventory booking feedback testimonial analytics workflow'
+).split()
+
+COMPLEXITY = ['Low', 'Medium', 'High', 'Very High']
+
+
+def _sentence(rng: random.Random, length: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def pain_point_rows(count: int, seed: int = SEED):
+    """Yield (source, text, url, created_at) tuples"""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    for i in range(count):
+        keyword = rng.choice(RedditCollector.PAIN_KEYWORDS) if rng.random() < 0.3 else ''
+        yield (
+            f'r/{rng.choice(RedditCollector.SUBREDDITS)}',
+            f'{_sentence(rng, 8)} {keyword} {_sentence(rng, rng.randint(10, 60))}',
+            f'https://reddit.com/r/bench/{i}',
+            (start + timedelta(minutes=i)).isoformat()
+        )
+
+
+def opportunity_rows(count: int, seed: int = SEED):
+    """Yield dicts matching the opportunities table columns"""
+    rng = random.Random(seed + 1)
+    start = datetime(2026, 1, 1)
+    for i in range(count):
+        competitors = rng.randint(0, 30)
+        revenue = rng.choice([0, 1000, 2000, 5000, 10000, 25000])
+        yield {
+            'title': f'{_sentence(rng, 3).title()} Tool {i}',
+            'problem': _sentence(rng, 20),
+            'score': rng.randint(0, 100),
+            'mentions': rng.randint(1, 500),
+            'revenue': f'£{revenue:,} MRR',
+            'revenue_amount': revenue,
+            'competitors': competitors,
+            'competition_level': 'Low',
+            'build_complexity': rng.choice(COMPLEXITY),
+            'sources': json.dumps([f'r/{rng.choice(RedditCollector.SUBREDDITS)}']),
+            'example': 'Example SaaS',
+            'validated': rng.random() < 0.5,
+            'recommendation': 'Validate with landing page first',
+            'market_size': 'Small to Medium',
+            'created_at': (start + timedelta(minutes=i)).isoformat()
+        }
+
+
+def _insert_batched(conn, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            conn.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+
+
+def seed_database(db_path: str, opportunities: int, pain_points: int) -> Database:
+    """Create a schema-initialised DB and bulk-load synthetic rows"""
+    db = Database(db_path)
+    generation = db.begin_generation()
+    conn = sqlite3.connect(db_path)
+    
+    _insert_batched(
+        conn,
+        'INSERT INTO pain_points (source, text, url, created_at) VALUES (?, ?, ?, ?)',
+        pain_point_rows(pain_points)
+    )
+    
+    columns = list(next(opportunity_rows(1))) + ['theme_key', 'generation']
+    _insert_batched(
+        conn,
+        f'INSERT INTO opportunities ({", ".join(columns)}) '
+        f'VALUES ({", ".join(["?"] * len(columns))})',
+        (tuple(r.values()) + (theme_key(r['title']), generation) for r in opportunity_rows(opportunities))
+    )
+    
+    conn.commit()
+    conn.close()
+    db.publish_generation(generation)
+    return db
+
@@ -0,0 +1,213 @@
+"""
+Scalable Bloom filter of seen post URLs
+Lets collectors skip repeat submissions before any per-post work
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+from typing import Iterable, List, Optional
+
+# Environment configuration
+ERROR_RATE_ENV = 'OF_SEEN_ERROR_RATE'  # target false positive rate (default: 0.001)
+
+DEFAULT_ERROR_RATE = 0.001
+MAGIC = b'OFBLOOM1'
+
+
+def _hashes(item: str):
+    """Two independent 64-bit hashes for double hashing (Kirsch-Mitzenmacher)"""
+    digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+    return struct.unpack('<QQ', digest)
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter sized for `capacity` items at `error_rate`"""
+    
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+    
+    def add_hashed(self, h1: int, h2: int) -> bool:
+        """Set the bits for a pre-hashed item; False if all were set already"""
+        bits, size = self.bits, self.size
+        new = False
+        for i in range(self.hash_count):
+            pos = (h1 + i * h2) % size
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+    
+    def contains_hashed(self, h1: int, h2: int) -> bool:
+        bits, size = self.bits, self.size
+        for i in range(self.hash_count):
+            pos = (h1 + i * h2) % size
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+    
+    def add(self, item: str) -> bool:
+        """Add `item`; returns False if it was (probably) present already"""
+        return self.add_hashed(*_hashes(item))
+    
+    def __contains__(self, item: str) -> bool:
+        return self.contains_hashed(*_hashes(item))
+    
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows by adding larger, tighter slices
+    
+    Each new slice holds `growth` times the previous capacity at
+    `tightening` times its error rate, so the compound false positive rate
+    stays under `error_rate` however many items are added (Almeida et al.).
+    """
+    
+    def __init__(
+        self,
+        initial_capacity: int = 100000,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        growth: int = 2,
+        tightening: float = 0.5
+    ):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+        # Highest pain_points.id already added (see load_or_rebuild)
+        self.watermark = 0
+    
+    def _new_slice(self) -> BloomFilter:
+        index = len(self.filters)
+        capacity = self.initial_capacity * self.growth ** index
+        # First slice gets error_rate * (1 - tightening); the series sums to error_rate
+        error_rate = self.error_rate * (1 - self.tightening) * self.tightening ** index
+        bloom = BloomFilter(capacity, error_rate)
+        self.filters.append(bloom)
+        return bloom
+    
+    def _contains_hashed(self, h1: int, h2: int) -> bool:
+        # Newest slice first: recent items are the likeliest repeats
+        return any(bloom.contains_hashed(h1, h2) for bloom in reversed(self.filters))
+    
+    def add(self, item: str) -> bool:
+        """Add `item`; returns False if it was (probably) seen before"""
+        h1, h2 = _hashes(item)
+        if self._contains_hashed(h1, h2):
+            return False
+        if not self.filters or self.filters[-1].full:
+            self._new_slice()
+        return self.filters[-1].add_hashed(h1, h2)
+    
+    def update(self, items: Iterable[str]) -> int:
+        """Add many items; returns how many were new"""
+        return sum(1 for item in items if item and self.add(item))
+    
+    def __contains__(self, item: str) -> bool:
+        return self._contains_hashed(*_hashes(item))
+    
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+    
+    def save(self, path: str):
+        """Write the filter atomically (temp file + rename)"""
+        header = json.dumps({
+            'initial_capacity': self.initial_capacity,
+            'error_rate': self.error_rate,
+            'growth': self.growth,
+            'tightening': self.tightening,
+            'watermark': self.watermark,
+            'slices': [
+                {'capacity': b.capacity, 'error_rate': b.error_rate, 'count': b.count, 'bytes': len(b.bits)}
+                for b in self.filters
+            ]
+        }).encode()
+        
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for bloom in self.filters:
+                f.write(bloom.bits)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'ScalableBloomFilter':
+        """Read a filter written by save(); raises ValueError if the file is invalid"""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a seen-URL filter')
+            (length,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(length))
+            
+            seen = cls(
+                initial_capacity=header['initial_capacity'],
+                error_rate=header['error_rate'],
+                growth=header['growth'],
+                tightening=header['tightening']
+            )
+            seen.watermark = header['watermark']
+            for spec in header['slices']:
+                bits = bytearray(f.read(spec['bytes']))
+                if len(bits) != spec['bytes']:
+                    raise ValueError(f'{path} is truncated')
+                seen.filters.append(BloomFilter(spec['capacity'], spec['error_rate'], bits, spec['count']))
+        return seen
+
+
+def catch_up(seen: ScalableBloomFilter, db) -> int:
+    """Add URLs of pain points stored after the filter's watermark"""
+    added = 0
+    for last_id, urls in db.iter_pain_point_urls(after_id=seen.watermark):
+        added += seen.update(urls)
+        seen.watermark = last_id
+    return added
+
+
+def load_or_rebuild(path: str, db, error_rate: Optional[float] = None) -> ScalableBloomFilter:
+    """
+    Seen-URL filter for `db`, caught up with its pain_points table
+    
+    Loads the persisted filter and adds pain points stored since its
+    watermark; rebuilds from the whole table when the file is missing,
+    unreadable, built with a different error rate or ahead of the table
+    (e.g. a recreated database).
+    """
+    if error_rate is None:
+        error_rate = float(os.environ.get(ERROR_RATE_ENV, DEFAULT_ERROR_RATE))
+    
+    seen = None
+    if os.path.exists(path):
+        try:
+            seen = ScalableBloomFilter.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: rebuilding seen-URL filter ({e})")
+        if seen is not None and (
+            seen.error_rate != error_rate or seen.watermark > db.max_pain_point_id()
+        ):
+            seen = None
+    if seen is None:
+        seen = ScalableBloomFilter(error_rate=error_rate)
+    
+    catch_up(seen, db)
+    return seen
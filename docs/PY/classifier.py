@@ -0,0 +1,263 @@
+"""
+Keyword classification of opportunity themes
+Build complexity, feasibility and B2B detection from admin-configurable triggers
+
+Rules are a JSON object (see DEFAULT_RULES) read from the file named by
+OF_CLASSIFIER_RULES:
+
+    {
+        "feasibility": {"dashboard": 8, "ai": 4},
+        "build_complexity": {"dashboard": "Low", "machine learning": "Very High"},
+        "b2b": ["invoice", "clients", "payroll"]
+    }
+
+Every keyword of every rule compiles into one Aho-Corasick automaton, so a
+text is scanned once however many rules there are.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import metrics
+from pipeline import theme_key
+
+# Environment configuration
+RULES_ENV = 'OF_CLASSIFIER_RULES'  # path to a JSON rules file (default: built-in rules)
+
+# Order matters: a theme is as complex as its most complex trigger
+COMPLEXITY_LEVELS = ('Low', 'Medium', 'High', 'Very High')
+
+DEFAULT_RULES = {
+    'feasibility': {
+        'dashboard': 8,
+        'spreadsheet': 8,
+        'template': 9,
+        'reminder': 8,
+        'tracking': 7,
+        'integration': 6,
+        'api': 6,
+        'marketplace': 4,
+        'ai': 4,
+        'machine learning': 3,
+        'hardware': 2,
+    },
+    'build_complexity': {
+        'dashboard': 'Low',
+        'spreadsheet': 'Low',
+        'template': 'Low',
+        'reminder': 'Low',
+        'tracking': 'Low',
+        'integration': 'Medium',
+        'api': 'Medium',
+        'sync': 'Medium',
+        'marketplace': 'High',
+        'ai': 'High',
+        'machine learning': 'Very High',
+        'hardware': 'Very High',
+    },
+    'b2b': [
+        'b2b', 'business', 'businesses', 'client', 'clients', 'customer',
+        'customers', 'team', 'teams', 'agency', 'agencies', 'freelancer',
+        'freelancers', 'invoice', 'invoicing', 'payroll', 'crm', 'saas',
+        'employee', 'employees', 'testimonial', 'testimonials',
+    ],
+}
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over lowercase keywords
+    
+    find() reports every keyword occurring as a whole word (not inside a
+    longer word, so 'ai' does not match 'email') in one pass over the text.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        
+        for keyword in keywords:
+            self._insert(keyword.lower())
+        self._link()
+    
+    def _insert(self, keyword: str):
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(len(self.keywords))
+        self.keywords.append(keyword)
+    
+    def _link(self):
+        """Breadth-first failure links; outputs inherit their fallback's"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+    
+    def find(self, text: str) -> List[int]:
+        """Indices into `keywords` of whole-word matches in `text`"""
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        text = text.lower()
+        found = []
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                start = end - len(keywords[index]) + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (
+                    end + 1 == len(text) or not text[end + 1].isalnum()
+                ):
+                    found.append(index)
+        return found
+
+
+class Classifier:
+    """
+    Compiled rule set with a per-theme-key result cache
+    
+    A theme is reclassified only when its text changes; results are dicts
+    with build_complexity and feasibility_score (None when no trigger
+    matched), b2b and the matched keywords.
+    """
+    
+    def __init__(self, rules: Optional[Dict] = None):
+        rules = DEFAULT_RULES if rules is None else rules
+        actions: Dict[str, List[Tuple[str, object]]] = {}
+        for keyword, score in rules.get('feasibility', {}).items():
+            actions.setdefault(keyword.lower(), []).append(('feasibility_score', int(score)))
+        for keyword, level in rules.get('build_complexity', {}).items():
+            if level not in COMPLEXITY_LEVELS:
+                raise ValueError(f"Unknown build complexity '{level}' for '{keyword}'")
+            actions.setdefault(keyword.lower(), []).append(('build_complexity', level))
+        for keyword in rules.get('b2b', []):
+            actions.setdefault(keyword.lower(), []).append(('b2b', True))
+        
+        self.automaton = Automaton(actions)
+        self._actions = [actions[keyword] for keyword in self.automaton.keywords]
+        self._cache: Dict[str, Tuple[int, Dict]] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'Classifier':
+        with open(path) as f:
+            return cls(json.load(f))
+    
+    def classify(self, text: str) -> Dict:
+        """Labels for one text"""
+        matched = sorted(set(self.automaton.find(text)))
+        result = {'build_complexity': None, 'feasibility_score': None, 'b2b': False, 'keywords': []}
+        for index in matched:
+            result['keywords'].append(self.automaton.keywords[index])
+            for label, value in self._actions[index]:
+                if label == 'feasibility_score':
+                    # The hardest trigger bounds feasibility
+                    current = result['feasibility_score']
+                    result['feasibility_score'] = value if current is None else min(current, value)
+                elif label == 'build_complexity':
+                    current = result['build_complexity']
+                    if current is None or COMPLEXITY_LEVELS.index(value) > COMPLEXITY_LEVELS.index(current):
+                        result['build_complexity'] = value
+                else:
+                    result['b2b'] = True
+        result['keywords'].sort()
+        return result
+    
+    def classify_texts(self, texts: Iterable[str]) -> List[Dict]:
+        """Labels for many texts (e.g. pain points), uncached"""
+        return [self.classify(text) for text in texts]
+    
+    def classify_themes(self, themes: List[Dict]) -> List[Dict]:
+        """
+        Labels for each theme's title and problem, in one batch
+        
+        Cached by theme key; a changed title or problem is reclassified.
+        """
+        results = []
+        hits = 0
+        for theme in themes:
+            key = theme_key(theme['title'])
+            text = f"{theme['title']}\n{theme.get('problem', '')}"
+            digest = hash(text)
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not None and cached[0] == digest:
+                hits += 1
+                results.append(cached[1])
+                continue
+            result = self.classify(text)
+            with self._lock:
+                self._cache[key] = (digest, result)
+            results.append(result)
+        
+        metrics.incr('cache_hits_total', hits, cache='classifier')
+        metrics.incr('cache_misses_total', len(themes) - hits, cache='classifier')
+        return results
+
+
+_loaded: Dict[Tuple[Optional[str], Optional[float]], Classifier] = {}
+_last_good: Optional[Classifier] = None
+_load_lock = threading.Lock()
+
+
+def _compile(path: Optional[str]) -> Classifier:
+    """
+    Classifier for the rules file at `path`
+    
+    A missing or invalid file must not abort a scan: it is logged and the
+    last good rules (or the built-in ones) stay in use.
+    """
+    global _last_good
+    if not path:
+        return Classifier()
+    try:
+        classifier = Classifier.from_file(path)
+    except Exception as e:
+        fallback = 'last good' if _last_good is not None else 'built-in'
+        print(f"Warning: classifier rules {path} not usable ({e}); using the {fallback} rules")
+        metrics.log_event('classifier_rules_invalid', path=path, error=str(e), fallback=fallback)
+        return _last_good or Classifier()
+    _last_good = classifier
+    return classifier
+
+
+def load(path: Optional[str] = None) -> Classifier:
+    """
+    Classifier for the rules file at `path` (default: OF_CLASSIFIER_RULES)
+    
+    Compiled once per file version: an edited file (new mtime) is picked up
+    by the next call, and an unchanged one keeps its automaton and cache.
+    Falls back to the built-in rules when no file is configured, and to the
+    last good rules when the file is missing or invalid.
+    """
+    path = path or os.environ.get(RULES_ENV)
+    try:
+        mtime = os.path.getmtime(path) if path else None
+    except OSError:
+        mtime = None
+    with _load_lock:
+        classifier = _loaded.get((path, mtime))
+        if classifier is None:
+            classifier = _compile(path)
+            _loaded.clear()
+            _loaded[(path, mtime)] = classifier
+    return classifier
@@ -0,0 +1,258 @@
+"""
+HTTP collectors for non-Reddit sources
+Pooled keep-alive session, concurrent fetches and off-thread parsing
+"""
+
+import contextvars
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from http_cache import HTTPCache, cache_key, urllib_transport
+
+# Environment configuration
+FETCH_WORKERS_ENV = 'OF_FETCH_WORKERS'  # concurrent fetches per collector (default: 8)
+PARSE_WORKERS_ENV = 'OF_PARSE_WORKERS'  # parser processes (default: 0 = parser threads)
+
+USER_AGENT = 'OpportunityFinder/1.0'
+
+
+def make_session(pool_size: int = 8, retries: int = 3):
+    """
+    requests.Session with a keep-alive pool sized to the fetch concurrency
+    
+    Connections are reused across fetches (and scans) instead of paying a
+    TCP/TLS handshake per page. 429 and 5xx responses are retried with
+    backoff, honouring Retry-After. Returns None without requests.
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+    except ImportError:
+        print("Warning: requests not installed. Install with: pip install requests --break-system-packages")
+        return None
+    
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET', 'HEAD'),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+def session_transport(session):
+    """Adapt a requests.Session to the HTTPCache transport signature"""
+    def transport(url: str, headers: Dict[str, str], timeout: float):
+        response = session.get(url, headers=headers, timeout=timeout)
+        return (
+            response.status_code,
+            {k.lower(): v for k, v in response.headers.items()},
+            response.content
+        )
+    return transport
+
+
+class CollectError(Exception):
+    """Some pages of a collector failed; the posts of the others were yielded"""
+
+
+class HTTPCollector(ABC):
+    """
+    Base class for collectors that scrape listing pages over HTTP
+    
+    Subclasses set SOURCE, list their pages in pages() and turn a page body
+    into post dicts in parse(). Pages are fetched concurrently through one
+    pooled session (and the shared HTTPCache when given); each body is
+    handed to a separate parse pool as soon as it arrives, so HTML parsing
+    never holds up the fetch threads. With parse_workers > 0 parsing runs
+    in processes, so parse() must be a picklable staticmethod.
+    
+    Posts use the RedditCollector.fetch_posts format, so they feed the
+    same detection pipeline.
+    """
+    
+    SOURCE = 'http'
+    
+    def __init__(
+        self,
+        cache: Optional[HTTPCache] = None,
+        session=None,
+        fetch_workers: Optional[int] = None,
+        parse_workers: Optional[int] = None,
+        timeout: float = 30.0
+    ):
+        self.cache = cache
+        self.fetch_workers = fetch_workers or int(os.environ.get(FETCH_WORKERS_ENV, 8))
+        self.parse_workers = (
+            parse_workers if parse_workers is not None
+            else int(os.environ.get(PARSE_WORKERS_ENV, 0))
+        )
+        self.timeout = timeout
+        self._session = session
+        self._session_loaded = session is not None
+    
+    @property
+    def session(self):
+        """Pooled session, created on first fetch (None falls back to urllib)"""
+        if not self._session_loaded:
+            self._session_loaded = True
+            self._session = make_session(self.fetch_workers)
+        return self._session
+    
+    @abstractmethod
+    def pages(self, limit: Optional[int] = None) -> Iterable[Tuple[str, Optional[Dict]]]:
+        """(url, params) of every listing page to fetch"""
+    
+    @staticmethod
+    @abstractmethod
+    def parse(body: bytes, url: str) -> List[Dict]:
+        """Post dicts found in one page body"""
+    
+    def fetch(self, url: str, params: Optional[Dict] = None) -> Optional[bytes]:
+        """Body of one page, through the cache when configured"""
+        session = self.session
+        transport = session_transport(session) if session is not None else urllib_transport
+        
+        if self.cache is not None:
+            response = self.cache.get(
+                url, params=params, source=self.SOURCE,
+                headers={'User-Agent': USER_AGENT}, transport=transport
+            )
+            status, body = response.status, response.body
+        else:
+            with metrics.timer('http_fetch_duration_seconds', source=self.SOURCE):
+                status, _headers, body = transport(cache_key(url, params), {'User-Agent': USER_AGENT}, self.timeout)
+            metrics.incr('http_fetches_total', source=self.SOURCE, status=status)
+        
+        if status != 200:
+            print(f"Warning: {self.SOURCE} returned {status} for {url}")
+            return None
+        return body
+    
+    def _parse_pool(self) -> Executor:
+        if self.parse_workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+            return ProcessPoolExecutor(max_workers=self.parse_workers)
+        return ThreadPoolExecutor(max_workers=2, thread_name_prefix=f'{self.SOURCE}-parse')
+    
+    def fetch_posts(self, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yield posts from every page; pages are fetched and parsed concurrently
+        
+        Raises CollectError after the last post if any page could not be
+        fetched or parsed, so the scan records the unit as failed (and a
+        resumed scan retries it) instead of checkpointing it as done.
+        """
+        pages = list(self.pages(limit))
+        failed: List[str] = []
+        self.session  # create once, before the fetch threads share it
+        
+        fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix=f'{self.SOURCE}-fetch')
+        with fetch_pool, self._parse_pool() as parse_pool:
+            def hand_off(fetch_future, url):
+                try:
+                    body = fetch_future.result()
+                except Exception as e:
+                    print(f"Error fetching {url}: {e}")
+                    metrics.incr('collector_errors_total', source=self.SOURCE)
+                    failed.append(url)
+                    return None
+                if body is None:
+                    failed.append(url)
+                    return None
+                return parse_pool.submit(self.parse, body, url)
+            
+            # Each fetch runs in a copy of this context so its metrics land in
+            # the caller's (e.g. per-scan) registry
+            fetches = {
+                fetch_pool.submit(contextvars.copy_context().run, self.fetch, url, params): url
+                for url, params in pages
+            }
+            parses = {}
+            pending = set(fetches)
+            
+            # Bodies go to the parse pool as their fetch finishes; posts are
+            # yielded as each parse finishes
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetches:
+                        url = fetches.pop(future)
+                        parse = hand_off(future, url)
+                        if parse is not None:
+                            parses[parse] = url
+                            pending.add(parse)
+                        continue
+                    url = parses.pop(future)
+                    try:
+                        posts = future.result()
+                    except Exception as e:
+                        print(f"Error parsing {url}: {e}")
+                        metrics.incr('collector_errors_total', source=self.SOURCE)
+                        failed.append(url)
+                        continue
+                    metrics.incr('collector_posts_total', len(posts), source=self.SOURCE)
+                    yield from posts
+        
+        if failed:
+            raise CollectError(f"{len(failed)} of {len(pages)} {self.SOURCE} pages failed (first: {failed[0]})")
+    
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+class HackerNewsCollector(HTTPCollector):
+    """Ask HN and Show HN listing pages from news.ycombinator.com"""
+    
+    SOURCE = 'hackernews'
+    BASE_URL = 'https://news.ycombinator.com'
+    LISTINGS = ('ask', 'show')
+    
+    def __init__(self, pages_per_listing: int = 5, **kwargs):
+        super().__init__(**kwargs)
+        self.pages_per_listing = pages_per_listing
+    
+    def pages(self, limit: Optional[int] = None):
+        per_listing = limit or self.pages_per_listing
+        for listing in self.LISTINGS:
+            for page in range(1, per_listing + 1):
+                yield f'{self.BASE_URL}/{listing}', {'p': page}
+    
+    @staticmethod
+    def parse(body: bytes, url: str) -> List[Dict]:
+        try:
+            from bs4 import BeautifulSoup
+        except ImportError:
+            print("Warning: beautifulsoup4 not installed. Install with: pip install beautifulsoup4 --break-system-packages")
+            return []
+        
+        soup = BeautifulSoup(body, 'html.parser')
+        posts = []
+        for row in soup.select('tr.athing'):
+            link = row.select_one('span.titleline > a')
+            if link is None:
+                continue
+            subtext = row.find_next_sibling('tr')
+            score = subtext.select_one('span.score') if subtext else None
+            comments = subtext.find_all('a')[-1].get_text() if subtext and subtext.find_all('a') else ''
+            href = link.get('href', '')
+            posts.append({
+                'source': 'news.ycombinator.com',
+                'title': link.get_text(strip=True),
+                'text': '',
+                'url': href if href.startswith('http') else f"{HackerNewsCollector.BASE_URL}/{href}",
+                'score': int(score.get_text().split()[0]) if score else 0,
+                'num_comments': int(comments.split()[0]) if comments[:1].isdigit() else 0
+            })
+        return posts
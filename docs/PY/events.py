@@ -0,0 +1,112 @@
+"""
+In-process pub/sub for scan progress events
+Bounded per-subscriber buffers, Server-Sent Events formatting
+"""
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import metrics
+
+DEFAULT_BUFFER = 256   # events buffered per subscriber before the oldest is dropped
+HISTORY_SIZE = 100     # recent events replayed to reconnecting clients (Last-Event-ID)
+
+
+class Subscription:
+    """
+    One subscriber's bounded buffer
+    
+    A full buffer drops its oldest event instead of blocking the publisher,
+    so a slow client loses history rather than stalling the scan.
+    """
+    
+    def __init__(self, bus: 'EventBus', maxsize: int):
+        self._bus = bus
+        self._events: Deque[Dict] = deque(maxlen=maxsize)
+        self._ready = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+    
+    def _push(self, event: Dict):
+        with self._ready:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+                metrics.REGISTRY.incr('events_dropped_total')
+            self._events.append(event)
+            self._ready.notify()
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next event, or None after `timeout` seconds or once closed"""
+        with self._ready:
+            if not self._events and not self.closed:
+                self._ready.wait(timeout)
+            return self._events.popleft() if self._events else None
+    
+    def close(self):
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+        self._bus._unsubscribe(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """Fan-out of published events to every live subscription"""
+    
+    def __init__(self, history: int = HISTORY_SIZE):
+        self._subscribers: List[Subscription] = []
+        self._history: Deque[Dict] = deque(maxlen=history)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def subscribe(self, maxsize: int = DEFAULT_BUFFER, last_event_id: Optional[int] = None) -> Subscription:
+        """New subscription; replays buffered history after `last_event_id`"""
+        subscription = Subscription(self, maxsize)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self._history:
+                    if event['id'] > last_event_id:
+                        subscription._push(event)
+            self._subscribers.append(subscription)
+            metrics.REGISTRY.set_gauge('event_subscribers', len(self._subscribers))
+        return subscription
+    
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            metrics.REGISTRY.set_gauge('event_subscribers', len(self._subscribers))
+    
+    def publish(self, event: str, **data) -> Dict:
+        """Deliver an event to every subscriber without blocking"""
+        with self._lock:
+            record = {'id': next(self._ids), 'event': event, 'ts': time.time(), 'data': data}
+            self._history.append(record)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription._push(record)
+        metrics.REGISTRY.incr('events_published_total', event=event)
+        return record
+
+
+def format_sse(event: Dict) -> str:
+    """Render an event in the text/event-stream wire format"""
+    payload = json.dumps({**event['data'], 'ts': event['ts']}, default=str)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+
+
+# Process-wide bus; scans publish here and the API streams from it
+BUS = EventBus()
+
+
+def publish(event: str, **data) -> Dict:
+    return BUS.publish(event, **data)
@@ -0,0 +1,273 @@
+"""
+On-disk HTTP response cache shared by the collectors
+Per-source TTLs, ETag/Last-Modified revalidation and size-bounded LRU eviction
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import metrics
+
+# Environment configuration
+CACHE_PATH_ENV = 'OF_HTTP_CACHE'            # cache database path (default: http_cache.db)
+CACHE_MAX_BYTES_ENV = 'OF_HTTP_CACHE_MAX_MB'  # body size cap in MB (default: 100)
+
+# Seconds a response is served without revalidation, per collector source
+DEFAULT_TTLS = {
+    'reddit': 15 * 60,
+    'hackernews': 5 * 60,
+    'producthunt': 30 * 60,
+    'indiehackers': 60 * 60,
+    'google': 24 * 60 * 60,
+    'microns': 6 * 60 * 60,
+}
+DEFAULT_TTL = 10 * 60
+
+# Response headers kept with the body
+KEPT_HEADERS = ('content-type', 'content-encoding', 'etag', 'last-modified', 'cache-control')
+
+# (url, request headers, timeout) -> (status, response headers, body)
+Transport = Callable[[str, Dict[str, str], float], Tuple[int, Dict[str, str], bytes]]
+
+
+def urllib_transport(url: str, headers: Dict[str, str], timeout: float) -> Tuple[int, Dict[str, str], bytes]:
+    """Default transport; returns 304 and error statuses instead of raising"""
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, {k.lower(): v for k, v in response.headers.items()}, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, {k.lower(): v for k, v in e.headers.items()}, e.read()
+
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """URL with `params` merged into and sorted within the query string"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += [(k, str(v)) for k, v in params.items() if v is not None]
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or '/', urlencode(sorted(query)), ''))
+
+
+@dataclass
+class CachedResponse:
+    """A response as returned by HTTPCache.get"""
+    url: str
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False     # body came from disk (fresh hit or 304)
+    revalidated: bool = False    # server answered 304 Not Modified
+    
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+    
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+    
+    def json(self):
+        return json.loads(self.body)
+
+
+class HTTPCache:
+    """
+    SQLite-backed HTTP cache keyed by URL plus query params
+    
+    Fresh entries (younger than their source's TTL) are served without a
+    request. Stale entries are revalidated with If-None-Match /
+    If-Modified-Since; a 304 refreshes the entry and serves the stored
+    body. Only 200 responses are stored, and the oldest-used entries are
+    evicted once bodies exceed `max_bytes`. Safe to share between threads;
+    each thread keeps its own connection.
+    """
+    
+    def __init__(
+        self,
+        path: str = 'http_cache.db',
+        max_bytes: int = 100 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        transport: Optional[Transport] = None,
+        timeout: float = 30.0
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.transport = transport or urllib_transport
+        self.timeout = timeout
+        self._evict_lock = threading.Lock()
+        self._local = threading.local()
+        self._init_db()
+        # Running estimate of stored body bytes; evict() recounts exactly
+        self._bytes = self.stats()['bytes']
+    
+    @classmethod
+    def from_env(cls, **kwargs) -> 'HTTPCache':
+        """Build a cache from OF_HTTP_CACHE / OF_HTTP_CACHE_MAX_MB"""
+        return cls(
+            path=os.environ.get(CACHE_PATH_ENV, 'http_cache.db'),
+            max_bytes=int(float(os.environ.get(CACHE_MAX_BYTES_ENV, 100)) * 1024 * 1024),
+            **kwargs
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        This thread's connection, kept open between calls
+        
+        Cache hits are far cheaper than a connect/close cycle, whose close
+        checkpoints the WAL.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA busy_timeout = 30000')
+        # A lost cache write only costs a refetch; skip the per-commit fsync
+        conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
+    
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                source TEXT,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_http_cache_last_used ON http_cache(last_used)')
+        conn.commit()
+    
+    def ttl(self, source: Optional[str]) -> float:
+        return self.ttls.get(source, self.default_ttl) if source else self.default_ttl
+    
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        source: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        ttl: Optional[float] = None,
+        transport: Optional[Transport] = None
+    ) -> CachedResponse:
+        """Fetch `url` through the cache (with `transport` instead of the default, if given)"""
+        key = cache_key(url, params)
+        ttl = self.ttl(source) if ttl is None else ttl
+        now = time.time()
+        
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT status, headers, body, etag, last_modified, fetched_at FROM http_cache WHERE key = ?',
+            (key,)
+        ).fetchone()
+        
+        # Freshness uses the caller's TTL, so TTL changes apply to stored entries
+        if row and row[5] + ttl > now:
+            conn.execute('UPDATE http_cache SET last_used = ? WHERE key = ?', (now, key))
+            conn.commit()
+            metrics.incr('cache_hits_total', cache='http')
+            return CachedResponse(key, row[0], row[2], json.loads(row[1]), from_cache=True)
+        
+        request_headers = dict(headers or {})
+        if row:
+            if row[3]:
+                request_headers['If-None-Match'] = row[3]
+            if row[4]:
+                request_headers['If-Modified-Since'] = row[4]
+        
+        metrics.incr('cache_misses_total', cache='http')
+        with metrics.timer('http_fetch_duration_seconds', source=source or 'other'):
+            status, response_headers, body = (transport or self.transport)(key, request_headers, self.timeout)
+        metrics.incr('http_fetches_total', source=source or 'other', status=status)
+        
+        if status == 304 and row:
+            metrics.incr('http_cache_revalidations_total', source=source or 'other')
+            conn = self._connect()
+            conn.execute(
+                'UPDATE http_cache SET fetched_at = ?, expires_at = ?, last_used = ? WHERE key = ?',
+                (now, now + ttl, now, key)
+            )
+            conn.commit()
+            return CachedResponse(key, row[0], row[2], json.loads(row[1]), from_cache=True, revalidated=True)
+        
+        kept = {k: v for k, v in response_headers.items() if k in KEPT_HEADERS}
+        if status == 200 and 'no-store' not in response_headers.get('cache-control', ''):
+            self._store(key, source, status, kept, body, ttl, now)
+        return CachedResponse(key, status, body, kept)
+    
+    def _store(self, key, source, status, headers, body, ttl, now):
+        conn = self._connect()
+        old = conn.execute('SELECT size FROM http_cache WHERE key = ?', (key,)).fetchone()
+        conn.execute('''
+            INSERT OR REPLACE INTO http_cache
+            (key, source, status, headers, body, size, etag, last_modified, fetched_at, expires_at, last_used)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            key, source, status, json.dumps(headers), body, len(body),
+            headers.get('etag'), headers.get('last-modified'), now, now + ttl, now
+        ))
+        conn.commit()
+        self._bytes += len(body) - (old[0] if old else 0)
+        if self._bytes > self.max_bytes:
+            self.evict()
+    
+    def evict(self) -> int:
+        """Drop least recently used entries until bodies fit in max_bytes"""
+        with self._evict_lock:
+            conn = self._connect()
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                freed = 0
+                victims = []
+                for key, size in conn.execute('SELECT key, size FROM http_cache ORDER BY last_used'):
+                    victims.append((key,))
+                    freed += size
+                    if freed >= excess:
+                        break
+                conn.executemany('DELETE FROM http_cache WHERE key = ?', victims)
+                conn.commit()
+                evicted = len(victims)
+                total -= freed
+                metrics.incr('http_cache_evictions_total', evicted)
+            self._bytes = total
+            return evicted
+    
+    def invalidate(self, url: str, params: Optional[Dict] = None):
+        conn = self._connect()
+        conn.execute('DELETE FROM http_cache WHERE key = ?', (cache_key(url, params),))
+        conn.commit()
+    
+    def purge_expired(self, older_than: float = 0) -> int:
+        """Delete entries stale for more than `older_than` seconds"""
+        conn = self._connect()
+        deleted = conn.execute(
+            'DELETE FROM http_cache WHERE expires_at < ?', (time.time() - older_than,)
+        ).rowcount
+        conn.commit()
+        return deleted
+    
+    def stats(self) -> Dict:
+        conn = self._connect()
+        entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache').fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
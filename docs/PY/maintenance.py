@@ -0,0 +1,201 @@
+"""
+Database maintenance for Opportunity Finder
+Retention, roll-up, archival and incremental vacuum
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import metrics
+from opportunity_finder import Database, RedditCollector
+from pipeline import match_pain_keywords, normalize_keywords
+
+BATCH_SIZE = 10000
+
+# Normalized once for _signal, which runs per archived row
+_PAIN_KEYWORDS = normalize_keywords(RedditCollector.PAIN_KEYWORDS)
+
+
+def _cutoff(days: int) -> str:
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+def _signal(text: str) -> str:
+    """First pain keyword in the text; pain points carry no theme of their own"""
+    matched = match_pain_keywords(text, _PAIN_KEYWORDS)
+    return matched[0] if matched else ''
+
+
+def archive_pain_points(db: Database, retention_days: int, archive_dir: str) -> int:
+    """
+    Move pain points older than `retention_days` out of the hot table
+    
+    Expired rows are appended to gzip NDJSON files, one per month
+    (pain_points-YYYY-MM.ndjson.gz), and counted into pain_point_rollups
+    before they are deleted. Works in batches so memory stays flat.
+    """
+    cutoff = _cutoff(retention_days)
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = 0
+    
+    conn = db._connect()
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    while True:
+        rows = cursor.execute(
+            'SELECT * FROM pain_points WHERE created_at < ? ORDER BY created_at LIMIT ?',
+            (cutoff, BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        
+        by_month: Dict[str, list] = {}
+        rollup = Counter()
+        mentions = Counter()
+        for row in rows:
+            month = row['created_at'][:7]
+            by_month.setdefault(month, []).append(dict(row))
+            key = (month, row['source'], _signal(row['text']))
+            rollup[key] += 1
+            mentions[key] += row['mentions'] or 1
+        
+        # Archive files are written (and synced) before rows are deleted;
+        # gzip members appended by later runs concatenate into one stream
+        for month, month_rows in by_month.items():
+            path = os.path.join(archive_dir, f'pain_points-{month}.ndjson.gz')
+            with gzip.open(path, 'at', encoding='utf-8') as f:
+                for row in month_rows:
+                    f.write(json.dumps(row) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        
+        cursor.executemany('''
+            INSERT INTO pain_point_rollups (month, source, signal, pain_points, mentions)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (month, source, signal) DO UPDATE SET
+                pain_points = pain_points + excluded.pain_points,
+                mentions = mentions + excluded.mentions
+        ''', [(*key, count, mentions[key]) for key, count in rollup.items()])
+        cursor.executemany(
+            'DELETE FROM pain_points WHERE id = ?',
+            [(row['id'],) for row in rows]
+        )
+        conn.commit()
+        archived += len(rows)
+    
+    conn.close()
+    metrics.incr('maintenance_rows_total', archived, table='pain_points', action='archived')
+    return archived
+
+
+def expire_rows(db: Database, table: str, column: str, retention_days: int) -> int:
+    """Delete rows of `table` whose `column` timestamp is past retention"""
+    conn = db._connect()
+    cursor = conn.cursor()
+    cursor.execute(f'DELETE FROM {table} WHERE {column} < ?', (_cutoff(retention_days),))
+    deleted = cursor.rowcount
+    conn.commit()
+    conn.close()
+    
+    metrics.incr('maintenance_rows_total', deleted, table=table, action='deleted')
+    return deleted
+
+
+def expire_checkpoints(db: Database) -> int:
+    """Delete checkpoints and staged posts of scan runs that no longer exist"""
+    conn = db._connect()
+    cursor = conn.cursor()
+    deleted = 0
+    for table in ('scan_checkpoints', 'scan_posts'):
+        cursor.execute(
+            f'DELETE FROM {table} WHERE scan_run_id NOT IN (SELECT id FROM scan_runs)'
+        )
+        deleted += cursor.rowcount
+        metrics.incr('maintenance_rows_total', cursor.rowcount, table=table, action='deleted')
+    conn.commit()
+    conn.close()
+    return deleted
+
+
+def vacuum(db: Database, full: bool = False, pages: Optional[int] = None):
+    """
+    Return free pages to the filesystem
+    
+    full=True runs a one-off VACUUM, which is also what switches a database
+    created before auto_vacuum=INCREMENTAL over to incremental mode.
+    """
+    conn = db._connect()
+    if full:
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+    elif pages:
+        conn.execute(f'PRAGMA incremental_vacuum({int(pages)})')
+    else:
+        conn.execute('PRAGMA incremental_vacuum')
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.close()
+
+
+def run_maintenance(
+    db: Database,
+    retention_days: int = 90,
+    archive_dir: str = 'archive',
+    history_retention_days: Optional[int] = 365,
+    scan_run_retention_days: Optional[int] = 365,
+    full_vacuum: bool = False
+) -> Dict:
+    """Run every maintenance step and return a summary"""
+    size_before = os.path.getsize(db.db_path)
+    
+    with metrics.timer('maintenance_duration_seconds'):
+        summary = {
+            'pain_points_archived': archive_pain_points(db, retention_days, archive_dir),
+            'history_deleted': expire_rows(
+                db, 'opportunity_history', 'recorded_at', history_retention_days
+            ) if history_retention_days else 0,
+            'scan_runs_deleted': expire_rows(
+                db, 'scan_runs', 'started_at', scan_run_retention_days
+            ) if scan_run_retention_days else 0
+        }
+        summary['checkpoints_deleted'] = expire_checkpoints(db)
+        vacuum(db, full=full_vacuum)
+    
+    summary['db_bytes_before'] = size_before
+    summary['db_bytes_after'] = os.path.getsize(db.db_path)
+    return summary
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Archive old pain points and compact the database.")
+    parser.add_argument("--db", default="opportunities.db", help="Database path")
+    parser.add_argument("--retention-days", type=int, default=90, help="Days of raw pain points kept hot")
+    parser.add_argument("--archive-dir", default="archive", help="Directory for monthly gzip NDJSON archives")
+    parser.add_argument("--history-retention-days", type=int, default=365, help="Days of opportunity history kept (0 = forever)")
+    parser.add_argument("--scan-run-retention-days", type=int, default=365, help="Days of scan_runs kept (0 = forever)")
+    parser.add_argument("--full-vacuum", action="store_true", help="Run a full VACUUM (enables incremental vacuum on old files)")
+    args = parser.parse_args()
+    
+    summary = run_maintenance(
+        Database(args.db),
+        retention_days=args.retention_days,
+        archive_dir=args.archive_dir,
+        history_retention_days=args.history_retention_days,
+        scan_run_retention_days=args.scan_run_retention_days,
+        full_vacuum=args.full_vacuum
+    )
+    
+    print("Maintenance complete:")
+    for key, value in summary.items():
+        print(f"  {key}: {value:,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+Lightweight instrumentation for Opportunity Finder
+Counters, gauges and histograms with context-manager timers
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+# Latency buckets in seconds (Prometheus style upper bounds)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+def _key(name: str, labels: Dict) -> Tuple:
+    return (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+
+def format_key(key: Tuple) -> str:
+    """Render a metric key as name{label="value",...}"""
+    name, labels = key
+    if not labels:
+        return name
+    inner = ','.join(f'{k}="{v}"' for k, v in labels)
+    return f'{name}{{{inner}}}'
+
+
+class Histogram:
+    """Cumulative bucket histogram with sum/count/min/max"""
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+    
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+    
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': self.min,
+            'max': self.max,
+            'avg': round(self.sum / self.count, 6) if self.count else 0
+        }
+
+
+class Metrics:
+    """
+    Metric registry
+    
+    A registry created with a parent forwards every update to it, so a
+    per-scan registry also feeds the process-wide one.
+    """
+    
+    def __init__(self, parent: Optional['Metrics'] = None):
+        self.parent = parent
+        self.counters: Dict[Tuple, float] = {}
+        self.gauges: Dict[Tuple, float] = {}
+        self.histograms: Dict[Tuple, Histogram] = {}
+        self._lock = threading.Lock()
+    
+    def incr(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+        if self.parent:
+            self.parent.incr(name, value, **labels)
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+        if self.parent:
+            self.parent.set_gauge(name, value, **labels)
+    
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+        if self.parent:
+            self.parent.observe(name, value, **labels)
+    
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the wrapped block into histogram `name` (seconds)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def snapshot(self) -> Dict:
+        """JSON-serialisable view of every metric"""
+        with self._lock:
+            return {
+                'counters': {format_key(k): v for k, v in self.counters.items()},
+                'gauges': {format_key(k): v for k, v in self.gauges.items()},
+                'histograms': {
+                    format_key(k): h.to_dict() for k, h in self.histograms.items()
+                }
+            }
+
+
+# Process-wide registry; scans push a child registry via scope()
+REGISTRY = Metrics()
+_current: ContextVar[Optional[Metrics]] = ContextVar('metrics', default=None)
+
+
+def current() -> Metrics:
+    """Registry active in this context (scan scope or process-wide)"""
+    return _current.get() or REGISTRY
+
+
+@contextmanager
+def scope():
+    """Collect metrics into a child registry for the duration of the block"""
+    child = Metrics(parent=current())
+    token = _current.set(child)
+    try:
+        yield child
+    finally:
+        _current.reset(token)
+
+
+def incr(name: str, value: float = 1, **labels):
+    current().incr(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels):
+    current().set_gauge(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    current().observe(name, value, **labels)
+
+
+def timer(name: str, **labels):
+    return current().timer(name, **labels)
+
+
+def _labels(labels: Tuple, extra: Tuple = ()) -> str:
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+def render_prometheus(registry: Optional[Metrics] = None) -> str:
+    """
+    Render a registry in the Prometheus text exposition format
+    
+    Cache hit ratios are derived from cache_hits_total/cache_misses_total
+    counters labelled by cache name.
+    """
+    registry = registry or REGISTRY
+    with registry._lock:
+        counters = dict(registry.counters)
+        gauges = dict(registry.gauges)
+        histograms = {
+            k: (h.buckets, list(h.counts), h.count, h.sum)
+            for k, h in registry.histograms.items()
+        }
+    
+    hits = {labels: v for (name, labels), v in counters.items() if name == 'cache_hits_total'}
+    misses = {labels: v for (name, labels), v in counters.items() if name == 'cache_misses_total'}
+    for labels in set(hits) | set(misses):
+        total = hits.get(labels, 0) + misses.get(labels, 0)
+        gauges[('cache_hit_ratio', labels)] = hits.get(labels, 0) / total if total else 0
+    
+    lines = []
+    typed = set()
+    
+    def declare(name, kind):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f'# TYPE {name} {kind}')
+    
+    for (name, labels), value in sorted(counters.items()):
+        declare(name, 'counter')
+        lines.append(f'{name}{_labels(labels)} {value}')
+    
+    for (name, labels), value in sorted(gauges.items()):
+        declare(name, 'gauge')
+        lines.append(f'{name}{_labels(labels)} {value}')
+    
+    for (name, labels), (buckets, counts, count, total) in sorted(histograms.items()):
+        declare(name, 'histogram')
+        for bound, bucket_count in zip(buckets, counts):
+            lines.append(f'{name}_bucket{_labels(labels, (("le", bound),))} {bucket_count}')
+        lines.append(f'{name}_bucket{_labels(labels, (("le", "+Inf"),))} {count}')
+        lines.append(f'{name}_sum{_labels(labels)} {total}')
+        lines.append(f'{name}_count{_labels(labels)} {count}')
+    
+    return '\n'.join(lines) + '\n'
+
+
+def log_event(event: str, **fields):
+    """Emit one structured JSON log line to stderr"""
+    record = {'ts': time.time(), 'event': event, **fields}
+    print(json.dumps(record, default=str), file=sys.stderr)
@@ -0,0 +1,427 @@
+"""
+Schema migrations for the Opportunity Finder database
+Ordered, versioned steps recorded in a schema_version table
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from pipeline import theme_key
+
+
+def _columns(cursor, table: str) -> List[str]:
+    return [row[1] for row in cursor.execute(f'PRAGMA table_info({table})')]
+
+
+def add_column(cursor, table: str, column: str, declaration: str):
+    """ALTER TABLE ADD COLUMN unless the column already exists"""
+    if column not in _columns(cursor, table):
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+
+
+# Every step must be idempotent: databases created before versioning
+# already contain some of these objects.
+
+def initial_schema(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opportunities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            problem TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            mentions INTEGER NOT NULL,
+            revenue TEXT,
+            revenue_amount INTEGER,
+            competitors INTEGER,
+            competition_level TEXT,
+            build_complexity TEXT,
+            sources TEXT,
+            example TEXT,
+            validated BOOLEAN,
+            recommendation TEXT,
+            market_size TEXT,
+            created_at TEXT NOT NULL
+        )
+    ''')
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pain_points (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            text TEXT NOT NULL,
+            url TEXT,
+            mentions INTEGER DEFAULT 1,
+            created_at TEXT NOT NULL
+        )
+    ''')
+
+
+def scan_runs(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scan_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            status TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            duration_seconds REAL,
+            pain_points INTEGER,
+            themes INTEGER,
+            opportunities INTEGER,
+            metrics TEXT
+        )
+    ''')
+
+
+def scan_generations(cursor):
+    """Scan output is published atomically; readers see the latest published generation"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scan_generations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            scan_run_id INTEGER,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            published_at TEXT
+        )
+    ''')
+    add_column(cursor, 'opportunities', 'generation', 'INTEGER')
+    
+    legacy = cursor.execute(
+        'SELECT COUNT(*) FROM opportunities WHERE generation IS NULL'
+    ).fetchone()[0]
+    if legacy:
+        now = datetime.now().isoformat()
+        cursor.execute(
+            'INSERT INTO scan_generations (status, created_at, published_at) VALUES (?, ?, ?)',
+            ('published', now, now)
+        )
+        cursor.execute(
+            'UPDATE opportunities SET generation = ? WHERE generation IS NULL',
+            (cursor.lastrowid,)
+        )
+    
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_opportunities_generation_score '
+        'ON opportunities (generation, score DESC)'
+    )
+
+
+def mention_trends(cursor):
+    # Append-only daily mention counts per theme; the primary key makes
+    # per-theme range reads a single index seek
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opportunity_mentions_daily (
+            theme_key TEXT NOT NULL,
+            day TEXT NOT NULL,
+            mentions INTEGER NOT NULL,
+            PRIMARY KEY (theme_key, day)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Incrementally maintained trend state (base_* = EWMAs before last_seen,
+    # so a same-day rescan replaces rather than double counts)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opportunity_trends (
+            theme_key TEXT PRIMARY KEY,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            days_seen INTEGER NOT NULL,
+            last_mentions INTEGER NOT NULL,
+            base_short REAL,
+            base_long REAL,
+            ewma_short REAL NOT NULL,
+            ewma_long REAL NOT NULL,
+            growth_rate REAL NOT NULL,
+            trend TEXT NOT NULL,
+            timing_score INTEGER NOT NULL
+        )
+    ''')
+
+
+def theme_keys(cursor):
+    """
+    One row per theme, refreshed in place by each scan
+    
+    Backfills theme keys and collapses duplicate rows from insert-only
+    scans: the newest row per key is kept, older ones move to
+    opportunity_history.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opportunity_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            opportunity_id INTEGER NOT NULL,
+            theme_key TEXT NOT NULL,
+            generation INTEGER,
+            score INTEGER,
+            mentions INTEGER,
+            revenue_amount INTEGER,
+            competitors INTEGER,
+            sources TEXT,
+            recorded_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_opportunity_history_theme_key '
+        'ON opportunity_history (theme_key, id)'
+    )
+    add_column(cursor, 'opportunities', 'theme_key', 'TEXT')
+    
+    rows = cursor.execute(
+        'SELECT id, title FROM opportunities WHERE theme_key IS NULL'
+    ).fetchall()
+    if rows:
+        cursor.executemany(
+            'UPDATE opportunities SET theme_key = ? WHERE id = ?',
+            [(theme_key(title), row_id) for row_id, title in rows]
+        )
+        
+        duplicates = '''
+            SELECT id FROM opportunities o
+            WHERE EXISTS (
+                SELECT 1 FROM opportunities newer
+                WHERE newer.theme_key = o.theme_key
+                  AND (COALESCE(newer.generation, 0), newer.id)
+                      > (COALESCE(o.generation, 0), o.id)
+            )
+        '''
+        cursor.execute(f'''
+            INSERT INTO opportunity_history (
+                opportunity_id, theme_key, generation, score, mentions,
+                revenue_amount, competitors, sources, recorded_at
+            )
+            SELECT id, theme_key, generation, score, mentions,
+                   revenue_amount, competitors, sources, created_at
+            FROM opportunities WHERE id IN ({duplicates})
+        ''')
+        cursor.execute(f'DELETE FROM opportunities WHERE id IN ({duplicates})')
+    
+    cursor.execute(
+        'CREATE UNIQUE INDEX IF NOT EXISTS idx_opportunities_theme_key '
+        'ON opportunities (theme_key)'
+    )
+
+
+def pain_point_retention(cursor):
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_pain_points_created_at '
+        'ON pain_points (created_at)'
+    )
+    
+    # Monthly roll-up of pain points that aged out of the hot table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pain_point_rollups (
+            month TEXT NOT NULL,
+            source TEXT NOT NULL,
+            signal TEXT NOT NULL,
+            pain_points INTEGER NOT NULL,
+            mentions INTEGER NOT NULL,
+            PRIMARY KEY (month, source, signal)
+        ) WITHOUT ROWID
+    ''')
+
+
+def scan_run_status_index(cursor):
+    # Last completed scan lookups (metrics endpoint, resumable scans)
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_scan_runs_status '
+        'ON scan_runs (status, id)'
+    )
+
+
+def scan_checkpoints(cursor):
+    # Per-unit progress of a scan; a restarted scan skips 'done' units
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scan_checkpoints (
+            scan_run_id INTEGER NOT NULL,
+            unit TEXT NOT NULL,
+            status TEXT NOT NULL,
+            items INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (scan_run_id, unit)
+        ) WITHOUT ROWID
+    ''')
+    
+    # Raw posts of completed collect units, kept until detection has stored
+    # the scan's pain points
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scan_posts (
+            scan_run_id INTEGER NOT NULL,
+            unit TEXT NOT NULL,
+            post TEXT NOT NULL
+        )
+    ''')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_scan_posts_run '
+        'ON scan_posts (scan_run_id)'
+    )
+    
+    add_column(cursor, 'pain_points', 'scan_run_id', 'INTEGER')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_pain_points_scan_run '
+        'ON pain_points (scan_run_id)'
+    )
+
+
+def opportunity_views(cursor):
+    """
+    Ordered id lists per dashboard view; see opportunity_views.py
+    
+    Only the table: Database.get_opportunity_view builds a generation's
+    views on first read, so this step does not depend on the live view
+    definitions.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS opportunity_views (
+            generation INTEGER NOT NULL,
+            view TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            opportunity_id INTEGER NOT NULL,
+            PRIMARY KEY (generation, view, position)
+        ) WITHOUT ROWID
+    ''')
+
+
+def opportunity_classification(cursor):
+    # Keyword-trigger labels (classifier.py)
+    add_column(cursor, 'opportunities', 'feasibility_score', 'INTEGER')
+    add_column(cursor, 'opportunities', 'b2b', 'BOOLEAN')
+
+
+def scan_run_heartbeat(cursor):
+    # Refreshed while a scan runs; a 'running' run with a stale heartbeat
+    # belongs to a dead process and may be resumed
+    add_column(cursor, 'scan_runs', 'heartbeat_at', 'TEXT')
+
+
+# (version, name, step) in application order. Append new steps; never
+# renumber or edit a released one.
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, 'initial_schema', initial_schema),
+    (2, 'scan_runs', scan_runs),
+    (3, 'scan_generations', scan_generations),
+    (4, 'mention_trends', mention_trends),
+    (5, 'theme_keys', theme_keys),
+    (6, 'pain_point_retention', pain_point_retention),
+    (7, 'scan_run_status_index', scan_run_status_index),
+    (8, 'scan_checkpoints', scan_checkpoints),
+    (9, 'opportunity_views', opportunity_views),
+    (10, 'opportunity_classification', opportunity_classification),
+    (11, 'scan_run_heartbeat', scan_run_heartbeat),
+]
+
+
+def current_version(cursor) -> int:
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    ''')
+    return cursor.execute('SELECT COALESCE(MAX(version), 0) FROM schema_version').fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> List[str]:
+    """
+    Apply pending migrations, each in its own transaction
+    
+    BEGIN IMMEDIATE serialises concurrent starters (e.g. preforked API
+    workers), and the version is re-read under the lock so every step runs
+    exactly once. Returns the names of the applied steps.
+    """
+    cursor = conn.cursor()
+    applied = []
+    
+    for version, name, step in MIGRATIONS:
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if version <= current_version(cursor):
+                conn.commit()
+                continue
+            step(cursor)
+            cursor.execute(
+                'INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)',
+                (version, name, datetime.now().isoformat())
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(name)
+    
+    return applied
+
+
+# Hot queries and the index each must use; checked with EXPLAIN QUERY PLAN
+# by benchmarks/check_query_plans.py
+HOT_QUERIES = {
+    'published_opportunities': (
+        '''SELECT * FROM opportunities
+           WHERE generation = (SELECT MAX(id) FROM scan_generations WHERE status = 'published')
+           ORDER BY score DESC''',
+        (),
+        'idx_opportunities_generation_score'
+    ),
+    'opportunity_by_theme_key': (
+        'SELECT id FROM opportunities WHERE theme_key = ?',
+        ('theme',),
+        'idx_opportunities_theme_key'
+    ),
+    'expired_pain_points': (
+        'SELECT * FROM pain_points WHERE created_at < ? ORDER BY created_at LIMIT 100',
+        ('2026-01-01',),
+        'idx_pain_points_created_at'
+    ),
+    'mention_series': (
+        '''SELECT day, mentions FROM opportunity_mentions_daily
+           WHERE theme_key = ? AND day >= ? ORDER BY day''',
+        ('theme', '2026-01-01'),
+        'PRIMARY KEY'
+    ),
+    'opportunity_history': (
+        'SELECT * FROM opportunity_history WHERE theme_key = ? ORDER BY id DESC',
+        ('theme',),
+        'idx_opportunity_history_theme_key'
+    ),
+    'completed_scan_runs': (
+        'SELECT * FROM scan_runs WHERE status = ? ORDER BY id DESC LIMIT ?',
+        ('completed', 1),
+        'idx_scan_runs_status'
+    ),
+    'scan_pain_points': (
+        'SELECT source, text, url FROM pain_points WHERE scan_run_id = ?',
+        (1,),
+        'idx_pain_points_scan_run'
+    ),
+    'opportunity_view': (
+        '''SELECT o.* FROM opportunity_views v
+           JOIN opportunities o ON o.id = v.opportunity_id
+           WHERE v.generation = (SELECT MAX(id) FROM scan_generations WHERE status = 'published')
+             AND v.view = ? AND v.score >= ?
+           ORDER BY v.position''',
+        ('pro:60:revenue', 65),
+        'SEARCH v USING PRIMARY KEY (generation=? AND view=?'
+    ),
+    'scan_posts': (
+        'SELECT post FROM scan_posts WHERE scan_run_id = ?',
+        (1,),
+        'idx_scan_posts_run'
+    ),
+}
+
+
+def explain(conn: sqlite3.Connection, sql: str, params=()) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for a query"""
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def check_query_plans(conn: sqlite3.Connection) -> List[str]:
+    """Names of hot queries whose plan does not use the expected index"""
+    failures = []
+    for name, (sql, params, index) in HOT_QUERIES.items():
+        plan = explain(conn, sql, params)
+        if not any(index in line for line in plan):
+            failures.append(name)
+    return failures
@@ -7,11 +7,26 @@ import os
 import re
 import json
 import sqlite3
-from datetime import datetime
-from typing import List, Dict, Optional
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterator, Optional, Tuple
 from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from functools import wraps
 import time
 
+import analytics
+import bloom
+import events
+from classifier import Classifier, load as load_classifier
+import metrics
+import migrations
+import opportunity_views
+import pipeline
+from pipeline import contains_pain_signal, normalize_keywords, theme_key, MAX_TEXT_LENGTH
+from profiling import Profiler
+
 # Requirements to install:
 # pip install praw requests beautifulsoup4 --break-system-packages
 
@@ -34,6 +49,9 @@ class Opportunity:
     recommendation: str
     market_size: str
     created_at: str
+    # Keyword-classified (classifier.py); None when no trigger matched
+    feasibility_score: Optional[int] = None
+    b2b: Optional[bool] = None
     
     def to_dict(self):
         return {
@@ -42,82 +60,302 @@ class Opportunity:
         }
 
 
+# Trend smoothing: exponentially weighted mention averages with these
+# half-lives (days); growth rate compares the short average to the long one
+TREND_SHORT_HALF_LIFE = 7
+TREND_LONG_HALF_LIFE = 30
+TREND_THRESHOLD = 0.1
+
+
+def _ewma(previous: float, value: float, half_life: float, gap_days: int) -> float:
+    """EWMA step for irregular sampling: `gap_days` since the previous value"""
+    decay = 0.5 ** (gap_days / half_life)
+    return decay * previous + (1 - decay) * value
+
+
+# Seconds get_snapshot waits before retrying a failed snapshot export
+SNAPSHOT_RETRY_SECONDS = 60
+
+# Checkpoint unit of the detect + store stage (collect units are sources)
+PAIN_POINTS_STAGE = 'stage:pain_points'
+
+# Seconds between heartbeats of a running scan. A 'running' run whose last
+# heartbeat is older than SCAN_STALE_SECONDS was left by a dead process.
+SCAN_HEARTBEAT_SECONDS = 15
+SCAN_STALE_SECONDS = 4 * SCAN_HEARTBEAT_SECONDS
+
+# One scan at a time per process, across OpportunityFinder instances (the
+# API builds one per credentialed request)
+_scan_lock = threading.Lock()
+
+# Absolute paths whose schema was already migrated by this process; every
+# Database() after the first one for a file skips init_db
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
+
+def timed_query(op: str):
+    """Record the wrapped Database call in db_query_duration_seconds"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics.incr('db_queries_total', op=op)
+            with metrics.timer('db_query_duration_seconds', op=op):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class GenerationSuperseded(Exception):
+    """A newer generation was published first; this one was discarded instead"""
+
+
+class ScanInProgress(Exception):
+    """Another scan is still running against the same database"""
+
+
 class Database:
     """Handles all database operations"""
     
-    def __init__(self, db_path='opportunities.db'):
+    def __init__(self, db_path='opportunities.db', snapshot_dir: Optional[str] = None):
         self.db_path = db_path
-        self.init_db()
+        # Columnar analytics snapshot (analytics.py), exported at each publish
+        self.snapshot_dir = snapshot_dir or analytics.default_dir(db_path)
+        self._snapshot_retry_at = 0.0
+        self._ensure_schema()
     
+    def _ensure_schema(self):
+        """Run init_db once per database file per process"""
+        path = os.path.abspath(self.db_path)
+        with _init_lock:
+            # A deleted (e.g. re-seeded) file needs its schema again
+            if path in _initialized_paths and os.path.exists(path):
+                return
+            self.init_db()
+            _initialized_paths.add(path)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits on (rather than fails at) write locks"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA busy_timeout = 30000')
+        return conn
+    
+    @timed_query('init_db')
     def init_db(self):
-        """Create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
+        """Create or upgrade the schema via the versioned migrations"""
+        conn = self._connect()
+        
+        # Must precede table creation to apply to a new file; existing files
+        # are converted by maintenance.py --full-vacuum
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        
+        applied = migrations.migrate(conn)
+        if applied:
+            metrics.log_event('schema_migrated', db=self.db_path, applied=applied)
+        
+        # WAL lets API readers keep reading while a scan writes
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.close()
+    
+    @staticmethod
+    def _published_generation(cursor) -> Optional[int]:
+        row = cursor.execute(
+            "SELECT MAX(id) FROM scan_generations WHERE status = 'published'"
+        ).fetchone()
+        return row[0]
+    
+    @timed_query('begin_generation')
+    def begin_generation(self, scan_run_id: Optional[int] = None) -> int:
+        """Open a staging generation for a scan's output"""
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS opportunities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                problem TEXT NOT NULL,
-                score INTEGER NOT NULL,
-                mentions INTEGER NOT NULL,
-                revenue TEXT,
-                revenue_amount INTEGER,
-                competitors INTEGER,
-                competition_level TEXT,
-                build_complexity TEXT,
-                sources TEXT,
-                example TEXT,
-                validated BOOLEAN,
-                recommendation TEXT,
-                market_size TEXT,
-                created_at TEXT NOT NULL
-            )
-        ''')
+        cursor.execute(
+            'INSERT INTO scan_generations (scan_run_id, status, created_at) VALUES (?, ?, ?)',
+            (scan_run_id, 'staging', datetime.now().isoformat())
+        )
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS pain_points (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source TEXT NOT NULL,
-                text TEXT NOT NULL,
-                url TEXT,
-                mentions INTEGER DEFAULT 1,
-                created_at TEXT NOT NULL
+        generation = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        
+        return generation
+    
+    @staticmethod
+    def _publish(cursor, generation: int) -> bool:
+        """
+        Mark `generation` published, retire every older one and build its views
+        
+        Must run inside the caller's write transaction. A generation older
+        than the one already published (a slow scan finishing after a faster
+        one) is marked discarded instead; returns whether it was published.
+        """
+        current = Database._published_generation(cursor)
+        if current is not None and current > generation:
+            cursor.execute(
+                "UPDATE scan_generations SET status = 'discarded' WHERE id = ?",
+                (generation,)
             )
-        ''')
+            return False
+        
+        cursor.execute(
+            "UPDATE scan_generations SET status = 'published', published_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), generation)
+        )
+        cursor.execute(
+            "UPDATE scan_generations SET status = 'retired' "
+            "WHERE id < ? AND status IN ('published', 'discarded')",
+            (generation,)
+        )
+        opportunity_views.build_views(cursor, generation)
+        return True
+    
+    @timed_query('publish_generation')
+    def publish_generation(self, generation: int):
+        """
+        Atomically make a staged generation the one readers see
+        
+        Raises GenerationSuperseded if a newer generation is already
+        published.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        published = self._publish(cursor, generation)
         
         conn.commit()
         conn.close()
+        if not published:
+            raise GenerationSuperseded(f"generation {generation} is older than the published one")
+        self.export_snapshot()
     
-    def save_opportunity(self, opportunity: Opportunity) -> int:
-        """Save an opportunity to the database"""
-        conn = sqlite3.connect(self.db_path)
+    @timed_query('discard_generation')
+    def discard_generation(self, generation: int):
+        """Mark a staged generation that will never be published"""
+        conn = self._connect()
         cursor = conn.cursor()
         
+        cursor.execute(
+            "UPDATE scan_generations SET status = 'discarded' WHERE id = ? AND status = 'staging'",
+            (generation,)
+        )
+        
+        conn.commit()
+        conn.close()
+    
+    @staticmethod
+    def _upsert_opportunity(cursor, opportunity: Opportunity, generation: int) -> int:
+        """
+        Insert or refresh the opportunity row for the theme key
+        
+        The row's previous values are appended to opportunity_history first;
+        id and created_at stay stable across scans. Rows only move forward:
+        a row already claimed by a newer generation (an overlapping scan that
+        finished first) is left alone, and its id is returned.
+        """
         data = opportunity.to_dict()
         del data['id']  # Let DB handle ID
+        data['theme_key'] = theme_key(opportunity.title)
+        data['generation'] = generation
+        
+        cursor.execute('''
+            INSERT INTO opportunity_history (
+                opportunity_id, theme_key, generation, score, mentions,
+                revenue_amount, competitors, sources, recorded_at
+            )
+            SELECT id, theme_key, generation, score, mentions,
+                   revenue_amount, competitors, sources, ?
+            FROM opportunities WHERE theme_key = ? AND generation <= ?
+        ''', (datetime.now().isoformat(), data['theme_key'], generation))
         
         columns = ', '.join(data.keys())
         placeholders = ', '.join(['?' for _ in data])
+        updates = ', '.join(
+            f'{column} = excluded.{column}'
+            for column in data if column not in ('theme_key', 'created_at')
+        )
         
         cursor.execute(
-            f'INSERT INTO opportunities ({columns}) VALUES ({placeholders})',
+            f'INSERT INTO opportunities ({columns}) VALUES ({placeholders}) '
+            f'ON CONFLICT (theme_key) DO UPDATE SET {updates} '
+            f'WHERE excluded.generation >= opportunities.generation '
+            f'RETURNING id',
             tuple(data.values())
         )
+        row = cursor.fetchone()
+        if row is None:
+            row = cursor.execute(
+                'SELECT id FROM opportunities WHERE theme_key = ?', (data['theme_key'],)
+            ).fetchone()
+        return row[0]
+    
+    @timed_query('save_opportunities')
+    def save_opportunities(self, opportunities: List[Opportunity], generation: int) -> List[int]:
+        """
+        Upsert a scan's opportunities and publish `generation` in one transaction
+        
+        Readers (WAL snapshots) see either the previous generation or the
+        complete new one, never a mix. Raises GenerationSuperseded (after
+        committing the discard) if a newer generation is already published.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        ids = [
+            self._upsert_opportunity(cursor, opportunity, generation)
+            for opportunity in opportunities
+        ]
+        published = self._publish(cursor, generation)
         
-        opportunity_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        if not published:
+            raise GenerationSuperseded(f"generation {generation} is older than the published one")
+        self.export_snapshot()
+        
+        return ids
+    
+    @timed_query('save_opportunity')
+    def save_opportunity(self, opportunity: Opportunity) -> int:
+        """Upsert an opportunity directly into the published generation"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        generation = self._published_generation(cursor)
+        if generation is None:
+            now = datetime.now().isoformat()
+            cursor.execute(
+                'INSERT INTO scan_generations (status, created_at, published_at) VALUES (?, ?, ?)',
+                ('published', now, now)
+            )
+            generation = cursor.lastrowid
+        
+        opportunity_id = self._upsert_opportunity(cursor, opportunity, generation)
+        # Rebuilt by the next get_opportunity_view, not once per upsert
+        cursor.execute('DELETE FROM opportunity_views WHERE generation = ?', (generation,))
+        conn.commit()
+        conn.close()
+        analytics.invalidate(self.snapshot_dir)
         
         return opportunity_id
     
+    @timed_query('get_all_opportunities')
     def get_all_opportunities(self) -> List[Dict]:
-        """Retrieve all opportunities"""
-        conn = sqlite3.connect(self.db_path)
+        """Retrieve all opportunities of the latest published generation"""
+        conn = self._connect()
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM opportunities ORDER BY score DESC')
+        # Single statement, so generation lookup and rows share one snapshot
+        cursor.execute('''
+            SELECT * FROM opportunities
+            WHERE generation = (
+                SELECT MAX(id) FROM scan_generations WHERE status = 'published'
+            )
+            ORDER BY score DESC
+        ''')
         rows = cursor.fetchall()
         conn.close()
         
@@ -129,9 +367,129 @@ class Database:
         
         return opportunities
     
+    @timed_query('export_snapshot')
+    def export_snapshot(self) -> Optional[str]:
+        """
+        Write the published generation's columnar snapshot; returns its path
+        
+        None when numpy is not installed, nothing is published or the export
+        failed. A failed export never fails the publish: readers re-export
+        on demand (get_snapshot) or fall back to SQL.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        # Generation and rows read from one snapshot
+        cursor.execute('BEGIN')
+        try:
+            generation = self._published_generation(cursor)
+            if generation is None:
+                return None
+            return analytics.export(cursor, self.snapshot_dir, generation)
+        except Exception as e:
+            # Already published: readers fall back to SQL until an export succeeds
+            metrics.log_event('snapshot_export_failed', dir=self.snapshot_dir, error=repr(e))
+            self._snapshot_retry_at = time.monotonic() + SNAPSHOT_RETRY_SECONDS
+            return None
+        finally:
+            conn.rollback()
+            conn.close()
+    
+    @timed_query('get_snapshot')
+    def get_snapshot(self) -> Optional[analytics.Snapshot]:
+        """
+        Memory-mapped columns of the published generation
+        
+        Re-exports a missing or outdated snapshot first. None (callers fall
+        back to SQL) when numpy is not installed, nothing is published or
+        the export failed.
+        """
+        if not analytics.available():
+            return None
+        snapshot = analytics.open_snapshot(self.snapshot_dir)
+        
+        conn = self._connect()
+        generation = self._published_generation(conn.cursor())
+        conn.close()
+        if generation is None:
+            return None
+        
+        if snapshot is None or snapshot.generation != generation:
+            # After a failed export, readers use SQL for a while instead of
+            # retrying the export on every call
+            if time.monotonic() < self._snapshot_retry_at:
+                return None
+            if self.export_snapshot() is None:
+                return None
+            snapshot = analytics.open_snapshot(self.snapshot_dir)
+        # An outdated snapshot is never served
+        if snapshot is None or snapshot.generation != generation:
+            return None
+        return snapshot
+    
+    @staticmethod
+    def _views_missing(cursor, generation: int) -> bool:
+        """True if `generation` has opportunities but no built views"""
+        return bool(cursor.execute('''
+            SELECT EXISTS (SELECT 1 FROM opportunities WHERE generation = ?)
+               AND NOT EXISTS (SELECT 1 FROM opportunity_views WHERE generation = ?)
+        ''', (generation, generation)).fetchone()[0])
+    
+    @timed_query('get_opportunity_view')
+    def get_opportunity_view(
+        self,
+        tier: str = opportunity_views.DEFAULT_TIER,
+        min_score: int = 0,
+        sort: str = opportunity_views.DEFAULT_SORT
+    ) -> List[Dict]:
+        """
+        Published opportunities visible to `tier`, at or above `min_score`
+        
+        Reads the precomputed view in order (a primary key range) instead of
+        filtering and sorting the whole generation. Raises ValueError for an
+        unknown tier.
+        """
+        view, _bucket = opportunity_views.view_key(tier, min_score, sort)
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        query = '''
+            SELECT o.* FROM opportunity_views v
+            JOIN opportunities o ON o.id = v.opportunity_id
+            WHERE v.generation = (
+                SELECT MAX(id) FROM scan_generations WHERE status = 'published'
+            )
+              AND v.view = ? AND v.score >= ?
+            ORDER BY v.position
+        '''
+        rows = cursor.execute(query, (view, min_score)).fetchall()
+        
+        # save_opportunity drops the views it invalidates; the first read
+        # afterwards rebuilds them
+        if not rows:
+            generation = self._published_generation(cursor)
+            if generation is not None and self._views_missing(cursor, generation):
+                cursor.execute('BEGIN IMMEDIATE')
+                # Re-checked under the lock: a concurrent reader may have built them
+                if self._views_missing(cursor, generation):
+                    opportunity_views.build_views(cursor, generation)
+                conn.commit()
+                rows = cursor.execute(query, (view, min_score)).fetchall()
+        conn.close()
+        
+        opportunities = []
+        for row in rows:
+            opp = dict(row)
+            opp['sources'] = json.loads(opp['sources'])
+            opportunities.append(opp)
+        
+        return opportunities
+    
+    @timed_query('save_pain_point')
     def save_pain_point(self, source: str, text: str, url: Optional[str] = None):
         """Save a pain point mention"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -141,6 +499,420 @@ class Database:
         
         conn.commit()
         conn.close()
+    
+    @timed_query('save_pain_points')
+    def save_pain_points(self, pain_points: List[Dict], scan_run_id: Optional[int] = None) -> int:
+        """
+        Save many pain points in a single transaction
+        
+        With a scan_run_id the same transaction checkpoints the scan's
+        pain_points stage and drops its staged raw posts, so a resumed scan
+        reuses these rows instead of storing them twice.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        created_at = datetime.now().isoformat()
+        cursor.executemany('''
+            INSERT INTO pain_points (source, text, url, created_at, scan_run_id)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (point['source'], point['text'], point.get('url'), created_at, scan_run_id)
+            for point in pain_points
+        ])
+        
+        if scan_run_id is not None:
+            self._checkpoint(cursor, scan_run_id, PAIN_POINTS_STAGE, 'done', len(pain_points))
+            cursor.execute('DELETE FROM scan_posts WHERE scan_run_id = ?', (scan_run_id,))
+        
+        conn.commit()
+        conn.close()
+        
+        return len(pain_points)
+    
+    @timed_query('get_scan_pain_points')
+    def get_scan_pain_points(self, scan_run_id: int) -> List[Dict]:
+        """Pain points stored by a scan run"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            'SELECT source, text, url FROM pain_points WHERE scan_run_id = ?',
+            (scan_run_id,)
+        ).fetchall()
+        conn.close()
+        
+        return [dict(row) for row in rows]
+    
+    def iter_pain_point_urls(self, after_id: int = 0, batch_size: int = 10000) -> Iterator[Tuple[int, List[str]]]:
+        """Yield (last id, urls) batches of pain points with id > after_id"""
+        conn = self._connect()
+        try:
+            while True:
+                rows = conn.execute(
+                    'SELECT id, url FROM pain_points WHERE id > ? ORDER BY id LIMIT ?',
+                    (after_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    return
+                after_id = rows[-1][0]
+                yield after_id, [url for _id, url in rows if url]
+        finally:
+            conn.close()
+    
+    def max_pain_point_id(self) -> int:
+        conn = self._connect()
+        max_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM pain_points').fetchone()[0]
+        conn.close()
+        return max_id
+    
+    @timed_query('record_mentions')
+    def record_mentions(self, mentions: Dict[str, int], day: Optional[str] = None):
+        """
+        Append today's mention count per theme key and update its trend
+        
+        Trend state is updated incrementally from the previous state, never
+        recomputed from history or raw pain points.
+        """
+        day = day or datetime.now().date().isoformat()
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        for key, count in mentions.items():
+            cursor.execute('''
+                INSERT INTO opportunity_mentions_daily (theme_key, day, mentions)
+                VALUES (?, ?, ?)
+                ON CONFLICT (theme_key, day) DO UPDATE SET mentions = excluded.mentions
+            ''', (key, day, count))
+            
+            row = cursor.execute(
+                '''SELECT first_seen, last_seen, days_seen,
+                          base_short, base_long, ewma_short, ewma_long
+                   FROM opportunity_trends WHERE theme_key = ?''',
+                (key,)
+            ).fetchone()
+            
+            if row is None:
+                first_seen, days_seen = day, 1
+                base_short = base_long = None
+                short = long = float(count)
+            else:
+                first_seen, last_seen, days_seen, base_short, base_long, short, long = row
+                if day < last_seen:
+                    continue  # late backfill: keep the series, trend state moves forward only
+                if day > last_seen:
+                    # New day: today's state builds on yesterday's final state
+                    gap = (datetime.fromisoformat(day) - datetime.fromisoformat(last_seen)).days
+                    base_short, base_long, base_gap = short, long, gap
+                    days_seen += 1
+                else:
+                    base_gap = None
+                if base_short is None:
+                    short = long = float(count)
+                else:
+                    if base_gap is None:
+                        base_gap = self._trend_gap(cursor, key, day)
+                    short = _ewma(base_short, count, TREND_SHORT_HALF_LIFE, base_gap)
+                    long = _ewma(base_long, count, TREND_LONG_HALF_LIFE, base_gap)
+            
+            growth = (short - long) / long if long else 0.0
+            if growth > TREND_THRESHOLD:
+                trend = 'up'
+            elif growth < -TREND_THRESHOLD:
+                trend = 'down'
+            else:
+                trend = 'stable'
+            timing_score = max(1, min(10, round(5 + growth * 10)))
+            
+            cursor.execute('''
+                INSERT OR REPLACE INTO opportunity_trends (
+                    theme_key, first_seen, last_seen, days_seen, last_mentions,
+                    base_short, base_long, ewma_short, ewma_long,
+                    growth_rate, trend, timing_score
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                key, first_seen, day, days_seen, count, base_short,
+                base_long, short, long, growth, trend, timing_score
+            ))
+        
+        conn.commit()
+        conn.close()
+    
+    @staticmethod
+    def _trend_gap(cursor, key: str, day: str) -> int:
+        """Days between `day` and the theme's previous recorded day"""
+        row = cursor.execute(
+            '''SELECT day FROM opportunity_mentions_daily
+               WHERE theme_key = ? AND day < ? ORDER BY day DESC LIMIT 1''',
+            (key, day)
+        ).fetchone()
+        if row is None:
+            return 1
+        return (datetime.fromisoformat(day) - datetime.fromisoformat(row[0])).days
+    
+    @timed_query('get_trend')
+    def get_trend(self, key: str) -> Optional[Dict]:
+        """Trend summary for a theme key (None if never recorded)"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            '''SELECT theme_key, first_seen, last_seen, days_seen, last_mentions,
+                      ewma_short, ewma_long, growth_rate, trend,
+                      timing_score
+               FROM opportunity_trends WHERE theme_key = ?''',
+            (key,)
+        )
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    @timed_query('get_mention_series')
+    def get_mention_series(self, key: str, days: int = 365) -> List[Dict]:
+        """Daily mention counts for a theme over the last `days` days"""
+        since = (datetime.now().date() - timedelta(days=days)).isoformat()
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            '''SELECT day, mentions FROM opportunity_mentions_daily
+               WHERE theme_key = ? AND day >= ? ORDER BY day''',
+            (key, since)
+        )
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [{'day': day, 'mentions': mentions} for day, mentions in rows]
+    
+    @timed_query('start_scan_run')
+    def start_scan_run(self) -> int:
+        """Record the start of a scan and return its run ID"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        now = datetime.now().isoformat()
+        cursor.execute(
+            'INSERT INTO scan_runs (status, started_at, heartbeat_at) VALUES (?, ?, ?)',
+            ('running', now, now)
+        )
+        
+        run_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        
+        return run_id
+    
+    @timed_query('finish_scan_run')
+    def finish_scan_run(
+        self,
+        run_id: int,
+        status: str,
+        duration_seconds: float,
+        pain_points: int,
+        themes: int,
+        opportunities: int,
+        run_metrics: Dict
+    ):
+        """Store the outcome and metric snapshot of a scan"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE scan_runs
+            SET status = ?, finished_at = ?, duration_seconds = ?,
+                pain_points = ?, themes = ?, opportunities = ?, metrics = ?
+            WHERE id = ?
+        ''', (
+            status, datetime.now().isoformat(), duration_seconds,
+            pain_points, themes, opportunities, json.dumps(run_metrics), run_id
+        ))
+        
+        conn.commit()
+        conn.close()
+    
+    @timed_query('get_scan_runs')
+    def get_scan_runs(self, limit: int = 20, status: Optional[str] = None) -> List[Dict]:
+        """Retrieve the most recent scan runs, newest first"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        if status:
+            cursor.execute(
+                'SELECT * FROM scan_runs WHERE status = ? ORDER BY id DESC LIMIT ?',
+                (status, limit)
+            )
+        else:
+            cursor.execute('SELECT * FROM scan_runs ORDER BY id DESC LIMIT ?', (limit,))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        runs = []
+        for row in rows:
+            run = dict(row)
+            run['metrics'] = json.loads(run['metrics']) if run['metrics'] else {}
+            runs.append(run)
+        
+        return runs
+    
+    
+    @staticmethod
+    def _checkpoint(cursor, scan_run_id: int, unit: str, status: str, items: int = 0, error: Optional[str] = None):
+        cursor.execute('''
+            INSERT INTO scan_checkpoints (scan_run_id, unit, status, items, error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (scan_run_id, unit) DO UPDATE SET
+                status = excluded.status,
+                items = excluded.items,
+                error = excluded.error,
+                updated_at = excluded.updated_at
+        ''', (scan_run_id, unit, status, items, error, datetime.now().isoformat()))
+    
+    @timed_query('heartbeat_scan_run')
+    def heartbeat_scan_run(self, run_id: int):
+        """Mark a running scan as alive"""
+        conn = self._connect()
+        conn.execute(
+            'UPDATE scan_runs SET heartbeat_at = ? WHERE id = ?',
+            (datetime.now().isoformat(), run_id)
+        )
+        conn.commit()
+        conn.close()
+    
+    @staticmethod
+    def _is_live(status: str, heartbeat_at: Optional[str]) -> bool:
+        """True for a 'running' run whose process is still heartbeating"""
+        if status != 'running' or heartbeat_at is None:
+            return False
+        cutoff = datetime.now() - timedelta(seconds=SCAN_STALE_SECONDS)
+        return heartbeat_at >= cutoff.isoformat()
+    
+    @timed_query('get_live_scan_run')
+    def get_live_scan_run(self) -> Optional[int]:
+        """ID of the latest scan run if a live process is still running it, else None"""
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT id, status, heartbeat_at FROM scan_runs ORDER BY id DESC LIMIT 1'
+        ).fetchone()
+        conn.close()
+        
+        if row and self._is_live(row[1], row[2]):
+            return row[0]
+        return None
+    
+    @timed_query('get_resumable_scan_run')
+    def get_resumable_scan_run(self) -> Optional[int]:
+        """
+        ID of the latest scan run if it never completed or left failed units, else None
+        
+        A 'running' run only counts once its heartbeat has gone stale; until
+        then its process is alive and owns the run.
+        """
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT id, status, heartbeat_at FROM scan_runs ORDER BY id DESC LIMIT 1'
+        ).fetchone()
+        conn.close()
+        
+        if row and row[1] in ('running', 'failed', 'partial') and not self._is_live(row[1], row[2]):
+            return row[0]
+        return None
+    
+    @timed_query('restart_scan_run')
+    def restart_scan_run(self, scan_run_id: int) -> bool:
+        """
+        Mark an interrupted run running again and drop its unpublished generations
+        
+        Returns False, changing nothing, if a live process owns the run
+        (another resume took it over first).
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('BEGIN IMMEDIATE')
+        row = cursor.execute(
+            'SELECT status, heartbeat_at FROM scan_runs WHERE id = ?', (scan_run_id,)
+        ).fetchone()
+        if row is None or self._is_live(row[0], row[1]):
+            conn.rollback()
+            conn.close()
+            return False
+        
+        cursor.execute(
+            "UPDATE scan_runs SET status = 'running', finished_at = NULL, heartbeat_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), scan_run_id)
+        )
+        cursor.execute(
+            "UPDATE scan_generations SET status = 'discarded' WHERE scan_run_id = ? AND status = 'staging'",
+            (scan_run_id,)
+        )
+        
+        conn.commit()
+        conn.close()
+        return True
+    
+    @timed_query('get_failed_units')
+    def get_failed_units(self, scan_run_id: int) -> List[str]:
+        """Collect units of a scan run whose last attempt failed"""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT unit FROM scan_checkpoints WHERE scan_run_id = ? AND status = 'failed' ORDER BY unit",
+            (scan_run_id,)
+        ).fetchall()
+        conn.close()
+        
+        return [row[0] for row in rows]
+    
+    @timed_query('get_checkpoints')
+    def get_checkpoints(self, scan_run_id: int) -> Dict[str, Dict]:
+        """Checkpoint rows of a scan run keyed by unit"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            'SELECT unit, status, items, error, updated_at FROM scan_checkpoints WHERE scan_run_id = ?',
+            (scan_run_id,)
+        ).fetchall()
+        conn.close()
+        
+        return {row['unit']: dict(row) for row in rows}
+    
+    @timed_query('save_unit_posts')
+    def save_unit_posts(self, scan_run_id: int, unit: str, posts: List[Dict]):
+        """Stage a collect unit's posts and mark the unit done in one transaction"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute('DELETE FROM scan_posts WHERE scan_run_id = ? AND unit = ?', (scan_run_id, unit))
+        cursor.executemany(
+            'INSERT INTO scan_posts (scan_run_id, unit, post) VALUES (?, ?, ?)',
+            [(scan_run_id, unit, json.dumps(post)) for post in posts]
+        )
+        self._checkpoint(cursor, scan_run_id, unit, 'done', len(posts))
+        
+        conn.commit()
+        conn.close()
+    
+    @timed_query('fail_unit')
+    def fail_unit(self, scan_run_id: int, unit: str, error: str):
+        """Record a collect unit that raised; a resumed scan retries it"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        self._checkpoint(cursor, scan_run_id, unit, 'failed', 0, error)
+        conn.commit()
+        conn.close()
+    
+    @timed_query('get_scan_posts')
+    def get_scan_posts(self, scan_run_id: int) -> List[Dict]:
+        """Raw posts staged by a scan run's completed units"""
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT post FROM scan_posts WHERE scan_run_id = ?',
+            (scan_run_id,)
+        ).fetchall()
+        conn.close()
+        
+        return [json.loads(row[0]) for row in rows]
 
 
 class RedditCollector:
@@ -170,7 +942,15 @@ class RedditCollector:
         'productivity'
     ]
     
-    def __init__(self, reddit_credentials: Optional[Dict] = None):
+    def __init__(
+        self,
+        reddit_credentials: Optional[Dict] = None,
+        reddit=None,
+        request_delay: float = 1.0,
+        keywords_per_subreddit: int = 3,
+        limit_per_subreddit: int = 100,
+        seen=None
+    ):
         """
         Initialize Reddit collector
         
@@ -180,18 +960,40 @@ class RedditCollector:
             'client_secret': 'your_client_secret',
             'user_agent': 'OpportunityFinder/1.0'
         }
+        
+        Alternatively pass a ready praw.Reddit-compatible client as `reddit`
+        (e.g. synthetic.FakeReddit for offline load tests).
         """
         self.credentials = reddit_credentials
-        self.reddit = None
-        
-        if reddit_credentials:
-            try:
-                import praw
-                self.reddit = praw.Reddit(**reddit_credentials)
-            except ImportError:
-                print("Warning: praw not installed. Install with: pip install praw --break-system-packages")
+        self._reddit = reddit
+        self._reddit_loaded = reddit is not None
+        self.request_delay = request_delay
+        self.keywords_per_subreddit = keywords_per_subreddit
+        self.limit_per_subreddit = limit_per_subreddit
+        # Optional bloom.ScalableBloomFilter of post URLs to skip
+        self.seen = seen
+        # Normalized once here, not per post
+        self.pain_keywords = normalize_keywords(self.PAIN_KEYWORDS)
+    
+    @property
+    def reddit(self):
+        """praw client, imported and built on first use rather than at startup"""
+        if not self._reddit_loaded:
+            self._reddit_loaded = True
+            if self.credentials:
+                try:
+                    import praw
+                    self._reddit = praw.Reddit(**self.credentials)
+                except ImportError:
+                    print("Warning: praw not installed. Install with: pip install praw --break-system-packages")
+        return self._reddit
+    
+    @reddit.setter
+    def reddit(self, client):
+        self._reddit = client
+        self._reddit_loaded = True
     
-    def collect_pain_points(self, limit_per_subreddit: int = 100) -> List[Dict]:
+    def collect_pain_points(self, limit_per_subreddit: Optional[int] = None) -> List[Dict]:
         """
         Scan Reddit for pain points
         
@@ -201,43 +1003,88 @@ class RedditCollector:
             print("Reddit collector not initialized. Using mock data.")
             return self._get_mock_data()
         
-        pain_points = []
+        return [
+            {**post, 'text': post['text'][:MAX_TEXT_LENGTH]}
+            for post in self.fetch_posts(limit_per_subreddit)
+            if self._contains_pain_signal(f"{post['title']} {post['text']}")
+        ]
+    
+    def units(self) -> List[str]:
+        """
+        Checkpoint units of a collection: one per (subreddit, keyword) search
         
-        for subreddit_name in self.SUBREDDITS:
-            print(f"Scanning r/{subreddit_name}...")
-            
+        Named 'r/<subreddit>:<keyword>'; a single 'mock' unit when the
+        collector is not initialized.
+        """
+        if not self.reddit:
+            return ['mock']
+        return [
+            f'r/{subreddit_name}:{keyword}'
+            for subreddit_name in self.SUBREDDITS
+            for keyword in self.PAIN_KEYWORDS[:self.keywords_per_subreddit]  # Limit to avoid rate limits
+        ]
+    
+    def fetch_unit(self, unit: str, limit_per_subreddit: Optional[int] = None) -> List[Dict]:
+        """
+        Every search result of one unit as raw post dicts
+        
+        Text is untrimmed and no pain signal check is applied, so detection
+        can run separately (see pipeline.run_sharded). Errors propagate so
+        the caller can checkpoint the unit as failed.
+        """
+        if unit == 'mock':
+            print("Reddit collector not initialized. Using mock data.")
+            return self._get_mock_data()
+        
+        limit_per_subreddit = limit_per_subreddit or self.limit_per_subreddit
+        subreddit_name, keyword = unit[len('r/'):].split(':', 1)
+        print(f"Scanning r/{subreddit_name} for '{keyword}'...")
+        
+        subreddit = self.reddit.subreddit(subreddit_name)
+        seen = self.seen
+        posts = []
+        skipped = 0
+        for submission in subreddit.search(keyword, limit=limit_per_subreddit, time_filter='month'):
+            url = f'https://reddit.com{submission.permalink}'
+            # Repeats from earlier scans are dropped before any other work
+            if seen is not None and url in seen:
+                skipped += 1
+                continue
+            posts.append({
+                'source': f'r/{subreddit_name}',
+                'title': submission.title,
+                'text': submission.selftext,
+                'url': url,
+                'score': submission.score,
+                'num_comments': submission.num_comments
+            })
+        if skipped:
+            metrics.incr('collector_seen_skipped_total', skipped, source='reddit')
+        
+        # Rate limiting, once per subreddit
+        if self.request_delay and keyword == self.PAIN_KEYWORDS[:self.keywords_per_subreddit][-1]:
+            time.sleep(self.request_delay)
+        
+        return posts
+    
+    def fetch_posts(self, limit_per_subreddit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Yield every search result as a raw post dict
+        
+        Falls back to mock data when the collector is not initialized. A
+        failing unit is reported and skipped; OpportunityFinder scans use
+        units() / fetch_unit() directly so failures are checkpointed.
+        """
+        for unit in self.units():
             try:
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                # Search for pain point keywords
-                for keyword in self.PAIN_KEYWORDS[:3]:  # Limit to avoid rate limits
-                    for submission in subreddit.search(keyword, limit=limit_per_subreddit, time_filter='month'):
-                        
-                        # Check title and body for pain signals
-                        text = f"{submission.title} {submission.selftext}"
-                        
-                        if self._contains_pain_signal(text):
-                            pain_points.append({
-                                'source': f'r/{subreddit_name}',
-                                'title': submission.title,
-                                'text': submission.selftext[:500],
-                                'url': f'https://reddit.com{submission.permalink}',
-                                'score': submission.score,
-                                'num_comments': submission.num_comments
-                            })
-                
-                time.sleep(1)  # Rate limiting
-                
+                yield from self.fetch_unit(unit, limit_per_subreddit)
             except Exception as e:
-                print(f"Error scanning r/{subreddit_name}: {e}")
+                print(f"Error scanning {unit}: {e}")
                 continue
-        
-        return pain_points
     
     def _contains_pain_signal(self, text: str) -> bool:
         """Check if text contains pain point indicators"""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in self.PAIN_KEYWORDS)
+        return contains_pain_signal(text, self.pain_keywords)
     
     def _get_mock_data(self) -> List[Dict]:
         """Return mock data for testing without Reddit API"""
@@ -375,92 +1222,334 @@ class OpportunityValidator:
 class OpportunityFinder:
     """Main orchestrator for finding and scoring opportunities"""
     
-    def __init__(self, reddit_credentials: Optional[Dict] = None):
-        self.db = Database()
-        self.reddit_collector = RedditCollector(reddit_credentials)
-        self.validator = OpportunityValidator()
+    def __init__(
+        self,
+        reddit_credentials: Optional[Dict] = None,
+        profiler: Optional[Profiler] = None,
+        reddit_collector: Optional[RedditCollector] = None,
+        workers: Optional[int] = None,
+        shard_by: str = 'hash',
+        db: Optional[Database] = None,
+        http_collectors: Optional[List] = None,
+        skip_seen: bool = True,
+        classifier: Optional[Classifier] = None
+    ):
+        # Pass a shared Database to skip opening (and migrating) another one
+        self.db = db or Database()
+        self.reddit_credentials = reddit_credentials
+        self._reddit_collector = reddit_collector
+        # Extra collectors.HTTPCollector sources (e.g. HackerNewsCollector)
+        self.http_collectors = http_collectors or []
+        # Skip posts stored by earlier scans (seen-URL Bloom filter next to the DB)
+        self.skip_seen = skip_seen
+        self.seen_path = f'{self.db.db_path}.seen'
+        self._seen = None
+        self._classifier = classifier
+        self._validator = None
         self.scorer = OpportunityScorer()
+        # Opt-in profiling (OF_PROFILE env var or main() --profile)
+        self.profiler = profiler or Profiler.from_env()
+        # Worker processes for pain point processing (OF_SCAN_WORKERS; 0 = all cores)
+        self.workers = pipeline.resolve_workers(workers)
+        self.shard_by = shard_by
+    
+    @property
+    def reddit_collector(self) -> RedditCollector:
+        """Collector built on first scan, so idle finders never touch praw"""
+        if self._reddit_collector is None:
+            self._reddit_collector = RedditCollector(self.reddit_credentials)
+        return self._reddit_collector
     
-    def run_scan(self) -> List[Opportunity]:
+    @property
+    def seen(self) -> Optional[bloom.ScalableBloomFilter]:
+        """Seen-URL filter, loaded (or rebuilt from pain_points) on first scan"""
+        if not self.skip_seen:
+            return None
+        if self._seen is None:
+            with metrics.timer('seen_filter_load_seconds'):
+                self._seen = bloom.load_or_rebuild(self.seen_path, self.db)
+        else:
+            # Pick up pain points stored by other processes since the last scan
+            bloom.catch_up(self._seen, self.db)
+        return self._seen
+    
+    @property
+    def classifier(self) -> Classifier:
+        """Theme classifier; the OF_CLASSIFIER_RULES file is re-read when edited"""
+        return self._classifier or load_classifier()
+    
+    @property
+    def validator(self) -> OpportunityValidator:
+        if self._validator is None:
+            self._validator = OpportunityValidator()
+        return self._validator
+    
+    def run_scan(self, resume: bool = False) -> List[Opportunity]:
         """
         Run complete scan:
         1. Collect pain points
         2. Aggregate by theme
         3. Validate each opportunity
         4. Score and store
+        
+        Every stage is timed into a per-scan metrics scope; the snapshot is
+        logged as JSON and persisted in the scan_runs table. When profiling
+        is enabled the whole scan is profiled as well.
+        
+        Scans are serialised: raises ScanInProgress if this process is
+        already scanning, or another process's scan is still heartbeating.
+        """
+        if not _scan_lock.acquire(blocking=False):
+            raise ScanInProgress('A scan is already running')
+        try:
+            live = self.db.get_live_scan_run()
+            if live is not None:
+                raise ScanInProgress(f'Scan run {live} is already running')
+            with self.profiler.profile('scan'):
+                return self._run_scan(resume)
+        finally:
+            _scan_lock.release()
+    
+    @contextmanager
+    def _heartbeat(self, run_id: int):
+        """Heartbeat `run_id` every SCAN_HEARTBEAT_SECONDS while the block runs"""
+        stop = threading.Event()
+        
+        def beat():
+            while not stop.wait(SCAN_HEARTBEAT_SECONDS):
+                try:
+                    self.db.heartbeat_scan_run(run_id)
+                except sqlite3.Error:
+                    # Database busy; the next beat retries well within SCAN_STALE_SECONDS
+                    pass
+        
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+    
+    def _run_scan(self, resume: bool = False) -> List[Opportunity]:
+        run_id = self.db.get_resumable_scan_run() if resume else None
+        resumed = run_id is not None
+        if resumed:
+            if not self.db.restart_scan_run(run_id):
+                raise ScanInProgress(f'Scan run {run_id} is already running')
+            print(f"Resuming scan run {run_id}")
+            metrics.log_event('scan_resumed', run_id=run_id)
+        else:
+            run_id = self.db.start_scan_run()
+        generation = self.db.begin_generation(run_id)
+        started = time.perf_counter()
+        pain_points, themes, opportunities = [], [], []
+        status = 'failed'
+        events.publish('scan_started', run_id=run_id, resumed=resumed)
+        
+        with metrics.scope() as scan_metrics, self._heartbeat(run_id):
+            try:
+                opportunities = self._run_stages(pain_points, themes, generation, run_id)
+                # Published either way; partial runs stay resumable for their failed units
+                status = 'partial' if self.db.get_failed_units(run_id) else 'completed'
+            finally:
+                if status == 'failed':
+                    self.db.discard_generation(generation)
+                duration = time.perf_counter() - started
+                scan_metrics.set_gauge('last_scan_duration_seconds', duration)
+                scan_metrics.set_gauge('last_scan_pain_points', len(pain_points))
+                scan_metrics.set_gauge('last_scan_opportunities', len(opportunities))
+                scan_metrics.set_gauge(
+                    'last_scan_pain_points_per_second',
+                    len(pain_points) / duration if duration else 0
+                )
+                snapshot = scan_metrics.snapshot()
+                self.db.finish_scan_run(
+                    run_id,
+                    status=status,
+                    duration_seconds=duration,
+                    pain_points=len(pain_points),
+                    themes=len(themes),
+                    opportunities=len(opportunities),
+                    run_metrics=snapshot
+                )
+                metrics.log_event(
+                    'scan_finished',
+                    run_id=run_id,
+                    status=status,
+                    duration_seconds=round(duration, 4),
+                    metrics=snapshot
+                )
+                events.publish(
+                    'scan_finished',
+                    run_id=run_id,
+                    status=status,
+                    duration_seconds=round(duration, 4),
+                    pain_points=len(pain_points),
+                    themes=len(themes),
+                    opportunities=len(opportunities)
+                )
+        
+        return opportunities
+    
+    def _run_stages(
+        self,
+        pain_points: List[Dict],
+        themes: List[Dict],
+        generation: int,
+        run_id: int
+    ) -> List[Opportunity]:
+        """
+        Scan stages; fills pain_points/themes in place for run accounting
+        
+        Collection is checkpointed per unit and the stored pain points per
+        run, so a resumed run only redoes unfinished work. Opportunities
+        are staged under `generation` and published in one atomic step at
+        the end.
         """
         print("Starting opportunity scan...")
         print("=" * 60)
         
-        # Step 1: Collect pain points
-        print("\n[1/4] Collecting pain points from Reddit...")
-        pain_points = self.reddit_collector.collect_pain_points()
-        print(f"Found {len(pain_points)} pain point mentions")
-        
-        # Save pain points to DB
-        for point in pain_points:
-            self.db.save_pain_point(
-                source=point['source'],
-                text=point['text'],
-                url=point.get('url')
-            )
+        checkpoints = self.db.get_checkpoints(run_id)
+        stored = checkpoints.get(PAIN_POINTS_STAGE, {}).get('status') == 'done'
+        failed_units = [unit for unit, checkpoint in checkpoints.items() if checkpoint['status'] == 'failed']
+        
+        if stored:
+            print("\n[1/4] Reusing pain points stored before the interruption...")
+            pain_points.extend(self.db.get_scan_pain_points(run_id))
+            metrics.incr('scan_pain_points_total', len(pain_points))
+        
+        # A partial run has its pain points stored but failed units left to retry
+        if not stored or failed_units:
+            # Step 1: Collect pain points
+            if stored:
+                print(f"\n[1/4] Retrying {len(failed_units)} failed unit(s)...")
+            else:
+                print("\n[1/4] Collecting pain points from Reddit...")
+            with self._stage(run_id, 'collect'):
+                posts = self._collect(run_id, checkpoints)
+            metrics.incr('scan_posts_total', len(posts))
+            
+            # Signal detection, normalization and dedup, sharded across workers
+            with self._stage(run_id, 'detect'):
+                processed = pipeline.run_sharded(
+                    posts,
+                    self.reddit_collector.PAIN_KEYWORDS,
+                    workers=self.workers,
+                    by=self.shard_by
+                )
+            pain_points.extend(processed['pain_points'])
+            metrics.incr('scan_pain_points_total', len(processed['pain_points']))
+            for source, count in processed['sources'].items():
+                events.publish('pain_points_collected', run_id=run_id, source=source, pain_points=count)
+            print(f"Found {len(pain_points)} pain point mentions ({processed['scanned']} posts, {self.workers} worker(s))")
+            
+            # Save the new pain points to DB in one batch (checkpoints the stage)
+            with self._stage(run_id, 'store_pain_points'):
+                self.db.save_pain_points(processed['pain_points'], scan_run_id=run_id)
+            
+            # Every fetched URL counts as seen, not only those that became pain points
+            if self.skip_seen:
+                with self._stage(run_id, 'update_seen'):
+                    self.seen.update(post.get('url') for post in posts)
+                    self._seen.save(self.seen_path)
         
         # Step 2: Aggregate by theme (simplified - in production use NLP clustering)
         print("\n[2/4] Aggregating by theme...")
-        themes = self._aggregate_themes(pain_points)
+        with self._stage(run_id, 'aggregate'):
+            themes.extend(self._aggregate_themes(pain_points))
+        metrics.incr('scan_themes_total', len(themes))
+        
+        # Keyword triggers set build complexity, feasibility and B2B, for
+        # themes and pain points in one pass of the same classifier
+        with self._stage(run_id, 'classify'):
+            classifier = self.classifier
+            for theme, labels in zip(themes, classifier.classify_themes(themes)):
+                theme['build_complexity'] = labels['build_complexity'] or theme['build_complexity']
+                theme['feasibility_score'] = labels['feasibility_score']
+                theme['b2b'] = labels['b2b']
+            point_labels = classifier.classify_texts(point['text'] for point in pain_points)
+            for point, labels in zip(pain_points, point_labels):
+                point['labels'] = labels
+            metrics.incr('scan_pain_points_b2b_total', sum(labels['b2b'] for labels in point_labels))
         print(f"Identified {len(themes)} opportunity themes")
         
         # Step 3: Validate each theme
         print("\n[3/4] Validating opportunities...")
         opportunities = []
         
-        for theme in themes:
-            print(f"  - Validating: {theme['title']}")
-            
-            validation = self.validator.validate_opportunity(theme['problem'])
-            
-            if not validation['has_paid_solutions']:
-                print(f"    ✗ No paid solutions found - skipping")
-                continue
-            
-            # Step 4: Score
-            score = self.scorer.calculate_score(
-                mentions=theme['mentions'],
-                revenue_amount=validation['estimated_revenue'],
-                competitors=validation['competitors'],
-                build_complexity=theme['build_complexity']
-            )
-            
-            competition_level = self.scorer.get_competition_level(
-                validation['competitors']
-            )
-            
-            recommendation = self.scorer.get_recommendation(score)
-            
-            opportunity = Opportunity(
-                id=None,
-                title=theme['title'],
-                problem=theme['problem'],
-                score=score,
-                mentions=theme['mentions'],
-                revenue=f"£{validation['estimated_revenue']:,} MRR",
-                revenue_amount=validation['estimated_revenue'],
-                competitors=validation['competitors'],
-                competition_level=competition_level,
-                build_complexity=theme['build_complexity'],
-                sources=theme['sources'],
-                example=', '.join(validation['examples']),
-                validated=score >= 60,
-                recommendation=recommendation,
-                market_size=validation['market_size'],
-                created_at=datetime.now().isoformat()
-            )
-            
-            # Save to database
-            opportunity.id = self.db.save_opportunity(opportunity)
-            opportunities.append(opportunity)
-            
-            print(f"    ✓ Score: {score}/100 - {recommendation}")
+        with self._stage(run_id, 'validate_and_score'):
+            for theme in themes:
+                print(f"  - Validating: {theme['title']}")
+                
+                with metrics.timer('scan_validation_duration_seconds'):
+                    validation = self.validator.validate_opportunity(theme['problem'])
+                
+                if not validation['has_paid_solutions']:
+                    metrics.incr('scan_opportunities_total', result='skipped')
+                    print(f"    ✗ No paid solutions found - skipping")
+                    continue
+                
+                # Step 4: Score
+                with metrics.timer('scan_scoring_duration_seconds'):
+                    score = self.scorer.calculate_score(
+                        mentions=theme['mentions'],
+                        revenue_amount=validation['estimated_revenue'],
+                        competitors=validation['competitors'],
+                        build_complexity=theme['build_complexity']
+                    )
+                
+                competition_level = self.scorer.get_competition_level(
+                    validation['competitors']
+                )
+                
+                recommendation = self.scorer.get_recommendation(score)
+                
+                opportunity = Opportunity(
+                    id=None,
+                    title=theme['title'],
+                    problem=theme['problem'],
+                    score=score,
+                    mentions=theme['mentions'],
+                    revenue=f"£{validation['estimated_revenue']:,} MRR",
+                    revenue_amount=validation['estimated_revenue'],
+                    competitors=validation['competitors'],
+                    competition_level=competition_level,
+                    build_complexity=theme['build_complexity'],
+                    sources=theme['sources'],
+                    example=', '.join(validation['examples']),
+                    validated=score >= 60,
+                    recommendation=recommendation,
+                    market_size=validation['market_size'],
+                    created_at=datetime.now().isoformat(),
+                    feasibility_score=theme.get('feasibility_score'),
+                    b2b=theme.get('b2b')
+                )
+                
+                opportunities.append(opportunity)
+                metrics.incr('scan_opportunities_total', result='saved')
+                
+                events.publish(
+                    'opportunity_scored',
+                    run_id=run_id,
+                    title=opportunity.title,
+                    score=score,
+                    recommendation=recommendation
+                )
+                print(f"    ✓ Score: {score}/100 - {recommendation}")
+        
+        # Upsert all opportunities and swap the generation in for readers
+        with self._stage(run_id, 'publish'):
+            ids = self.db.save_opportunities(opportunities, generation)
+            for opportunity, opportunity_id in zip(opportunities, ids):
+                opportunity.id = opportunity_id
+        metrics.set_gauge('published_generation', generation)
+        
+        # Extend each theme's mention time series and trend
+        with self._stage(run_id, 'trends'):
+            self.db.record_mentions({
+                theme_key(o.title): o.mentions for o in opportunities
+            })
         
         print("\n[4/4] Scan complete!")
         print(f"\nResults: {len(opportunities)} validated opportunities")
@@ -468,6 +1557,67 @@ class OpportunityFinder:
         
         return opportunities
     
+    @contextmanager
+    def _stage(self, run_id: int, stage: str):
+        """Time a scan stage and announce its start and end on the event bus"""
+        events.publish('stage_started', run_id=run_id, stage=stage)
+        started = time.perf_counter()
+        try:
+            with metrics.timer('scan_stage_duration_seconds', stage=stage):
+                yield
+        finally:
+            events.publish(
+                'stage_finished',
+                run_id=run_id,
+                stage=stage,
+                duration_seconds=round(time.perf_counter() - started, 4)
+            )
+    
+    def _collect(self, run_id: int, checkpoints: Dict[str, Dict]) -> List[Dict]:
+        """
+        Fetch every unit not yet done in this run, checkpointing each
+        
+        Posts of units finished before an interruption are read back from
+        the database instead of being fetched again. A unit that raises is
+        recorded as failed (and retried on resume) rather than dropped
+        silently; the scan carries on with the remaining units.
+        """
+        posts = self.db.get_scan_posts(run_id)
+        seen = self.seen
+        if seen is not None and self.reddit_collector.seen is None:
+            self.reddit_collector.seen = seen
+        
+        units = [(self.reddit_collector, unit) for unit in self.reddit_collector.units()]
+        units += [(collector, f'http:{collector.SOURCE}') for collector in self.http_collectors]
+        
+        for collector, unit in units:
+            if checkpoints.get(unit, {}).get('status') == 'done':
+                metrics.incr('scan_units_total', status='resumed')
+                continue
+            
+            try:
+                if unit.startswith('http:'):
+                    unit_posts = [
+                        post for post in collector.fetch_posts()
+                        if seen is None or post['url'] not in seen
+                    ]
+                else:
+                    unit_posts = collector.fetch_unit(unit)
+            except Exception as e:
+                print(f"Error scanning {unit}: {e}")
+                self.db.fail_unit(run_id, unit, str(e))
+                metrics.incr('scan_units_total', status='failed')
+                metrics.log_event('scan_unit_failed', run_id=run_id, unit=unit, error=str(e))
+                events.publish('unit_collected', run_id=run_id, unit=unit, status='failed', posts=0)
+                continue
+            
+            self.db.save_unit_posts(run_id, unit, unit_posts)
+            metrics.incr('scan_units_total', status='done')
+            events.publish('unit_collected', run_id=run_id, unit=unit, status='done', posts=len(unit_posts))
+            posts.extend(unit_posts)
+        
+        return posts
+    
     def _aggregate_themes(self, pain_points: List[Dict]) -> List[Dict]:
         """
         Aggregate pain points into common themes
@@ -512,9 +1662,37 @@ class OpportunityFinder:
 
 def main():
     """Example usage"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run an opportunity scan.")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=["cprofile", "sample"],
+        help="Profile the scan (default mode: cprofile)"
+    )
+    parser.add_argument("--profile-dir", default="profiles", help="Directory for profile files")
+    parser.add_argument("--profile-keep", type=int, default=20, help="Max profile files to keep")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for pain point processing (0 = one per core)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the last scan if it did not complete"
+    )
+    args = parser.parse_args()
+    
+    profiler = None
+    if args.profile:
+        profiler = Profiler(mode=args.profile, output_dir=args.profile_dir, keep=args.profile_keep)
     
     # Initialize without Reddit credentials (will use mock data)
-    finder = OpportunityFinder()
+    finder = OpportunityFinder(profiler=profiler, workers=args.workers)
     
     # Or with real credentials:
     # finder = OpportunityFinder(reddit_credentials={
@@ -524,7 +1702,11 @@ def main():
     # })
     
     # Run scan
-    opportunities = finder.run_scan()
+    try:
+        opportunities = finder.run_scan(resume=args.resume)
+    except ScanInProgress as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     
     # Display results
     print("\n" + "=" * 60)
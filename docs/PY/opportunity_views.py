@@ -0,0 +1,83 @@
+"""
+Precomputed dashboard views of the published opportunities
+Ordered id lists per (tier, min score bucket, sort), built at publish time
+"""
+
+from typing import Tuple
+
+# Lowest score rank (1 = highest score) each subscription tier may see
+TIER_MIN_RANK = {
+    'basic': 11,
+    'pro': 6,
+    'premium': 1,
+}
+
+# min_score filters snap down to the nearest bucket; the remainder is a
+# range condition on the view's score column
+SCORE_BUCKETS = (0, 50, 60, 70, 80, 90)
+
+# Sort name -> ORDER BY over the ranked rows; ties fall back to score
+SORTS = {
+    'score': 'r.score DESC, r.id',
+    'revenue': 'r.revenue_amount DESC, r.score DESC, r.id',
+    'mentions': 'r.mentions DESC, r.score DESC, r.id',
+}
+
+DEFAULT_TIER = 'premium'
+DEFAULT_SORT = 'score'
+
+
+def view_key(tier: str, min_score: int, sort: str) -> Tuple[str, int]:
+    """
+    (view name, bucket) serving a dashboard query
+    
+    Raises ValueError for an unknown tier; unknown sorts fall back to
+    score, as the API always has.
+    """
+    if tier not in TIER_MIN_RANK:
+        raise ValueError(f"Unknown tier '{tier}' (expected one of {', '.join(TIER_MIN_RANK)})")
+    if sort not in SORTS:
+        sort = DEFAULT_SORT
+    bucket = max(b for b in SCORE_BUCKETS if b <= max(min_score, 0))
+    return f'{tier}:{bucket}:{sort}', bucket
+
+
+def build_views(cursor, generation: int) -> int:
+    """
+    Materialize every view of `generation`; returns the rows written
+    
+    One statement per sort ranks the generation's rows by score once and
+    numbers them within each (tier, bucket) they qualify for. Views of
+    generations no longer published are dropped in the same transaction.
+    """
+    filters = ', '.join(
+        f"('{tier}', {min_rank}, {bucket})"
+        for tier, min_rank in TIER_MIN_RANK.items()
+        for bucket in SCORE_BUCKETS
+    )
+    
+    cursor.execute('DELETE FROM opportunity_views WHERE generation = ?', (generation,))
+    written = 0
+    for sort, order_by in SORTS.items():
+        cursor.execute(f'''
+            INSERT INTO opportunity_views (generation, view, position, score, opportunity_id)
+            WITH ranked AS (
+                SELECT id, score, revenue_amount, mentions,
+                       ROW_NUMBER() OVER (ORDER BY score DESC, id) AS rank
+                FROM opportunities WHERE generation = ?
+            ),
+            filters (tier, min_rank, bucket) AS (VALUES {filters})
+            SELECT ?, f.tier || ':' || f.bucket || ':' || ?,
+                   ROW_NUMBER() OVER (PARTITION BY f.tier, f.bucket ORDER BY {order_by}),
+                   r.score, r.id
+            FROM ranked r JOIN filters f ON r.rank >= f.min_rank AND r.score >= f.bucket
+        ''', (generation, generation, sort))
+        written += cursor.rowcount
+    
+    cursor.execute('''
+        DELETE FROM opportunity_views
+        WHERE generation < ? AND generation NOT IN (
+            SELECT id FROM scan_generations WHERE status = 'published'
+        )
+    ''', (generation,))
+    return written
@@ -0,0 +1,169 @@
+"""
+Scan pipeline steps for pain point processing
+Pure, picklable functions so shards can run in worker processes
+"""
+
+import hashlib
+import os
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Text kept per pain point (matches the collector's trimming)
+MAX_TEXT_LENGTH = 500
+SHARD_MODES = ('hash', 'source')
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_keywords(keywords: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Lowercased pain keywords, duplicates dropped, order kept
+    
+    Every detection path (collector, sharded pipeline, maintenance) matches
+    with these against lowercased text, so mixed-case keywords such as
+    "hate that I have to" behave the same everywhere. Normalize once per
+    collector, shard or batch; the matchers below take the result as-is.
+    """
+    return tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+
+
+def match_pain_keywords(text: str, keywords: Tuple[str, ...]) -> List[str]:
+    """Pain keywords (from normalize_keywords) occurring in text, case-insensitively"""
+    text_lower = text.lower()
+    return [keyword for keyword in keywords if keyword in text_lower]
+
+
+def contains_pain_signal(text: str, keywords: Tuple[str, ...]) -> bool:
+    """Check if text contains any pain keyword (from normalize_keywords), case-insensitively"""
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in keywords)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace for duplicate detection"""
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def theme_key(title: str) -> str:
+    """Stable key for a theme/opportunity, e.g. 'testimonial-collection-tool'"""
+    return _NON_WORD.sub('-', title.lower()).strip('-')
+
+
+def fingerprint(post: Dict) -> str:
+    """Content fingerprint of a post's normalized title and text"""
+    normalized = normalize_text(f"{post.get('title', '')} {post.get('text', '')}")
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def process_shard(posts: List[Dict], keywords: List[str]) -> Dict:
+    """
+    Detect, normalize and fingerprint one shard of raw posts
+    
+    Returns the matching pain points (text trimmed, duplicates within the
+    shard dropped) plus partial per-source and per-keyword counts.
+    """
+    keywords = normalize_keywords(keywords)
+    pain_points = []
+    seen = set()
+    sources = Counter()
+    keyword_counts = Counter()
+    
+    for post in posts:
+        text_lower = f"{post.get('title', '')} {post.get('text', '')}".lower()
+        matched = [k for k in keywords if k in text_lower]
+        if not matched:
+            continue
+        
+        key = fingerprint(post)
+        if key in seen:
+            continue
+        seen.add(key)
+        
+        pain_points.append({
+            **post,
+            'text': post.get('text', '')[:MAX_TEXT_LENGTH],
+            'fingerprint': key
+        })
+        sources[post['source']] += 1
+        keyword_counts.update(matched)
+    
+    return {
+        'scanned': len(posts),
+        'pain_points': pain_points,
+        'sources': sources,
+        'keywords': keyword_counts
+    }
+
+
+def merge_shards(results: List[Dict]) -> Dict:
+    """Combine shard results, dropping duplicates across shards"""
+    merged = {
+        'scanned': 0,
+        'pain_points': [],
+        'sources': Counter(),
+        'keywords': Counter()
+    }
+    seen = set()
+    
+    for result in results:
+        merged['scanned'] += result['scanned']
+        merged['keywords'].update(result['keywords'])
+        for point in result['pain_points']:
+            if point['fingerprint'] in seen:
+                continue
+            seen.add(point['fingerprint'])
+            merged['pain_points'].append(point)
+            merged['sources'][point['source']] += 1
+    
+    return merged
+
+
+def shard_posts(posts: List[Dict], shards: int, by: str = 'hash') -> List[List[Dict]]:
+    """Split posts into shards by source name or by URL/title hash"""
+    buckets: List[List[Dict]] = [[] for _ in range(shards)]
+    for post in posts:
+        if by == 'source':
+            key = post['source']
+        else:
+            key = post.get('url') or post.get('title', '')
+        buckets[zlib.crc32(key.encode()) % shards].append(post)
+    return [b for b in buckets if b]
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """None/1 = in-process, 0 = one per CPU core"""
+    if workers is None:
+        workers = int(os.environ.get('OF_SCAN_WORKERS', 1))
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def run_sharded(
+    posts: List[Dict],
+    keywords: List[str],
+    workers: int = 1,
+    by: str = 'hash'
+) -> Dict:
+    """
+    Process posts across a pool of worker processes and merge the results
+    
+    With one worker everything runs in-process; any worker count yields the
+    same set of pain points.
+    """
+    if workers <= 1 or len(posts) < 2:
+        return merge_shards([process_shard(posts, keywords)])
+    
+    # Source sharding gives at most one shard per source; hash sharding
+    # over-partitions so a slow shard does not leave cores idle
+    shard_count = workers if by == 'source' else workers * 4
+    shards = shard_posts(posts, shard_count, by)
+    
+    # Imported here: multiprocessing is costly at startup and unused in-process
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(process_shard, shards, [keywords] * len(shards)))
+    
+    return merge_shards(results)
@@ -0,0 +1,202 @@
+"""
+Opt-in profiling for scans and API requests
+Writes cProfile .pstats or sampled collapsed-stack (flamegraph) files
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+# Environment configuration
+PROFILE_ENV = 'OF_PROFILE'            # "cprofile" or "sample" (any other truthy value = cprofile)
+PROFILE_DIR_ENV = 'OF_PROFILE_DIR'    # output directory (default: profiles)
+PROFILE_KEEP_ENV = 'OF_PROFILE_KEEP'  # max profiles kept on disk (default: 20)
+PROFILE_REQUESTS_ENV = 'OF_PROFILE_REQUESTS'  # "1" lets API clients ask for ?profile= (default: off)
+
+MODES = ('cprofile', 'sample')
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+# One profile per thread across all Profiler instances; cProfile sessions
+# cannot nest (the inner one would silently replace the outer hook)
+_active = threading.local()
+
+
+class StackSampler:
+    """
+    Minimal wall-clock sampling profiler
+    
+    Samples the target thread's stack every `interval` seconds and counts
+    collapsed stacks ("outer;inner;leaf"), the input format of flamegraph.pl
+    and speedscope.
+    """
+    
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{Path(code.co_filename).name}:{code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+    
+    def write(self, path: Path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+class Profiler:
+    """
+    Wraps a block of work in cProfile or the stack sampler
+    
+    Disabled profilers are no-ops, so callers can always wrap their work.
+    Only one profile runs per thread; nested or concurrent requests for a
+    second cProfile session are skipped rather than failing the caller.
+    """
+    
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        output_dir: str = 'profiles',
+        keep: int = 20,
+        interval: float = 0.005
+    ):
+        if mode is not None and mode not in MODES:
+            mode = 'cprofile'
+        self.mode = mode
+        self.output_dir = Path(output_dir)
+        # The profile just written is always kept
+        self.keep = max(keep, 1)
+        self.interval = interval
+    
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+    
+    @classmethod
+    def from_env(cls) -> 'Profiler':
+        """Build a profiler from OF_PROFILE / OF_PROFILE_DIR / OF_PROFILE_KEEP"""
+        mode = os.environ.get(PROFILE_ENV, '').strip().lower()
+        if mode in ('', '0', 'false', 'no', 'off'):
+            mode = None
+        return cls(
+            mode=mode,
+            output_dir=os.environ.get(PROFILE_DIR_ENV, 'profiles'),
+            keep=int(os.environ.get(PROFILE_KEEP_ENV, 20))
+        )
+    
+    def start(self, name: str, mode: Optional[str] = None):
+        """
+        Start profiling the current thread
+        
+        Returns a session handle for stop(), or None when profiling is
+        disabled or already running.
+        """
+        mode = mode or self.mode
+        if mode is None or getattr(_active, 'session', None):
+            return None
+        
+        if mode == 'sample':
+            profiler = StackSampler(threading.get_ident(), self.interval)
+            profiler.start()
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler (e.g. a concurrent request) is active
+                print(f"Warning: profiler busy, skipping profile for {name}")
+                return None
+        
+        session = (name, profiler)
+        _active.session = session
+        return session
+    
+    def stop(self, session) -> Optional[Path]:
+        """Stop a session started with start() and write its profile file"""
+        if session is None:
+            return None
+        
+        name, profiler = session
+        _active.session = None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{_safe_name(name)}-{time.strftime('%Y%m%d_%H%M%S')}-{time.time_ns() % 1000000:06d}"
+        
+        if isinstance(profiler, StackSampler):
+            profiler.stop()
+            path = self.output_dir / f'{stem}.collapsed'
+            profiler.write(path)
+        else:
+            profiler.disable()
+            path = self.output_dir / f'{stem}.pstats'
+            profiler.dump_stats(str(path))
+        
+        self._prune(path)
+        print(f"Profile written to {path}")
+        return path
+    
+    @contextmanager
+    def profile(self, name: str, mode: Optional[str] = None):
+        """Profile the wrapped block (no-op when disabled)"""
+        session = self.start(name, mode)
+        try:
+            yield
+        finally:
+            self.stop(session)
+    
+    def profiles(self) -> List[Path]:
+        """Profile files on disk, oldest first"""
+        if not self.output_dir.exists():
+            return []
+        files = [
+            p for p in self.output_dir.iterdir()
+            if p.suffix in ('.pstats', '.collapsed')
+        ]
+        return sorted(files, key=lambda p: p.stat().st_mtime)
+    
+    def _prune(self, written: Path):
+        """Delete the oldest profiles beyond the keep cap, never `written`"""
+        files = [p for p in self.profiles() if p != written]
+        for path in files[:max(len(files) + 1 - self.keep, 0)]:
+            path.unlink(missing_ok=True)
+
+
+def requests_opted_in() -> bool:
+    """True if OF_PROFILE_REQUESTS allows per-request ?profile= flags"""
+    return os.environ.get(PROFILE_REQUESTS_ENV, '').strip().lower() in TRUE_VALUES
+
+
+def flag_mode(flag: str) -> Optional[str]:
+    """Mode a ?profile= value asks for: a mode name, cprofile if true-like, else None"""
+    flag = flag.strip().lower()
+    if flag in MODES:
+        return flag
+    if flag in TRUE_VALUES:
+        return 'cprofile'
+    return None
+
+
+def _safe_name(name: str) -> str:
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in name).strip('_') or 'profile'
@@ -0,0 +1,203 @@
+"""
+Synthetic Reddit corpus and fake praw backend
+Offline load testing of the scan pipeline at realistic volume
+"""
+
+import hashlib
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from opportunity_finder import RedditCollector
+
+FILLER_WORDS = (
+    'client invoice project report email customer team budget schedule '
+    'tracking dashboard export spreadsheet onboarding payroll contract '
+    'inventory booking feedback testimonial analytics workflow agency '
+    'freelance store order shipping lead pipeline hours meeting calendar '
+    'the a and to of for with my our every week month manually tool app'
+).split()
+
+
+@dataclass
+class CorpusConfig:
+    """Shape of the generated corpus; identical configs yield identical posts"""
+    subreddits: List[str] = field(default_factory=lambda: list(RedditCollector.SUBREDDITS))
+    keywords: List[str] = field(default_factory=lambda: list(RedditCollector.PAIN_KEYWORDS))
+    posts_per_subreddit: int = 1000
+    keyword_hit_rate: float = 0.3       # share of posts containing a pain keyword
+    duplicate_rate: float = 0.05        # share of posts repeating an earlier submission
+    title_words: Tuple[int, int] = (4, 14)
+    body_words_median: int = 60         # body length is log-normal around this
+    body_words_sigma: float = 0.9
+    max_body_words: int = 2000
+    seed: int = 42
+
+
+class FakeSubmission:
+    """The subset of praw.models.Submission read by the collectors"""
+    
+    __slots__ = ('id', 'title', 'selftext', 'permalink', 'score', 'num_comments',
+                 'created_utc', 'subreddit_name')
+    
+    def __init__(self, id, title, selftext, permalink, score, num_comments,
+                 created_utc, subreddit_name):
+        self.id = id
+        self.title = title
+        self.selftext = selftext
+        self.permalink = permalink
+        self.score = score
+        self.num_comments = num_comments
+        self.created_utc = created_utc
+        self.subreddit_name = subreddit_name
+
+
+class SyntheticCorpus:
+    """Deterministic, lazily generated posts per subreddit"""
+    
+    def __init__(self, config: Optional[CorpusConfig] = None):
+        self.config = config or CorpusConfig()
+    
+    def _rng(self, subreddit: str) -> random.Random:
+        digest = hashlib.sha256(f'{self.config.seed}:{subreddit}'.encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+    
+    def _words(self, rng: random.Random, count: int) -> str:
+        return ' '.join(rng.choices(FILLER_WORDS, k=count))
+    
+    def posts(self, subreddit: str) -> Iterator[FakeSubmission]:
+        """Yield the subreddit's posts, newest first"""
+        config = self.config
+        rng = self._rng(subreddit)
+        recent: List[FakeSubmission] = []
+        now = 1_790_000_000
+        
+        for i in range(config.posts_per_subreddit):
+            if recent and rng.random() < config.duplicate_rate:
+                yield rng.choice(recent)
+                continue
+            
+            title = self._words(rng, rng.randint(*config.title_words))
+            body_len = min(
+                int(rng.lognormvariate(0, config.body_words_sigma) * config.body_words_median),
+                config.max_body_words
+            )
+            body = self._words(rng, body_len)
+            
+            if rng.random() < config.keyword_hit_rate:
+                keyword = rng.choice(config.keywords)
+                if rng.random() < 0.5:
+                    title = f'{keyword.capitalize()} {title}'
+                else:
+                    body = f'{body} {keyword} {self._words(rng, 5)}'
+            
+            post_id = f'{subreddit[:3].lower()}{i:x}'
+            submission = FakeSubmission(
+                id=post_id,
+                title=title,
+                selftext=body,
+                permalink=f'/r/{subreddit}/comments/{post_id}/',
+                score=int(rng.paretovariate(1.5)),
+                num_comments=int(rng.paretovariate(1.8)) - 1,
+                created_utc=now - i * 60,
+                subreddit_name=subreddit
+            )
+            
+            recent.append(submission)
+            if len(recent) > 100:
+                recent.pop(0)
+            yield submission
+    
+    def pain_points(self) -> Iterator[Dict]:
+        """Yield every post in the collector's pain point dict format"""
+        for subreddit in self.config.subreddits:
+            for submission in self.posts(subreddit):
+                yield {
+                    'source': f'r/{subreddit}',
+                    'title': submission.title,
+                    'text': submission.selftext[:500],
+                    'url': f'https://reddit.com{submission.permalink}',
+                    'score': submission.score,
+                    'num_comments': submission.num_comments
+                }
+
+
+class FakeTooManyRequests(Exception):
+    """Stand-in for prawcore.exceptions.TooManyRequests (HTTP 429)"""
+    
+    status_code = 429
+    
+    def __init__(self, retry_after: float):
+        super().__init__(f'received 429 HTTP response (retry after {retry_after}s)')
+        self.retry_after = retry_after
+
+
+class FakeSubreddit:
+    """praw.models.Subreddit look-alike backed by a SyntheticCorpus"""
+    
+    def __init__(self, reddit: 'FakeReddit', name: str):
+        self._reddit = reddit
+        self.display_name = name
+    
+    def search(self, query: str, limit: Optional[int] = 100, time_filter: str = 'all', **kwargs):
+        """Posts whose title or body contains `query`, paged like praw listings"""
+        query = query.lower()
+        matches = (
+            s for s in self._reddit.corpus.posts(self.display_name)
+            if query in s.title.lower() or query in s.selftext.lower()
+        )
+        return self._reddit._paginate(matches, limit)
+    
+    def new(self, limit: Optional[int] = 100, **kwargs):
+        return self._reddit._paginate(self._reddit.corpus.posts(self.display_name), limit)
+
+
+class FakeReddit:
+    """
+    praw.Reddit-compatible backend for offline load tests
+    
+    Every listing page (page_size items, like praw's 100-item pages) costs
+    `latency` seconds plus uniform `jitter`, and fails with
+    FakeTooManyRequests with probability `error_rate`.
+    """
+    
+    def __init__(
+        self,
+        corpus: Optional[SyntheticCorpus] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        page_size: int = 100,
+        seed: int = 0
+    ):
+        self.corpus = corpus or SyntheticCorpus()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.requests_made = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+    
+    def subreddit(self, name: str) -> FakeSubreddit:
+        return FakeSubreddit(self, name)
+    
+    def _request(self):
+        self.requests_made += 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.rate_limited += 1
+            raise FakeTooManyRequests(self.retry_after)
+    
+    def _paginate(self, items: Iterator[FakeSubmission], limit: Optional[int]):
+        for count, item in enumerate(items):
+            if limit is not None and count >= limit:
+                return
+            if count % self.page_size == 0:
+                self._request()
+            yield item
@@ -0,0 +1,126 @@
+"""
+Per-client rate limiting and request coalescing for the API
+Token buckets keyed by API key or client address, single-flight reads
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Hashable, Tuple
+
+import metrics
+
+# Environment configuration
+RATE_ENV = 'OF_RATE_LIMIT_PER_MINUTE'  # sustained requests per client per minute (default: 60, 0 = off)
+BURST_ENV = 'OF_RATE_LIMIT_BURST'      # requests a client may make at once (default: 20)
+API_KEYS_ENV = 'OF_API_KEYS'           # comma-separated keys limited per key rather than per address (default: none)
+PROXY_HOPS_ENV = 'OF_PROXY_HOPS'       # reverse proxies in front of the API whose X-Forwarded-For is trusted (default: 0)
+
+DEFAULT_RATE = 60
+DEFAULT_BURST = 20
+MAX_CLIENTS = 10000
+
+
+class RateLimiter:
+    """
+    Token bucket per client
+    
+    Each client holds up to `burst` tokens, refilled at `rate_per_minute`;
+    a request spends one. Buckets idle long enough to be full again carry
+    no state, so the least recently seen are dropped past `max_clients`.
+    """
+    
+    def __init__(self, rate_per_minute: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, max_clients: int = MAX_CLIENTS):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+    
+    def acquire(self, client: str) -> Tuple[bool, float]:
+        """Spend a token for `client`; returns (allowed, seconds until the next token)"""
+        if not self.enabled:
+            return True, 0.0
+        
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        
+        retry_after = 0.0 if allowed else (1 - tokens) / self.rate
+        return allowed, retry_after
+    
+    @classmethod
+    def from_env(cls) -> 'RateLimiter':
+        return cls(
+            rate_per_minute=float(os.environ.get(RATE_ENV, DEFAULT_RATE)),
+            burst=int(os.environ.get(BURST_ENV, DEFAULT_BURST))
+        )
+
+
+def api_keys_from_env() -> FrozenSet[str]:
+    """Configured API keys; any other key a client sends is ignored"""
+    return frozenset(key.strip() for key in os.environ.get(API_KEYS_ENV, '').split(',') if key.strip())
+
+
+def proxy_hops_from_env() -> int:
+    return int(os.environ.get(PROXY_HOPS_ENV, 0))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into one execution
+    
+    The first caller for a key runs the function; callers arriving while
+    it runs wait and share its result (or exception). Nothing is cached
+    after the call returns, so results are never staler than the read.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, func: Callable, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        
+        if not leader:
+            metrics.incr('cache_hits_total', cache=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        metrics.incr('cache_misses_total', cache=self.name)
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
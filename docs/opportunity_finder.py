@@ -5,15 +5,29 @@ Scrapes Reddit, forums, and analyzes search trends to find validated business op
 """
 
 import json
+import os
 import re
-from datetime import datetime
-from typing import List, Dict
+from datetime import datetime, timedelta
+from typing import List, Dict, Iterable, Optional
 import urllib.request
 import urllib.parse
 
+FREQUENCY_PATTERN = re.compile(r'\d+')
+
+
+def parse_frequency(frequency: str) -> int:
+    """Mention count from a frequency string like '67 mentions'"""
+    match = FREQUENCY_PATTERN.search(frequency)
+    return int(match.group()) if match else 0
+
+
 class OpportunityFinder:
-    def __init__(self):
+    def __init__(self, cache_path: str = 'search_volume_cache.json', cache_ttl_days: int = 7):
         self.opportunities = []
+        # Keyword analysis results persisted between runs
+        self.cache_path = cache_path
+        self.cache_ttl = timedelta(days=cache_ttl_days)
+        self.search_cache = self._load_search_cache()
         self.pain_point_keywords = [
             "frustrated with", "hate that", "wish there was", "need a tool",
             "looking for a solution", "tired of", "can't find", "doesn't exist",
@@ -33,6 +47,7 @@ class OpportunityFinder:
                 "source": f"r/{subreddit}",
                 "pain_point": "Manual invoicing takes 5+ hours per week",
                 "frequency": "67 mentions",
+                "mentions": 67,
                 "urgency_score": 8,
                 "potential_solution": "Automated invoice generation for freelancers"
             },
@@ -40,6 +55,7 @@ class OpportunityFinder:
                 "source": f"r/{subreddit}",
                 "pain_point": "No easy way to track client project hours across multiple tools",
                 "frequency": "43 mentions", 
+                "mentions": 43,
                 "urgency_score": 7,
                 "potential_solution": "Unified time tracking dashboard"
             }
@@ -47,21 +63,83 @@ class OpportunityFinder:
         
         return simulated_results
     
-    def analyze_search_volume(self, keyword: str) -> Dict:
+    def _load_search_cache(self) -> Dict:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print(f"[CACHE] Ignoring unreadable cache: {self.cache_path}")
+            return {}
+    
+    def save_search_cache(self):
+        """Write the keyword cache (via a temp file, so a crash never truncates it)"""
+        if not self.cache_path:
+            return
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.search_cache, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+    
+    def _cached_search_volume(self, keyword: str) -> Optional[Dict]:
+        entry = self.search_cache.get(keyword.strip().lower())
+        if not entry:
+            return None
+        if datetime.now() - datetime.fromisoformat(entry['fetched_at']) > self.cache_ttl:
+            return None
+        return entry['data']
+    
+    def _fetch_search_volumes(self, keywords: List[str]) -> Dict[str, Dict]:
         """
-        Analyzes search volume and competition for a keyword
+        Looks up search volume and competition for several keywords
         In production: use Google Keyword Planner API, Ahrefs, or similar
+        (both accept keyword batches per request)
+        """
+        results = {}
+        for keyword in keywords:
+            print(f"[SEARCH] Analyzing: {keyword}")
+            
+            # Simulated data - replace with real API calls
+            results[keyword] = {
+                "keyword": keyword,
+                "monthly_searches": 2400,
+                "competition": "Low",
+                "cpc": "$3.20",
+                "trend": "Rising +15%"
+            }
+        return results
+    
+    def analyze_search_volumes(self, keywords: Iterable[str]) -> Dict[str, Dict]:
         """
-        print(f"[SEARCH] Analyzing: {keyword}")
+        Analyzes every unique keyword at once
+        Cached keywords are reused; the rest are fetched in one batch and
+        the cache is saved once
+        """
+        results = {}
+        missing = []
+        for keyword in dict.fromkeys(keywords):
+            cached = self._cached_search_volume(keyword)
+            if cached is not None:
+                results[keyword] = cached
+            else:
+                missing.append(keyword)
+        
+        if missing:
+            fetched_at = datetime.now().isoformat()
+            for keyword, data in self._fetch_search_volumes(missing).items():
+                self.search_cache[keyword.strip().lower()] = {"data": data, "fetched_at": fetched_at}
+                results[keyword] = data
+            self.save_search_cache()
         
-        # Simulated data - replace with real API calls
-        return {
-            "keyword": keyword,
-            "monthly_searches": 2400,
-            "competition": "Low",
-            "cpc": "$3.20",
-            "trend": "Rising +15%"
-        }
+        print(f"[SEARCH] {len(results)} keywords ({len(results) - len(missing)} cached, {len(missing)} fetched)")
+        return results
+    
+    def analyze_search_volume(self, keyword: str) -> Dict:
+        """
+        Analyzes search volume and competition for a keyword
+        """
+        return self.analyze_search_volumes([keyword])[keyword]
     
     def score_opportunity(self, pain_point: Dict, search_data: Dict) -> int:
         """
@@ -70,7 +148,9 @@ class OpportunityFinder:
         score = 0
         
         # Frequency of mentions
-        freq = int(re.search(r'\d+', pain_point['frequency']).group())
+        freq = pain_point.get('mentions')
+        if freq is None:
+            freq = parse_frequency(pain_point['frequency'])
         if freq > 50: score += 25
         elif freq > 20: score += 15
         else: score += 5
@@ -94,7 +174,7 @@ class OpportunityFinder:
         
         return min(score, 100)
     
-    def find_opportunities(self):
+    def find_opportunities(self, subreddits: Optional[List[str]] = None):
         """
         Main method to find and score opportunities
         """
@@ -103,30 +183,36 @@ class OpportunityFinder:
         print("=" * 60)
         
         # Subreddits to monitor
-        subreddits = [
-            'Entrepreneur', 'smallbusiness', 'freelance', 
-            'SaaS', 'indiehackers', 'startups'
-        ]
+        if subreddits is None:
+            subreddits = [
+                'Entrepreneur', 'smallbusiness', 'freelance', 
+                'SaaS', 'indiehackers', 'startups'
+            ][:2]  # Limit for demo
         
         keywords = ['automation', 'time tracking', 'invoicing', 'analytics']
         
-        all_opportunities = []
+        results = []
+        for sub in subreddits:
+            results.extend(self.search_reddit_pain_points(sub, keywords))
+        
+        # One lookup per unique solution, however many subreddits repeat it
+        search_volumes = self.analyze_search_volumes(r['potential_solution'] for r in results)
         
-        for sub in subreddits[:2]:  # Limit for demo
-            results = self.search_reddit_pain_points(sub, keywords)
+        all_opportunities = []
+        for result in results:
+            if 'mentions' not in result:
+                result['mentions'] = parse_frequency(result['frequency'])
+            search_data = search_volumes[result['potential_solution']]
+            score = self.score_opportunity(result, search_data)
+            
+            opportunity = {
+                **result,
+                "search_data": search_data,
+                "opportunity_score": score,
+                "validated": score > 60
+            }
             
-            for result in results:
-                search_data = self.analyze_search_volume(result['potential_solution'])
-                score = self.score_opportunity(result, search_data)
-                
-                opportunity = {
-                    **result,
-                    "search_data": search_data,
-                    "opportunity_score": score,
-                    "validated": score > 60
-                }
-                
-                all_opportunities.append(opportunity)
+            all_opportunities.append(opportunity)
         
         # Sort by score
         all_opportunities.sort(key=lambda x: x['opportunity_score'], reverse=True)